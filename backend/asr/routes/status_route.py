@@ -16,3 +16,15 @@ def get_db_info():
 @router.get("/asr/model/info")
 def get_loaded_model_info():
     return status.get_loaded_model_info()
+
+@router.get("/db/pool")
+def get_db_pool_stats():
+    return status.get_db_pool_stats()
+
+@router.get("/db/log-sink")
+def get_log_sink_stats():
+    return status.get_log_sink_stats()
+
+@router.get("/http/clients")
+def get_http_client_stats():
+    return status.get_http_client_stats()
@@ -1,6 +1,8 @@
 # backend/asr/services/status_service.py
 
-from backend.db.base import get_connection
+from backend.db.base import get_connection, get_pool_stats
+from backend.db import log_sink
+from backend.utils import http_clients
 
 def check_asr_status():
     db_ok = False
@@ -68,3 +70,12 @@ def get_loaded_model_info():
         if 'conn' in locals() and conn:
             conn.close()
     return { "loaded": False }
+
+def get_db_pool_stats():
+    return get_pool_stats()
+
+def get_log_sink_stats():
+    return log_sink.get_log_sink_stats()
+
+def get_http_client_stats():
+    return http_clients.get_http_client_stats()
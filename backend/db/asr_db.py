@@ -1,9 +1,15 @@
 # backend/db/asr_db.py
+import os
 import pymysql
 from datetime import datetime
 from backend.db.base import get_connection
+from backend.db.log_sink import LogSink
 from backend.utils.encryption import encrypt
 
+asr_log_sink = LogSink("asr_logs", ("type", "source", "message"))
+# 디버깅할 때만 로그를 콘솔에도 출력합니다 (요청마다 print 하지 않도록 기본은 꺼 둠).
+LOG_ECHO = os.environ.get('LOG_ECHO', '0') == '1'
+
 def _get_logo_by_model_name(model_name: str):
     logo_map = {
         "OpenAI": "OpenAI.svg",
@@ -158,17 +164,7 @@ def get_models_from_db():
             conn.close()
 
 def save_log_to_db(log_type: str, message: str, source: str = 'SYSTEM'):
-    conn = None
-    try:
-        print(f'[DEBUG] log_type={log_type}, source={source} ({len(source)}), message={message}')
-        conn = get_connection()
-        with conn.cursor() as cursor:
-            sql = "INSERT INTO asr_logs (type, source, message) VALUES (%s, %s, %s)"
-            cursor.execute(sql, (log_type, source, message))
-        conn.commit()
+    # DB 적재는 log sink가 백그라운드에서 일괄 처리합니다.
+    asr_log_sink.enqueue((log_type, source, message))
+    if LOG_ECHO:
         print(f'[LOG] {log_type} | {source} | {message}')
-    except Exception as e:
-        print(f'[ERROR] 로그 저장 실패: {e}')
-    finally:
-        if conn:
-            conn.close()
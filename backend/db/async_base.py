@@ -0,0 +1,32 @@
+# backend/db/async_base.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from backend.db.config import DB_POOL_CONFIG
+from backend.db import base
+
+# 커넥션 풀 크기만큼만 스레드를 두어, 풀 대기로 스레드가 쌓이지 않게 합니다.
+_executor = ThreadPoolExecutor(
+    max_workers=DB_POOL_CONFIG['max_size'],
+    thread_name_prefix='db'
+)
+
+async def run_in_db(fn, *args, **kwargs):
+    """
+    동기 DB 함수를 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않도록 합니다.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args, **kwargs))
+
+async def run_query_dict_async(sql, params=None):
+    return await run_in_db(base.run_query_dict, sql, params)
+
+async def run_query_async(sql, params=None):
+    return await run_in_db(base.run_query, sql, params)
+
+async def execute_commit_async(sql, params=None):
+    return await run_in_db(base.execute_commit, sql, params)
+
+def shutdown_db_executor():
+    _executor.shutdown(wait=True)
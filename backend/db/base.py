@@ -1,10 +1,22 @@
 # backend/db/base.py
 
 import pymysql
-from backend.db.config import DB_CONFIG
+from backend.db.config import DB_CONFIG, DB_POOL_CONFIG
+from backend.db.pool import ConnectionPool
+
+_pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
 
 def get_connection():
-    return pymysql.connect(**DB_CONFIG)
+    """
+    풀에서 커넥션을 빌려옵니다. 사용 후 conn.close()를 호출하면 풀에 반납됩니다.
+    """
+    return _pool.acquire()
+
+def get_pool_stats() -> dict:
+    return _pool.stats()
+
+def close_pool():
+    _pool.close_all()
 
 def run_query_dict(sql, params=None):
     conn = get_connection()
@@ -9,3 +9,10 @@ DB_CONFIG = {
     'port': int(os.environ.get('DB_PORT')),
     'charset': 'utf8mb4'
 }
+
+DB_POOL_CONFIG = {
+    'max_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+    'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 3600)),
+}
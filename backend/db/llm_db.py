@@ -5,6 +5,8 @@ from pymysql.cursors import DictCursor
 from datetime import datetime
 from typing import Optional
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
+from backend.db.memory_db import has_interaction_session_column
 
 def save_llm_interaction(
     model_name: str,
@@ -14,22 +16,31 @@ def save_llm_interaction(
     ja_translate_response: str,
     emotion: str,
     tone: str,
-    blendshape: str
+    blendshape: str,
+    session_id: str = ""
 ) -> int:
     conn = None
     try:
+        try:
+            by_session = has_interaction_session_column()
+        except Exception as e:
+            print("\033[91m" + f"[ERROR] session_id 열 확인 실패, 세션 없이 저장합니다: {e}" + "\033[0m")
+            by_session = False
         conn = get_connection()
         with conn.cursor() as cursor:
-            sql = """
+            # session_id 열이 아직 없으면(마이그레이션 전·실패) 예전 열 목록으로 저장합니다.
+            session_cols, session_vals = ("session_id, ", "%s, ") if by_session else ("", "")
+            sql = f"""
                 INSERT INTO llm_interactions (
-                    model_name, request, response,
+                    model_name, {session_cols}request, response,
                     translate_response, ja_translate_response,
                     emotion, tone, blendshape
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES (%s, {session_vals}%s, %s, %s, %s, %s, %s, %s)
             """
             cursor.execute(sql, (
                 model_name,
+                *((session_id,) if by_session else ()),
                 request,
                 response,
                 translate_response,
@@ -49,6 +60,24 @@ def save_llm_interaction(
         if conn:
             conn.close()
 
+async def save_llm_interaction_async(
+    model_name: str,
+    request: str,
+    response: str,
+    translate_response: str,
+    ja_translate_response: str,
+    emotion: str,
+    tone: str,
+    blendshape: str,
+    session_id: str = ""
+) -> int:
+    return await run_in_db(
+        save_llm_interaction,
+        model_name, request, response,
+        translate_response, ja_translate_response,
+        emotion, tone, blendshape, session_id
+    )
+
 def save_llm_feedback(interaction_id: int, rating: str | None, tone_score: float):
     conn = None
     try:
@@ -87,6 +116,31 @@ def get_llm_interactions(limit: int = 100):
         if conn:
             conn.close()
 
+def get_labeled_emotion_samples(limit: int = 500) -> list[dict]:
+    """
+    감정 분석기 평가용으로 LLM 응답과 저장된 감정/톤/블렌드셰이프 라벨을 가져옵니다.
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor(DictCursor) as cursor:
+            sql = """
+                SELECT id, response, emotion, tone, blendshape
+                FROM llm_interactions
+                WHERE response IS NOT NULL AND response != ''
+                  AND emotion IS NOT NULL AND emotion != ''
+                ORDER BY created_at DESC
+                LIMIT %s
+            """
+            cursor.execute(sql, (limit,))
+            return cursor.fetchall()
+    except Exception as e:
+        print("\033[91m" + f"[ERROR] 감정 평가 샘플 조회 실패: {e}" + "\033[0m")
+        return []
+    finally:
+        if conn:
+            conn.close()
+
 def save_llm_model_to_db(model_info):
     conn = None
     try:
@@ -120,7 +174,8 @@ def save_llm_model_to_db(model_info):
 def get_llm_models_from_db():
     conn = None
     try:
-        with get_connection().cursor(pymysql.cursors.DictCursor) as cursor:
+        conn = get_connection()
+        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
             sql = """
                 SELECT id, model_key, name, type, framework, endpoint, status, enabled, apiKey, token
                 FROM llm_models
@@ -154,6 +209,9 @@ def get_llm_model_by_id(model_id: int) -> Optional[dict]:
         if conn:
             conn.close()
 
+async def get_llm_model_by_id_async(model_id: int) -> Optional[dict]:
+    return await run_in_db(get_llm_model_by_id, model_id)
+
 def update_llm_model_in_db(model_id: int, model_info):
     conn = None
     try:
@@ -204,4 +262,41 @@ def update_llm_model_params(model_id: int, params: dict):
             cursor.execute("UPDATE llm_models SET params = %s WHERE id = %s", (json.dumps(params), model_id))
         conn.commit()
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+def get_llm_model_params(model_id: int) -> Optional[dict]:
+    """
+    모델 params(JSON)를 dict로 반환합니다. 모델이 없으면 None.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT params FROM llm_models WHERE id = %s", (model_id,))
+            row = cursor.fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    try:
+        return json.loads(row[0] or '{}')
+    except Exception:
+        return {}
+
+def merge_llm_model_params(model_id: int, patch: dict) -> dict:
+    """
+    params에 patch의 최상위 키를 덮어써 저장합니다. 읽기-수정-쓰기를 한 트랜잭션에서 처리합니다.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT params FROM llm_models WHERE id = %s FOR UPDATE", (model_id,))
+            row = cursor.fetchone()
+            merged = {**(json.loads(row[0]) if row and row[0] else {}), **patch}
+            cursor.execute("UPDATE llm_models SET params = %s WHERE id = %s", (json.dumps(merged), model_id))
+        conn.commit()
+        return merged
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
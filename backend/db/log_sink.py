@@ -0,0 +1,152 @@
+# backend/db/log_sink.py
+
+import atexit
+import os
+import threading
+from collections import deque
+from backend.db.base import get_connection
+
+LOG_SINK_BUFFER = int(os.environ.get('LOG_SINK_BUFFER', 10000))
+LOG_SINK_BATCH = int(os.environ.get('LOG_SINK_BATCH', 200))
+LOG_SINK_INTERVAL = float(os.environ.get('LOG_SINK_INTERVAL', 1.0))
+LOG_SINK_OVERFLOW = os.environ.get('LOG_SINK_OVERFLOW', 'drop_oldest')
+
+_sinks: list["LogSink"] = []
+
+class LogSink:
+    """
+    로그 행을 메모리 큐에 쌓아 두었다가 백그라운드 스레드에서 multi-row INSERT로 적재합니다.
+
+    - batch_size 만큼 쌓이거나 flush_interval 초가 지나면 flush 합니다.
+    - 버퍼가 가득 차면 overflow 정책에 따라 가장 오래된 행(drop_oldest)
+      또는 새로 들어온 행(drop_newest)을 버리고 dropped 카운터를 올립니다.
+    - 요청 경로에서는 enqueue()만 호출하므로 DB를 기다리지 않습니다.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: tuple[str, ...],
+        max_buffer: int = LOG_SINK_BUFFER,
+        batch_size: int = LOG_SINK_BATCH,
+        flush_interval: float = LOG_SINK_INTERVAL,
+        overflow: str = LOG_SINK_OVERFLOW
+    ):
+        if overflow not in ('drop_oldest', 'drop_newest'):
+            raise ValueError(f"지원하지 않는 overflow 정책입니다: {overflow}")
+
+        self.table = table
+        self.columns = columns
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+
+        self._sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+        _sinks.append(self)
+
+    def enqueue(self, row: tuple):
+        with self._lock:
+            if self._stopped:
+                self.dropped += 1
+                return
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                if self.overflow == 'drop_newest':
+                    return
+                self._buffer.popleft()
+            self._buffer.append(row)
+            self.enqueued += 1
+            pending = len(self._buffer)
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"log-sink-{self.table}", daemon=True
+                )
+                self._thread.start()
+
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if not self._buffer:
+                        return
+                    count = min(self.batch_size, len(self._buffer))
+                    batch = [self._buffer.popleft() for _ in range(count)]
+
+                try:
+                    conn = get_connection()
+                    try:
+                        with conn.cursor() as cursor:
+                            # pymysql은 INSERT ... VALUES 구문의 executemany를 multi-row INSERT 한 번으로 묶어 보냅니다.
+                            cursor.executemany(self._sql, batch)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                except Exception as e:
+                    print(f'[ERROR] 로그 flush 실패 ({self.table}, {len(batch)}건): {e}')
+                    with self._lock:
+                        self.failed_flushes += 1
+                        # 다음 주기에 재시도하되, 버퍼 한도를 넘는 만큼은 버립니다.
+                        room = self.max_buffer - len(self._buffer)
+                        keep = batch[:max(room, 0)]
+                        self.dropped += len(batch) - len(keep)
+                        self._buffer.extendleft(reversed(keep))
+                    return
+
+                with self._lock:
+                    self.flushed += len(batch)
+
+    def close(self):
+        with self._lock:
+            self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "table": self.table,
+                "pending": len(self._buffer),
+                "max_buffer": self.max_buffer,
+                "overflow": self.overflow,
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed_flushes": self.failed_flushes,
+            }
+
+def close_log_sinks():
+    for sink in _sinks:
+        sink.close()
+
+def get_log_sink_stats() -> list[dict]:
+    return [sink.stats() for sink in _sinks]
+
+atexit.register(close_log_sinks)
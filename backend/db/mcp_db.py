@@ -5,8 +5,12 @@ from pymysql.cursors import DictCursor
 from datetime import datetime
 from typing import List, Optional
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
+from backend.db.log_sink import LogSink
 from backend.utils.prompt_utils import apply_variables
 
+mcp_log_sink = LogSink("mcp_logs", ("type", "source", "message"))
+
 def list_mcp_servers() -> List[dict]:
     conn = get_connection()
     try:
@@ -72,18 +76,32 @@ def delete_mcp_server(alias: str):
         conn.close()
 
 def insert_mcp_log(type: str, source: str, message: str):
+    mcp_log_sink.enqueue((type, source, message))
+
+def get_tools_by_ids(tool_ids: list[int]) -> list[dict]:
+    if not tool_ids:
+        return []
     conn = get_connection()
     try:
-        with conn.cursor() as cursor:
-            cursor.execute('''
-                INSERT INTO mcp_logs (type, source, message)
-                VALUES (%s, %s, %s)
-            ''', (type, source, message))
-        conn.commit()
+        with conn.cursor(DictCursor) as cursor:
+            format_strings = ','.join(['%s'] * len(tool_ids))
+            cursor.execute(f'''
+                SELECT id, name, type, command, enabled FROM mcp_tools
+                WHERE id IN ({format_strings})
+            ''', tuple(tool_ids))
+            return cursor.fetchall()
     finally:
         conn.close()
 
-def get_prompt_templates_by_ids(ids: list[int]) -> list[str]:
+async def get_tools_by_ids_async(tool_ids: list[int]) -> list[dict]:
+    if not tool_ids:
+        return []
+    return await run_in_db(get_tools_by_ids, tool_ids)
+
+def get_prompt_template_rows_by_ids(ids: list[int]) -> list[dict]:
+    """
+    변수 치환 전의 템플릿 원문과 파싱된 변수 목록을 반환합니다.
+    """
     if not ids:
         return []
     conn = get_connection()
@@ -94,17 +112,25 @@ def get_prompt_templates_by_ids(ids: list[int]) -> list[str]:
                 SELECT template, variables FROM mcp_prompts
                 WHERE id IN ({format_strings}) AND enabled = 1
             ''', ids)
-            rows = cursor.fetchall()
-            prompts = []
-            for row in rows:
-                template = row['template']
-                vars = json.loads(row['variables'] or "[]")
-                values = {
-                    "time": datetime.now().strftime("%H:%M"),
-                    "user_name": "다엘",
-                    "date": datetime.now().strftime("%Y-%m-%d")
-                }
-                prompts.append(apply_variables(template, vars, values))
-            return prompts
+            return [
+                {"template": row['template'], "variables": json.loads(row['variables'] or "[]")}
+                for row in cursor.fetchall()
+            ]
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+async def get_prompt_template_rows_by_ids_async(ids: list[int]) -> list[dict]:
+    if not ids:
+        return []
+    return await run_in_db(get_prompt_template_rows_by_ids, ids)
+
+def get_prompt_templates_by_ids(ids: list[int]) -> list[str]:
+    prompts = []
+    for row in get_prompt_template_rows_by_ids(ids):
+        values = {
+            "time": datetime.now().strftime("%H:%M"),
+            "user_name": "다엘",
+            "date": datetime.now().strftime("%Y-%m-%d")
+        }
+        prompts.append(apply_variables(row['template'], row['variables'], values))
+    return prompts
\ No newline at end of file
@@ -0,0 +1,156 @@
+# backend/db/memory_db.py
+
+from pymysql.cursors import DictCursor
+from typing import Optional
+from backend.db.base import get_connection
+
+_table_ready = False
+# llm_interactions.session_id 열 존재 여부 (None = 아직 확인 전)
+_interaction_column: bool | None = None
+
+def ensure_memory_summary_table():
+    global _table_ready
+    if _table_ready:
+        return
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS llm_memory_summaries (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    model_id INT NOT NULL,
+                    session_id VARCHAR(64) NOT NULL DEFAULT '',
+                    summary TEXT NOT NULL,
+                    last_interaction_id INT NOT NULL DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    UNIQUE KEY uq_model_session (model_id, session_id)
+                )
+            """)
+        conn.commit()
+        _table_ready = True
+    finally:
+        conn.close()
+
+def _session_column_exists(cursor) -> bool:
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'llm_interactions' AND COLUMN_NAME = 'session_id'
+    """)
+    return bool(cursor.fetchone()[0])
+
+def ensure_interaction_session_column():
+    """
+    llm_interactions에 session_id 열을 추가합니다. 세션별 요약이 다른 세션의 대화를 섞지 않도록 합니다.
+    ALTER가 오래 걸릴 수 있으므로 채팅 턴이 아니라 시작 시 마이그레이션(migrate_memory_schema)에서만 호출합니다.
+    """
+    global _interaction_column
+    if _interaction_column:
+        return
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            if not _session_column_exists(cursor):
+                cursor.execute("""
+                    ALTER TABLE llm_interactions
+                        ADD COLUMN session_id VARCHAR(64) NOT NULL DEFAULT '',
+                        ADD INDEX idx_model_session (model_name, session_id, id)
+                """)
+        conn.commit()
+        _interaction_column = True
+    finally:
+        conn.close()
+
+def has_interaction_session_column() -> bool:
+    """
+    session_id 열이 있는지 한 번만 확인해 둡니다. 열이 없으면 저장·조회는 예전 열 목록으로 동작합니다.
+    """
+    global _interaction_column
+    if _interaction_column is None:
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                _interaction_column = _session_column_exists(cursor)
+        finally:
+            conn.close()
+    return _interaction_column
+
+def migrate_memory_schema():
+    """
+    서버 시작 시 요약 테이블과 session_id 열을 준비합니다. 실패해도 채팅 저장은 예전 열 목록으로 계속됩니다.
+    """
+    for step in (ensure_memory_summary_table, ensure_interaction_session_column):
+        try:
+            step()
+        except Exception as e:
+            print("\033[91m" + f"[ERROR] 메모리 스키마 준비 실패 ({step.__name__}): {e}" + "\033[0m")
+
+def get_memory_summary(model_id: int, session_id: str = "") -> Optional[dict]:
+    conn = None
+    try:
+        ensure_memory_summary_table()
+        conn = get_connection()
+        with conn.cursor(DictCursor) as cursor:
+            cursor.execute("""
+                SELECT summary, last_interaction_id, updated_at
+                FROM llm_memory_summaries
+                WHERE model_id = %s AND session_id = %s
+            """, (model_id, session_id))
+            return cursor.fetchone()
+    except Exception as e:
+        print("\033[91m" + f"[ERROR] 대화 요약 조회 실패: {e}" + "\033[0m")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def save_memory_summary(model_id: int, session_id: str, summary: str, last_interaction_id: int):
+    conn = None
+    try:
+        ensure_memory_summary_table()
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO llm_memory_summaries (model_id, session_id, summary, last_interaction_id)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    summary = VALUES(summary),
+                    last_interaction_id = VALUES(last_interaction_id)
+            """, (model_id, session_id, summary, last_interaction_id))
+        conn.commit()
+    except Exception as e:
+        print("\033[91m" + f"[ERROR] 대화 요약 저장 실패: {e}" + "\033[0m")
+    finally:
+        if conn:
+            conn.close()
+
+def get_interactions_since(model_name: str, session_id: str, after_id: int, limit: int = 50) -> list[dict]:
+    conn = None
+    try:
+        by_session = has_interaction_session_column()
+        conn = get_connection()
+        with conn.cursor(DictCursor) as cursor:
+            if by_session:
+                cursor.execute("""
+                    SELECT id, request, response
+                    FROM llm_interactions
+                    WHERE model_name = %s AND session_id = %s AND id > %s
+                    ORDER BY id ASC
+                    LIMIT %s
+                """, (model_name, session_id, after_id, limit))
+            else:
+                cursor.execute("""
+                    SELECT id, request, response
+                    FROM llm_interactions
+                    WHERE model_name = %s AND id > %s
+                    ORDER BY id ASC
+                    LIMIT %s
+                """, (model_name, after_id, limit))
+            return cursor.fetchall()
+    except Exception as e:
+        print("\033[91m" + f"[ERROR] 요약 대상 대화 조회 실패: {e}" + "\033[0m")
+        return []
+    finally:
+        if conn:
+            conn.close()
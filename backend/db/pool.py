@@ -0,0 +1,201 @@
+# backend/db/pool.py
+
+import threading
+import time
+from collections import deque
+import pymysql
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+class PooledConnection:
+    """
+    pymysql 커넥션 래퍼. close()를 호출하면 실제로 끊지 않고 풀에 반납합니다.
+    그 외 속성/메서드(cursor, commit, rollback 등)는 원본 커넥션으로 위임됩니다.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        if name in ("_pool", "_raw", "_created_at", "_released"):
+            raise AttributeError(name)
+        if self._released:
+            raise pymysql.err.InterfaceError(0, "반납된 커넥션입니다.")
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._raw, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # close() 없이 버려진 커넥션도 풀 슬롯을 돌려받도록 처리
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """
+    크기가 제한된 MySQL 커넥션 풀.
+
+    - 대여 시 ping으로 상태를 확인하고, 끊긴 커넥션은 재연결합니다.
+    - max_idle 초 이상 놀고 있던 커넥션은 버리고 새로 만듭니다.
+    - max_lifetime 초가 지난 커넥션은 반납 시점에 닫습니다.
+    """
+
+    def __init__(
+        self,
+        connect_kwargs: dict,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        sample_size: int = 1024
+    ):
+        self._connect_kwargs = connect_kwargs
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+
+        self._idle = deque()  # (raw, created_at, released_at)
+        self._size = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_samples = deque(maxlen=sample_size)
+        self._checkout_samples = deque(maxlen=sample_size)
+
+    def _connect(self):
+        raw = pymysql.connect(**self._connect_kwargs)
+        with self._cond:
+            self._created += 1
+        return raw
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._discarded += 1
+
+    def acquire(self) -> PooledConnection:
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        entry = None
+        create = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"DB 커넥션 풀 대기 시간 초과 ({self.timeout}s, size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+            self._in_use += 1
+        waited = time.perf_counter() - start
+
+        try:
+            if create:
+                raw, created_at = self._connect(), time.monotonic()
+            else:
+                raw, created_at, released_at = entry
+                if time.monotonic() - released_at > self.max_idle:
+                    self._discard(raw)
+                    raw, created_at = self._connect(), time.monotonic()
+                else:
+                    raw.ping(reconnect=True)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._checkouts += 1
+            self._wait_samples.append(waited)
+            self._checkout_samples.append(time.perf_counter() - start)
+
+        return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at: float):
+        reusable = time.monotonic() - created_at < self.max_lifetime and raw.open
+        if reusable:
+            try:
+                # 커밋되지 않은 트랜잭션/스냅샷이 다음 사용자에게 넘어가지 않도록 정리
+                raw.rollback()
+            except Exception:
+                reusable = False
+
+        if not reusable:
+            self._discard(raw)
+
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((raw, created_at, time.monotonic()))
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for raw, _, _ in idle:
+            self._discard(raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            waits = sorted(self._wait_samples)
+            checkouts = sorted(self._checkout_samples)
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "wait_ms": _percentiles(waits),
+                "checkout_ms": _percentiles(checkouts),
+            }
+
+def _percentiles(sorted_samples: list[float]) -> dict:
+    if not sorted_samples:
+        return {"p50": None, "p95": None, "p99": None}
+
+    def pick(q: float) -> float:
+        idx = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+        return round(sorted_samples[idx] * 1000, 3)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
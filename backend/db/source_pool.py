@@ -0,0 +1,60 @@
+# backend/db/source_pool.py
+
+import os
+import threading
+import pymysql
+from backend.db.pool import ConnectionPool
+
+# database 타입 로컬 소스(외부 캐릭터 DB)별 커넥션 풀 설정
+SOURCE_POOL_CONFIG = {
+    'max_size': int(os.environ.get('DB_SOURCE_POOL_SIZE', 2)),
+    'timeout': float(os.environ.get('DB_SOURCE_POOL_TIMEOUT', 5)),
+    'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+    'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 3600)),
+}
+SOURCE_CONNECT_TIMEOUT = int(os.environ.get('DB_SOURCE_CONNECT_TIMEOUT', 5))
+
+# source_id -> (접속 설정, 풀)
+_pools: dict[int, tuple[tuple, ConnectionPool]] = {}
+_lock = threading.Lock()
+
+def source_connect_kwargs(source: dict) -> dict:
+    return {
+        "host": source["host"],
+        "port": int(source["port"] or 3306),
+        "user": source["username"],
+        "password": source["password"],
+        "database": source["path"].split("/")[-1],
+        "charset": "utf8mb4",
+        "connect_timeout": SOURCE_CONNECT_TIMEOUT,
+        "cursorclass": pymysql.cursors.DictCursor
+    }
+
+def get_source_pool(source: dict) -> ConnectionPool:
+    """
+    local_sources 행(id, host, port, username, password, path)에 대한 풀을 반환합니다.
+    접속 정보가 바뀌면 기존 풀을 닫고 새로 만듭니다.
+    """
+    kwargs = source_connect_kwargs(source)
+    config = tuple((k, v) for k, v in kwargs.items() if k != "cursorclass")
+
+    with _lock:
+        entry = _pools.get(source["id"])
+        if entry and entry[0] == config:
+            return entry[1]
+        if entry:
+            entry[1].close_all()
+        pool = ConnectionPool(kwargs, **SOURCE_POOL_CONFIG)
+        _pools[source["id"]] = (config, pool)
+        return pool
+
+def get_source_pool_stats() -> dict:
+    with _lock:
+        return {source_id: pool.stats() for source_id, (_, pool) in _pools.items()}
+
+def close_source_pools():
+    with _lock:
+        pools = [pool for _, pool in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
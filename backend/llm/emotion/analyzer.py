@@ -1,13 +1,86 @@
 # backend/llm/emotion/analyzer.py
+import os
 import httpx
+from collections import OrderedDict
 from typing import Dict
 from backend.llm.emotion.generator import generate_prompt
-from backend.llm.emotion.extractor import extract_emotion_json
+from backend.llm.emotion.extractor import extract_emotion_json, EMOTION_JSON_SCHEMA
+from backend.llm.emotion.classifier import classify_emotion
+from backend.utils.http_clients import get_http_client
+from backend.llm.services.endpoint_pool import get_endpoint_pool
 
-# 📌 실제 llama.cpp 서버가 실행 중인 IP로 고정
-LLAMA_ENDPOINT = "http://host.docker.internal:8081/v1/completions"
+# 📌 llama.cpp 감정 분석 서버 (쉼표로 여러 대 지정 시 최소 대기 요청 순으로 분산)
+EMOTION_ENDPOINTS = os.getenv("EMOTION_ENDPOINTS", "http://host.docker.internal:8081")
+
+# hybrid: 로컬 분류기 확신도가 임계값을 넘으면 LLM 생략 / llm: 항상 LLM / local: 항상 로컬
+EMOTION_CLASSIFIER_MODE = os.getenv("EMOTION_CLASSIFIER_MODE", "hybrid")
+EMOTION_LOCAL_THRESHOLD = float(os.getenv("EMOTION_LOCAL_THRESHOLD", 0.6))
+
+EMOTION_CACHE_SIZE = int(os.getenv("EMOTION_CACHE_SIZE", 512))
+# llama.cpp json_schema 제약 디코딩 사용 여부 (스키마를 지원하지 않는 서버라면 0)
+EMOTION_CONSTRAINED = os.getenv("EMOTION_CONSTRAINED", "1") == "1"
+
+_stats = {
+    "local": 0,
+    "llm": 0,
+    "cache_hits": 0,
+    "parse_failures": 0,
+    "prompt_tokens": 0,
+    "prompt_tokens_evaluated": 0,
+    "completion_tokens": 0,
+}
+_cache: OrderedDict[str, Dict[str, str]] = OrderedDict()
+
+def _cache_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def _cache_put(key: str, result: Dict[str, str]):
+    _cache[key] = result
+    _cache.move_to_end(key)
+    while len(_cache) > EMOTION_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+def get_emotion_stats() -> dict:
+    total = _stats["local"] + _stats["llm"] + _stats["cache_hits"]
+    llm_calls = _stats["llm"]
+    return {
+        **_stats,
+        "mode": EMOTION_CLASSIFIER_MODE,
+        "threshold": EMOTION_LOCAL_THRESHOLD,
+        "cache_entries": len(_cache),
+        "local_ratio": round(_stats["local"] / total, 3) if total else None,
+        "cache_hit_rate": round(_stats["cache_hits"] / total, 3) if total else None,
+        "parse_failure_rate": round(_stats["parse_failures"] / llm_calls, 3) if llm_calls else None,
+        "avg_prompt_tokens": round(_stats["prompt_tokens"] / llm_calls, 1) if llm_calls else None,
+        "avg_prompt_tokens_evaluated": round(_stats["prompt_tokens_evaluated"] / llm_calls, 1) if llm_calls else None,
+        "avg_completion_tokens": round(_stats["completion_tokens"] / llm_calls, 1) if llm_calls else None,
+    }
 
 async def analyze_emotion(text: str) -> Dict[str, str]:
+    """
+    캐시 → 로컬 분류기 → llama.cpp 감정 분석 서버 순으로 시도합니다.
+    로컬 분류기의 확신도가 낮을 때만 LLM을 호출하고, 그 결과를 캐시에 저장합니다.
+    """
+    key = _cache_key(text)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        _stats["cache_hits"] += 1
+        return dict(cached)
+
+    if EMOTION_CLASSIFIER_MODE != "llm":
+        local = classify_emotion(text)
+        if EMOTION_CLASSIFIER_MODE == "local" or local["confidence"] > EMOTION_LOCAL_THRESHOLD:
+            _stats["local"] += 1
+            print(f"[EMOTION] 로컬 분류 사용 (confidence={local['confidence']})")
+            return {k: local[k] for k in ("emotion", "tone", "blendshape")}
+
+    _stats["llm"] += 1
+    result = await analyze_emotion_llm(text)
+    _cache_put(key, result)
+    return dict(result)
+
+async def analyze_emotion_llm(text: str) -> Dict[str, str]:
     try:
         prompt = generate_prompt(text)
         # print("✅ generate_prompt 성공:", prompt)
@@ -19,8 +92,12 @@ async def analyze_emotion(text: str) -> Dict[str, str]:
         "prompt": prompt,
         "temperature": 0.2,
         "max_tokens": 64,
-        "stream": False
+        "stream": False,
+        # 고정된 지시문 부분의 KV 캐시를 재사용 (대상 문장은 프롬프트 끝에 위치)
+        "cache_prompt": True
     }
+    if EMOTION_CONSTRAINED:
+        payload["json_schema"] = EMOTION_JSON_SCHEMA
 
     # print("\n[🧠 감정 분석 시작]")
     # print("📨 입력 텍스트:", text)
@@ -28,11 +105,14 @@ async def analyze_emotion(text: str) -> Dict[str, str]:
     # print("📦 Payload:", payload)
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            res = await client.post(LLAMA_ENDPOINT, json=payload)
+        client = get_http_client("emotion")
+        async with get_endpoint_pool("emotion", EMOTION_ENDPOINTS).acquire() as endpoint:
+            res = await client.post(f"{endpoint}/v1/completions", json=payload)
             res.raise_for_status()
-            content = res.json()["choices"][0]["text"].strip()
-            print("📥 LLM 응답 원문:\n", content)
+        data = res.json()
+        content = data["choices"][0]["text"].strip()
+        _record_usage(data)
+        print("📥 LLM 응답 원문:\n", content)
     except httpx.RequestError as e:
         print("❌ RequestError:", e)
         raise ValueError(f"Request failed: {e}")
@@ -48,6 +128,16 @@ async def analyze_emotion(text: str) -> Dict[str, str]:
         print("✅ 파싱된 결과:", parsed)
         return parsed
     except Exception as e:
+        _stats["parse_failures"] += 1
         print("❌ 파싱 실패:", e)
         print("❓ 원문 응답 다시 출력:", repr(content))
         raise ValueError(f"감정 분석 응답 파싱 실패: {e}")
+
+def _record_usage(data: dict):
+    usage = data.get("usage") or {}
+    prompt_tokens = usage.get("prompt_tokens", 0)
+    _stats["prompt_tokens"] += prompt_tokens
+    _stats["completion_tokens"] += usage.get("completion_tokens", 0)
+    # llama.cpp timings.prompt_n: 캐시에 없어 실제로 평가된 프롬프트 토큰 수
+    timings = data.get("timings") or {}
+    _stats["prompt_tokens_evaluated"] += timings.get("prompt_n", prompt_tokens)
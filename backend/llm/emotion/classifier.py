@@ -0,0 +1,118 @@
+# backend/llm/emotion/classifier.py
+
+import re
+from typing import Dict
+
+# 감정별 (표현, 가중치). 표현은 단어 단위로만 맞추고, 활용형은 "|"로 나열합니다.
+# (어간 접두 매칭은 hopeless → hope, wonderful → wonder 같은 오분류를 만듭니다.)
+EMOTION_LEXICON: Dict[str, list[tuple[str, float]]] = {
+    "joyful": [("glad", 1.0), ("happy|happier|happiest|happily|happiness", 1.0), ("yay", 1.5), ("hooray", 1.5), ("delight|delighted|delightful", 1.0), ("wonderful", 0.8), ("awesome", 0.8), ("great news", 1.5), ("so fun", 1.0)],
+    "hopeful": [("hope|hopes|hoped|hoping", 1.5), ("hopeful|hopefully", 1.2), ("someday", 1.0), ("wish|wishing", 0.8), ("looking forward", 1.5), ("can't wait", 1.2), ("optimism|optimist|optimistic", 1.2), ("better tomorrow", 1.5), ("will be okay", 1.2)],
+    "melancholic": [("sad|sadder|saddest|sadly|sadness", 1.2), ("lonely|lonelier|loneliness", 1.2), ("empty|emptiness", 1.0), ("tears", 1.0), ("gloomy|gloom", 1.2), ("heavy heart", 1.5), ("miss you", 1.0), ("sorrow|sorrows|sorrowful", 1.2), ("hopeless|hopelessness", 1.2)],
+    "romantic": [("love you", 1.5), ("my heart", 1.2), ("darling", 1.2), ("kiss|kisses|kissed|kissing", 1.2), ("sweetheart", 1.2), ("beloved", 1.2), ("romantic|romance", 1.5), ("moonlight", 0.8)],
+    "peaceful": [("calm|calmer|calmly|calming", 1.2), ("peace|peaceful|peacefully", 1.2), ("relax|relaxed|relaxing", 1.2), ("quiet|quietly", 0.8), ("gentle breeze", 1.2), ("rest well", 1.2), ("serene|serenity", 1.5), ("take your time", 1.0), ("no rush", 1.0)],
+    "nervous": [("nervous|nervously", 1.5), ("anxious|anxiously", 1.5), ("anxiety", 1.5), ("worried", 1.2), ("worry|worries|worrying", 1.0), ("afraid", 1.0), ("scared", 1.0)],
+    "regretful": [("regret|regrets|regretted|regretting|regretful", 1.5), ("should have", 1.2), ("shouldn't have", 1.2), ("if only", 1.2), ("wish i had", 1.5), ("my fault", 1.0)],
+    "admiring": [("amazing", 1.2), ("impressive|impressed", 1.5), ("incredible", 1.2), ("brilliant", 1.2), ("admire|admired|admiration", 1.5), ("talented", 1.2), ("well done", 1.2), ("proud of you", 1.5)],
+    "tense": [("careful|carefully", 1.0), ("danger|dangerous", 1.5), ("urgent|urgently", 1.5), ("hurry", 1.2), ("watch out", 1.5), ("warning", 1.2), ("serious problem", 1.5), ("immediately", 1.0)],
+    "nostalgic": [("remember when", 1.5), ("back then", 1.5), ("used to", 1.0), ("memories", 1.2), ("memory", 0.8), ("childhood", 1.5), ("old days", 1.5), ("long ago", 1.2)],
+    "whimsical": [("magic|magical", 1.2), ("fairy|fairies", 1.5), ("unicorn|unicorns", 1.5), ("imagine", 0.8), ("dragon|dragons", 0.8), ("sparkle|sparkles|sparkling|sparkly", 1.0), ("wonderland", 1.5), ("silly", 1.0), ("hehe|hehehe", 1.2)],
+    "sarcastic": [("oh great", 1.5), ("oh sure", 1.5), ("yeah right", 1.5), ("obviously", 0.8), ("how wonderful", 1.2), ("what a surprise", 1.5), ("as if", 1.0)],
+    "bitter": [("not what you promised", 2.0), ("unfair", 1.2), ("betray|betrayed|betrayal", 1.5), ("whatever", 0.8), ("lied", 1.2), ("never again", 1.2), ("resent|resented|resentful|resentment", 1.5), ("disappoint|disappointed|disappointing|disappointment", 1.0)],
+    "apologetic": [("sorry", 1.5), ("apologize|apologise|apologies|apology", 1.5), ("forgive me", 1.5), ("my apologies", 1.5), ("didn't mean", 1.2), ("excuse me", 0.8), ("my mistake", 1.2)],
+    "affectionate": [("here with me", 1.5), ("care about you", 1.5), ("hugs", 1.2), ("hug you", 1.2), ("always here", 1.2), ("by your side", 1.5), ("dear", 0.8), ("take care", 1.0), ("cuddle|cuddles|cuddling|cuddly", 1.2)],
+    "solemn": [("condolence|condolences", 1.5), ("passed away", 1.5), ("rest in peace", 1.5), ("mourn|mourning|mourned", 1.5), ("grave", 1.0), ("sincerely", 0.8), ("funeral", 1.5)],
+    "cheerful": [("hello", 1.0), ("hi there", 1.2), ("hey", 0.8), ("good morning", 1.2), ("let's go", 1.2), ("let's", 0.6), ("sure thing", 1.2), ("of course", 0.6), ("nice to", 1.0), ("!", 0.4)],
+    "embarrassed": [("embarrass|embarrassed|embarrassing|embarrassment", 1.5), ("blush|blushed|blushing", 1.5), ("awkward", 1.2), ("oops", 1.2), ("shy", 1.0), ("flustered", 1.5), ("ahem", 1.2)],
+    "contemplative": [("wonder|wonders|wondered|wondering", 1.0), ("perhaps", 0.8), ("maybe", 0.6), ("think about", 1.0), ("meaning of", 1.2), ("ponder|pondered|pondering", 1.5), ("reflect|reflecting|reflection", 1.2), ("hmm|hmmm", 1.2), ("?", 0.3)],
+}
+
+# 감정별 기본 톤과 블렌드셰이프 (PROMPT_TEMPLATE의 예시를 기준으로 정리)
+EMOTION_DEFAULTS: Dict[str, tuple[str, str]] = {
+    "joyful": ("playful", "Joy"),
+    "hopeful": ("sincere", "smile2"),
+    "melancholic": ("introspective", "sad1"),
+    "romantic": ("affectionate", "heart"),
+    "peaceful": ("gentle", "smile1"),
+    "nervous": ("hesitant", "shy3"),
+    "regretful": ("sincere", "sad2"),
+    "admiring": ("admiring", "smile5"),
+    "tense": ("intense", "majime"),
+    "nostalgic": ("dreamy", "sleepy"),
+    "whimsical": ("playful", "wink"),
+    "sarcastic": ("teasing", "smile7"),
+    "bitter": ("assertive", "anger5"),
+    "apologetic": ("sincere", "shy4"),
+    "affectionate": ("gentle", "smile4"),
+    "solemn": ("respectful", "majime"),
+    "cheerful": ("casual", "smile3"),
+    "embarrassed": ("hesitant", "Shy"),
+    "contemplative": ("introspective", "Neutral"),
+}
+
+# 한 번 나온 약한 단서만으로는 넘지 못하도록 분모에 더하는 값
+SMOOTHING = 1.0
+
+# 단서 바로 앞(같은 구절 안) 이 단어 수 안에 부정어가 있으면 그 단서는 세지 않습니다.
+NEGATION_WINDOW = 3
+NEGATIONS = {"not", "no", "never", "nothing", "hardly", "without", "nor", "neither"}
+
+_CLAUSE_BREAK = re.compile(r"[.,!?;:]")
+_WORD = re.compile(r"[\w']+")
+
+def _compile(entries: list[tuple[str, float]]) -> list[tuple[re.Pattern, float, bool]]:
+    """
+    (패턴, 가중치, 부정 확인 여부). 글자가 있는 표현은 단어 경계로 감싸고, 문장부호는 그대로 맞춥니다.
+    """
+    compiled = []
+    for entry, weight in entries:
+        forms = "|".join(re.escape(form) for form in entry.split("|"))
+        if any(ch.isalnum() for ch in entry):
+            compiled.append((re.compile(r"\b(?:" + forms + r")\b", re.IGNORECASE), weight, True))
+        else:
+            compiled.append((re.compile(forms), weight, False))
+    return compiled
+
+_COMPILED = {emotion: _compile(entries) for emotion, entries in EMOTION_LEXICON.items()}
+
+def _normalize(text: str) -> str:
+    return text.replace("’", "'").replace("‘", "'")
+
+def _negated(text: str, start: int) -> bool:
+    clause = _CLAUSE_BREAK.split(text[max(0, start - 80):start])[-1]
+    words = _WORD.findall(clause.lower())[-NEGATION_WINDOW:]
+    return any(word in NEGATIONS or word.endswith("n't") for word in words)
+
+def score_emotions(text: str) -> Dict[str, float]:
+    text = _normalize(text)
+    scores = {}
+    for emotion, patterns in _COMPILED.items():
+        score = sum(
+            weight
+            for pattern, weight, check_negation in patterns
+            for m in pattern.finditer(text)
+            if not (check_negation and _negated(text, m.start()))
+        )
+        if score:
+            scores[emotion] = score
+    return scores
+
+def classify_emotion(text: str) -> Dict[str, object]:
+    """
+    어휘 기반으로 감정/톤/블렌드셰이프를 추정합니다.
+    confidence는 최고 점수 / (전체 점수 + SMOOTHING) 이며, 단서가 없으면 0입니다.
+    """
+    scores = score_emotions(text)
+    if not scores:
+        return {"emotion": "neutral", "tone": "neutral", "blendshape": "Neutral", "confidence": 0.0}
+
+    emotion, top = max(scores.items(), key=lambda item: item[1])
+    tone, blendshape = EMOTION_DEFAULTS[emotion]
+    confidence = top / (sum(scores.values()) + SMOOTHING)
+
+    return {
+        "emotion": emotion,
+        "tone": tone,
+        "blendshape": blendshape,
+        "confidence": round(confidence, 3)
+    }
@@ -0,0 +1,114 @@
+# backend/llm/emotion/evaluation.py
+"""
+로컬 감정 분류기와 LLM 감정 분석기의 정확도/지연 시간 비교.
+
+llm_interactions에 저장된 감정 라벨은 당시 LLM 분석 결과이므로,
+여기서의 정확도는 "기존 LLM 경로와의 일치율"입니다.
+
+    python -m backend.llm.emotion.evaluation --limit 300 --out eval.jsonl
+    python -m backend.llm.emotion.evaluation --data eval.jsonl --llm
+    python -m backend.llm.emotion.evaluation --data tests/data/emotion_eval.jsonl  # 테스트용 세트 (emotion/tone/blendshape 정확도 하한 확인)
+"""
+
+import json
+import time
+import asyncio
+import argparse
+
+from backend.llm.emotion.classifier import classify_emotion
+from backend.llm.emotion.analyzer import analyze_emotion_llm, EMOTION_LOCAL_THRESHOLD
+
+FIELDS = ("emotion", "tone", "blendshape")
+
+def build_eval_set(limit: int = 500, path: str | None = None) -> list[dict]:
+    from backend.db.llm_db import get_labeled_emotion_samples
+
+    samples = [
+        {"id": row["id"], "text": row["response"], **{f: row[f] for f in FIELDS}}
+        for row in get_labeled_emotion_samples(limit)
+    ]
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            for sample in samples:
+                f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+    return samples
+
+def load_eval_set(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _latency(samples_ms: list[float]) -> dict:
+    if not samples_ms:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(samples_ms)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+    return {"p50": pick(0.50), "p95": pick(0.95), "max": round(ordered[-1], 3)}
+
+def _accuracy(pairs: list[tuple[dict, dict]]) -> dict:
+    if not pairs:
+        return {f: None for f in FIELDS}
+    return {
+        f: round(sum(pred.get(f) == gold.get(f) for pred, gold in pairs) / len(pairs), 3)
+        for f in FIELDS
+    }
+
+def evaluate_local(samples: list[dict], threshold: float = EMOTION_LOCAL_THRESHOLD) -> dict:
+    pairs, confident, latencies = [], [], []
+
+    for sample in samples:
+        start = time.perf_counter()
+        pred = classify_emotion(sample["text"])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        pairs.append((pred, sample))
+        if pred["confidence"] > threshold:
+            confident.append((pred, sample))
+
+    return {
+        "samples": len(samples),
+        "accuracy": _accuracy(pairs),
+        "threshold": threshold,
+        "coverage": round(len(confident) / len(samples), 3) if samples else None,
+        "confident_accuracy": _accuracy(confident),
+        "latency_ms": _latency(latencies),
+    }
+
+async def evaluate_llm(samples: list[dict]) -> dict:
+    pairs, latencies, failures = [], [], 0
+
+    for sample in samples:
+        start = time.perf_counter()
+        try:
+            pred = await analyze_emotion_llm(sample["text"])
+        except Exception:
+            failures += 1
+            continue
+        finally:
+            latencies.append((time.perf_counter() - start) * 1000)
+        pairs.append((pred, sample))
+
+    return {
+        "samples": len(samples),
+        "failures": failures,
+        "accuracy": _accuracy(pairs),
+        "latency_ms": _latency(latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 분석 경로 비교 리포트")
+    parser.add_argument("--data", help="저장된 평가 세트(JSONL). 없으면 DB에서 생성")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--out", help="DB에서 만든 평가 세트를 저장할 경로")
+    parser.add_argument("--threshold", type=float, default=EMOTION_LOCAL_THRESHOLD)
+    parser.add_argument("--llm", action="store_true", help="LLM 경로도 함께 측정")
+    args = parser.parse_args()
+
+    samples = load_eval_set(args.data) if args.data else build_eval_set(args.limit, args.out)
+    report = {"local": evaluate_local(samples, args.threshold)}
+    if args.llm:
+        report["llm"] = asyncio.run(evaluate_llm(samples))
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # backend/llm/emotion/extractor.py
+import re
 import json
 from typing import Dict
 
@@ -9,22 +10,90 @@ ALLOWED_EMOTIONS = {
     "embarrassed", "contemplative"
 }
 
-def extract_emotion_json(text: str) -> Dict[str, str]:
-    print("🧪 파싱 대상 텍스트:", repr(text))
-    
+ALLOWED_TONES = {
+    "formal", "casual", "poetic", "gentle", "assertive", "playful",
+    "introspective", "hesitant", "respectful", "intense", "humorous",
+    "sincere", "dreamy", "admiring", "affectionate", "bitter", "apologetic",
+    "teasing"
+}
+
+ALLOWED_BLENDSHAPES = {
+    "Joy", "smile1", "smile2", "smile3", "smile4", "smile5", "smile6", "smile7", "smile8",
+    "sad1", "sad2", "cry1", "cry2", "cry3", "cry4", "Crying", "Sorrow",
+    "anger1", "anger2", "anger3", "anger4", "anger5", "anger6", "anger7", "anger8", "Angry",
+    "shy1", "shy2", "shy3", "shy4", "shy5", "shy6", "shy7", "Shy",
+    "surprised1", "surprised2", "shock1", "shock2", "shock3",
+    "Neutral", "wink", "wink (左)", "wink (右)", "heart", "Fun", "majime", "sleepy"
+}
+
+# 블렌드셰이프 이름은 대소문자를 구분하므로, 모델이 대소문자를 틀려도 원래 이름으로 되돌립니다.
+_BLENDSHAPE_BY_LOWER = {name.lower(): name for name in ALLOWED_BLENDSHAPES}
+
+# llama.cpp json_schema 제약 디코딩용 스키마
+EMOTION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "emotion": {"type": "string", "enum": sorted(ALLOWED_EMOTIONS)},
+        "tone": {"type": "string", "enum": sorted(ALLOWED_TONES)},
+        "blendshape": {"type": "string", "enum": sorted(ALLOWED_BLENDSHAPES)},
+    },
+    "required": ["emotion", "tone", "blendshape"],
+    "additionalProperties": False,
+}
+
+_OBJECT_RE = re.compile(r"\{.*?\}", re.DOTALL)
+_FIELD_RE = {
+    field: re.compile(rf'["\']?{field}["\']?\s*[:=]\s*["\']?([^"\',}}\n]+)', re.IGNORECASE)
+    for field in ("emotion", "tone", "blendshape")
+}
+
+def _parse_fields(text: str) -> dict | None:
     try:
         data = json.loads(text)
-        emotion = data.get("emotion", "neutral")
-        tone = data.get("tone", "neutral")
-        blendshape = data.get("blendshape", "Neutral")
-
-        if emotion not in ALLOWED_EMOTIONS:
-            emotion = "neutral"
-
-        return {
-            "emotion": emotion,
-            "tone": tone,
-            "blendshape": blendshape
-        }
-    except Exception as e:
-        raise ValueError(f"응답 파싱 실패: {text} ({e})")
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+
+    # 코드 펜스나 설명이 섞인 경우: 첫 JSON 객체만 다시 시도
+    for match in _OBJECT_RE.finditer(text):
+        try:
+            data = json.loads(match.group(0))
+            if isinstance(data, dict):
+                return data
+        except Exception:
+            continue
+
+    # 따옴표가 빠진 경우 등: 필드를 하나씩 찾아봅니다.
+    data = {}
+    for field, pattern in _FIELD_RE.items():
+        match = pattern.search(text)
+        if match:
+            data[field] = match.group(1).strip()
+    return data or None
+
+def extract_emotion_json(text: str) -> Dict[str, str]:
+    """
+    감정 분석 응답에서 emotion/tone/blendshape를 추출합니다.
+    엄격한 JSON이 아니어도 필드를 찾을 수 있으면 허용 목록으로 보정해 반환하고,
+    하나도 찾지 못한 경우에만 ValueError를 발생시킵니다.
+    """
+    data = _parse_fields(text)
+    if not data:
+        raise ValueError(f"응답 파싱 실패: {text}")
+
+    emotion = str(data.get("emotion", "neutral")).strip().lower()
+    tone = str(data.get("tone", "neutral")).strip().lower()
+    blendshape = str(data.get("blendshape", "Neutral")).strip()
+
+    if emotion not in ALLOWED_EMOTIONS:
+        emotion = "neutral"
+    if tone not in ALLOWED_TONES:
+        tone = "neutral"
+    blendshape = _BLENDSHAPE_BY_LOWER.get(blendshape.lower(), "Neutral")
+
+    return {
+        "emotion": emotion,
+        "tone": tone,
+        "blendshape": blendshape
+    }
@@ -1,43 +1,130 @@
 # backend/llm/memory/context_builder.py
 
+import os
 from backend.llm.memory.summarizer import get_summary
-from typing import List, Dict
+from backend.llm.memory.tokenizer import count_message_tokens
+from typing import List, Dict, Optional
+
+# 모델 컨텍스트 길이 (memory.contextTokens가 없을 때)
+LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", 4096))
+# 기록이 예산을 넘으면 이 비율까지 한 번에 줄여, 이후 몇 턴 동안 기록 시작 지점(=접두사)을 유지합니다.
+LLM_CONTEXT_LOW_WATER = float(os.getenv("LLM_CONTEXT_LOW_WATER", 0.75))
+
+def _system(content: str) -> Dict:
+    return {"role": "system", "content": content}
 
 async def build_context(
     model_id: int,
     system_prompt: str,
     user_messages: List[Dict],
-    memory_settings: Dict
+    memory_settings: Dict,
+    extras: Optional[Dict] = None,
+    state: Optional[Dict] = None,
+    session_id: str = ""
 ) -> List[Dict]:
     """
-    memory.strategy에 맞는 context 메시지 리스트를 생성합니다.
+    memory.strategy에 맞는 context 메시지 리스트를 토큰 예산 안에서 생성합니다.
+
+    예산 = contextTokens - maxTokens(응답 몫). 우선순위는
+    system 프롬프트 > 마지막 사용자 메시지 > 도구 결과 > 요약 > 로컬 소스 > 최근 대화 순이며,
+    최종 순서는 system, 요약, 대화, 로컬 소스, 도구 결과입니다.
+    extras: {"sources": [str], "tools": [str]}
+    state: 세션별 상태(dict). 주어지면 기록 시작 지점을 저장해 두고, 예산을 넘을 때만
+           LLM_CONTEXT_LOW_WATER까지 잘라내 llama.cpp KV 캐시 접두사가 턴 사이에 유지되게 합니다.
+           Hybrid에서는 요약도 state에 고정해 두고 기록 시작 지점이 바뀌는 턴에만 새 요약으로 바꿉니다.
+           (요약이 바뀌면 그 뒤의 대화 기록 전체가 KV 캐시에서 다시 계산되기 때문)
+    session_id: 요약 메모리는 (model_id, session_id)별로 유지됩니다.
     """
 
     strategy = memory_settings.get("strategy", "None")
-    max_tokens = memory_settings.get("max_tokens", 64)
     include_history = memory_settings.get("includeHistory", True)
+    context_tokens = memory_settings.get("contextTokens", LLM_CONTEXT_TOKENS)
+    reply_tokens = memory_settings.get("maxTokens", 96)
+    extras = extras or {}
+
+    budget = context_tokens - reply_tokens
+
+    system = _system(system_prompt)
+    budget -= count_message_tokens(system)
+
+    last = user_messages[-1:]
+    budget -= sum(count_message_tokens(m) for m in last)
+
+    def pack(messages: List[Dict]) -> List[Dict]:
+        nonlocal budget
+        packed = []
+        for message in messages:
+            tokens = count_message_tokens(message)
+            if tokens <= budget:
+                packed.append(message)
+                budget -= tokens
+        return packed
+
+    tools = pack([_system(text) for text in extras.get("tools", [])])
+
+    summary = []
+    summary_text = fresh_summary = None
+    pin_summary = state is not None and strategy == "Hybrid" and include_history
+    if strategy in ("Summary", "Hybrid"):
+        fresh_summary = await get_summary(model_id, session_id)
+        summary_text = state.get("summary") if pin_summary else None
+        if summary_text is None:
+            summary_text = fresh_summary
+        if summary_text:
+            summary = pack([_system(summary_text)])
+
+    sources = pack([_system(text) for text in extras.get("sources", [])])
+
+    history = []
+    if strategy in ("Window", "Hybrid") and include_history:
+        anchor = state.get("history_anchor") if state is not None else None
+        history = _pack_history(user_messages[:-1], budget, state)
+        budget -= sum(count_message_tokens(m) for m in history)
+
+        # 기록 시작 지점이 바뀌어 접두사를 어차피 다시 계산하는 턴이면 고정된 요약을 새 요약으로 교체
+        if pin_summary and state.get("history_anchor") is not anchor and fresh_summary != summary_text:
+            replacement = [_system(fresh_summary)] if fresh_summary else []
+            delta = sum(count_message_tokens(m) for m in replacement) - sum(count_message_tokens(m) for m in summary)
+            if delta <= budget:
+                summary, summary_text = replacement, fresh_summary
+                budget -= delta
 
-    context = [{"role": "system", "content": system_prompt}]
+    if pin_summary:
+        state["summary"] = summary_text
 
-    if strategy == "None":
-        context += user_messages[-1:]
+    if budget < 0:
+        print(f"[CONTEXT] 필수 메시지만으로 예산 초과: {-budget} 토큰")
 
-    elif strategy == "Window":
-        window_size = max_tokens // 4
-        context += user_messages[-window_size:] if include_history else user_messages[-1:]
+    return [system, *summary, *history, *last, *sources, *tools]
 
-    elif strategy == "Summary":
-        summary = await get_summary(model_id)
-        context.append({"role": "system", "content": summary})
-        context += user_messages[-1:]
+def _anchor_index(messages: List[Dict], anchor: Optional[Dict]) -> Optional[int]:
+    if anchor is None:
+        return None
+    # 기록 시작 지점은 보통 끝 쪽에 있으므로 뒤에서부터 찾습니다.
+    for idx in range(len(messages) - 1, -1, -1):
+        if messages[idx] is anchor:
+            return idx
+    return None
 
-    elif strategy == "Hybrid":
-        summary = await get_summary(model_id)
-        window_size = max_tokens // 4
-        context.append({"role": "system", "content": summary})
-        context += user_messages[-window_size:] if include_history else user_messages[-1:]
+def _pack_history(older: List[Dict], budget: int, state: Optional[Dict]) -> List[Dict]:
+    if state is not None:
+        start = _anchor_index(older, state.get("history_anchor"))
+        if start is not None:
+            window = older[start:]
+            if sum(count_message_tokens(m) for m in window) <= budget:
+                return window
 
-    else:
-        context += user_messages[-1:]
+    # 최신 메시지부터 거꾸로 채우고, 처음으로 넘치는 지점에서 멈춰 대화가 끊기지 않게 합니다.
+    target = int(budget * LLM_CONTEXT_LOW_WATER) if state is not None else budget
+    history = []
+    for message in reversed(older):
+        tokens = count_message_tokens(message)
+        if tokens > target:
+            break
+        history.append(message)
+        target -= tokens
+    history.reverse()
 
-    return context
\ No newline at end of file
+    if state is not None:
+        state["history_anchor"] = history[0] if history else None
+    return history
@@ -1,5 +1,188 @@
 # backend/llm/memory/summarizer.py
 
-async def get_summary(model_id: int) -> str:
-    # TODO: 실제 summarization 로직 구현
-    return "This is a summary of the context."
+import os
+import time
+import asyncio
+from collections import OrderedDict
+
+from backend.db.async_base import run_in_db
+from backend.db.memory_db import get_memory_summary, save_memory_summary, get_interactions_since
+from backend.utils.http_clients import get_http_client
+from backend.llm.services.responder import wait_for_idle
+from backend.llm.services.endpoint_pool import get_endpoint_pool
+from backend.llm.services.session_store import SESSION_TTL, SESSION_MAX
+
+# 새 대화가 이만큼 쌓이면 요약에 반영
+SUMMARY_MIN_TURNS = int(os.getenv("LLM_SUMMARY_MIN_TURNS", 4))
+SUMMARY_BATCH_TURNS = int(os.getenv("LLM_SUMMARY_BATCH_TURNS", 20))
+SUMMARY_MAX_TOKENS = int(os.getenv("LLM_SUMMARY_MAX_TOKENS", 200))
+# 턴이 끝난 뒤 기다렸다가 시작 (번역/감정 분석과 겹치지 않도록)
+SUMMARY_DELAY = float(os.getenv("LLM_SUMMARY_DELAY", 3))
+# 요약 전용 llama.cpp 서버 (없으면 모델 endpoint 사용)
+SUMMARY_ENDPOINT = os.getenv("LLM_SUMMARY_ENDPOINT")
+SUMMARY_TIMEOUT = float(os.getenv("LLM_SUMMARY_TIMEOUT", 60))
+# 캐시된 요약 수와 유지 시간 (세션 저장소와 같은 기준, 만료되면 다음 조회 때 DB에서 다시 불러옴)
+SUMMARY_CACHE_TTL = float(os.getenv("LLM_SUMMARY_CACHE_TTL", SESSION_TTL))
+SUMMARY_CACHE_MAX = int(os.getenv("LLM_SUMMARY_CACHE_MAX", SESSION_MAX))
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a rolling summary of a conversation between a user and the assistant. "
+    "Merge the new turns into the existing summary. Keep names, preferences, facts and open topics. "
+    "Drop greetings and small talk. Write plain sentences in English, under 150 words."
+)
+
+# (model_id, session_id) -> {"summary": str, "last_interaction_id": int, "used_at": float}, 오래 안 쓴 순서
+_summaries: OrderedDict[tuple, dict] = OrderedDict()
+_tasks: dict[tuple, asyncio.Task] = {}
+# 작업 중에 들어온 갱신 요청: key -> (model_name, endpoints). 작업이 끝나면 다시 실행합니다.
+_dirty: dict[tuple, tuple] = {}
+
+# 요약 작업은 한 번에 하나만, 채팅 스트림이 없을 때만 실행합니다.
+_summary_lock = asyncio.Lock()
+_stats = {"folds": 0, "turns_folded": 0, "failures": 0}
+
+async def get_summary(model_id: int, session_id: str = "") -> str:
+    """
+    캐시된 최신 요약을 반환합니다. 턴을 막지 않도록 DB 조회나 요약 생성을 기다리지 않으며,
+    아직 캐시에 없으면 백그라운드로 불러오고 이번 턴은 빈 문자열을 반환합니다.
+    """
+    key = (model_id, session_id)
+    entry = _cached(key)
+    if entry is None:
+        if key not in _tasks:
+            _start(key, _load(key))
+        return ""
+
+    if not entry["summary"]:
+        return ""
+    return f"Summary of the earlier conversation: {entry['summary']}"
+
+def schedule_summary_update(model_id: int, model_name: str, endpoints: str, session_id: str = ""):
+    """
+    턴 저장 후 호출합니다. endpoints는 모델의 endpoint 설정(쉼표 구분)입니다.
+    진행 중인 작업(요약 또는 최초 로딩)이 있으면 끝난 뒤 한 번 더 돌도록 표시만 합니다.
+    """
+    key = (model_id, session_id)
+    if key in _tasks:
+        _dirty[key] = (model_name, endpoints)
+        return
+    _start(key, _update(key, model_name, endpoints))
+
+def get_summarizer_stats() -> dict:
+    return {
+        **_stats,
+        "cached": len(_summaries),
+        "running": len(_tasks),
+    }
+
+async def close_summarizer():
+    _dirty.clear()
+    for task in list(_tasks.values()):
+        task.cancel()
+    await asyncio.gather(*_tasks.values(), return_exceptions=True)
+    _tasks.clear()
+
+def _cached(key: tuple) -> dict | None:
+    entry = _summaries.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry["used_at"] > SUMMARY_CACHE_TTL:
+        del _summaries[key]
+        return None
+    entry["used_at"] = time.time()
+    _summaries.move_to_end(key)
+    return entry
+
+def _remember(key: tuple, summary: str, last_interaction_id: int) -> dict:
+    entry = {"summary": summary, "last_interaction_id": last_interaction_id, "used_at": time.time()}
+    _summaries[key] = entry
+    _summaries.move_to_end(key)
+
+    now = time.time()
+    expired = [k for k, e in _summaries.items() if now - e["used_at"] > SUMMARY_CACHE_TTL]
+    for k in expired:
+        del _summaries[k]
+    while len(_summaries) > SUMMARY_CACHE_MAX:
+        _summaries.popitem(last=False)
+    return entry
+
+def _start(key: tuple, coro):
+    task = asyncio.create_task(coro)
+    _tasks[key] = task
+    task.add_done_callback(lambda t: _finished(key, t))
+
+def _finished(key: tuple, task: asyncio.Task):
+    _tasks.pop(key, None)
+    pending = _dirty.pop(key, None)
+    if pending and not task.cancelled():
+        _start(key, _update(key, *pending))
+
+async def _load(key: tuple) -> dict:
+    row = await run_in_db(get_memory_summary, *key)
+    return _remember(key, row["summary"] if row else "", row["last_interaction_id"] if row else 0)
+
+async def _update(key: tuple, model_name: str, endpoints: str):
+    await asyncio.sleep(SUMMARY_DELAY)
+    try:
+        if SUMMARY_ENDPOINT:
+            pool = get_endpoint_pool("summary", SUMMARY_ENDPOINT)
+        else:
+            pool = get_endpoint_pool(f"model:{key[0]}", endpoints)
+    except ValueError as e:
+        _stats["failures"] += 1
+        print(f"[SUMMARY] 요약 생성 불가: {e}")
+        return
+
+    while True:
+        _dirty.pop(key, None)
+        entry = _cached(key) or await _load(key)
+
+        rows = await run_in_db(get_interactions_since, model_name, key[1], entry["last_interaction_id"], SUMMARY_BATCH_TURNS)
+        if len(rows) < SUMMARY_MIN_TURNS:
+            return
+
+        async with _summary_lock:
+            await wait_for_idle()
+            try:
+                async with pool.acquire() as endpoint:
+                    summary = await _fold(endpoint, model_name, entry["summary"], rows, pool.background_slot(endpoint))
+            except Exception as e:
+                _stats["failures"] += 1
+                print(f"[SUMMARY] 요약 생성 실패: {e}")
+                return
+
+        last_id = rows[-1]["id"]
+        _remember(key, summary, last_id)
+        await run_in_db(save_memory_summary, key[0], key[1], summary, last_id)
+
+        _stats["folds"] += 1
+        _stats["turns_folded"] += len(rows)
+        print(f"[SUMMARY] model={key[0]} session={key[1]} 요약 갱신 ({len(rows)}턴 반영, last_id={last_id})")
+
+        if len(rows) < SUMMARY_BATCH_TURNS and key not in _dirty:
+            return
+
+async def _fold(endpoint: str, model_name: str, summary: str, rows: list[dict], slot: int | None = None) -> str:
+    """
+    slot이 주어지면 백그라운드 전용 슬롯에서 실행해 채팅 세션 슬롯의 KV 캐시를 건드리지 않습니다.
+    """
+    turns = "\n".join(
+        f"User: {row['request']}\nAssistant: {row['response']}" for row in rows
+    )
+    payload = {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{turns}"},
+        ],
+        "max_tokens": SUMMARY_MAX_TOKENS,
+        "temperature": 0.3,
+        "stream": False,
+    }
+    if slot is not None:
+        payload["id_slot"] = slot
+
+    client = get_http_client("llm")
+    res = await client.post(f"{endpoint}/v1/chat/completions", json=payload, timeout=SUMMARY_TIMEOUT)
+    res.raise_for_status()
+    return res.json()["choices"][0]["message"]["content"].strip()
@@ -0,0 +1,75 @@
+# backend/llm/memory/tokenizer.py
+
+import os
+import re
+from collections import OrderedDict
+
+# approx: 정규식 기반 근사치 / hf: tokenizers 패키지 + tokenizer.json (LLM_TOKENIZER_PATH)
+LLM_TOKENIZER = os.getenv("LLM_TOKENIZER", "approx")
+LLM_TOKENIZER_PATH = os.getenv("LLM_TOKENIZER_PATH")
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("LLM_TOKEN_COUNT_CACHE_SIZE", 20000))
+
+# 채팅 템플릿이 메시지마다 붙이는 역할 태그/구분자 몫
+MESSAGE_OVERHEAD = 4
+
+# 메시지 dict에 토큰 수를 저장하는 키 (payload 전송 전에 제거)
+TOKEN_KEY = "_tokens"
+
+# BPE 토크나이저는 대략 4글자 단위로 단어를 자르고, 문장부호는 따로 셉니다.
+_APPROX_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+class ApproxTokenizer:
+    name = "approx"
+
+    def count(self, text: str) -> int:
+        return len(_APPROX_RE.findall(text))
+
+class HFTokenizer:
+    name = "hf"
+
+    def __init__(self, path: str):
+        from tokenizers import Tokenizer
+        self._tokenizer = Tokenizer.from_file(path)
+
+    def count(self, text: str) -> int:
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+
+def _create_tokenizer():
+    if LLM_TOKENIZER == "hf" and LLM_TOKENIZER_PATH:
+        try:
+            return HFTokenizer(LLM_TOKENIZER_PATH)
+        except Exception as e:
+            print(f"[TOKENIZER] HF 토크나이저 로딩 실패, 근사치 사용: {e}")
+    return ApproxTokenizer()
+
+tokenizer = _create_tokenizer()
+
+# 클라이언트가 매 턴 전체 메시지 배열을 보내므로, dict에 붙인 값과 별개로 내용 기준 캐시도 둡니다.
+_count_cache: OrderedDict[str, int] = OrderedDict()
+
+def count_text_tokens(text: str) -> int:
+    cached = _count_cache.get(text)
+    if cached is not None:
+        _count_cache.move_to_end(text)
+        return cached
+
+    count = tokenizer.count(text)
+    _count_cache[text] = count
+    if len(_count_cache) > TOKEN_COUNT_CACHE_SIZE:
+        _count_cache.popitem(last=False)
+    return count
+
+def count_message_tokens(message: dict) -> int:
+    """
+    메시지 하나의 토큰 수를 한 번만 세고 message[TOKEN_KEY]에 저장해 둡니다.
+    """
+    cached = message.get(TOKEN_KEY)
+    if cached is not None:
+        return cached
+
+    count = count_text_tokens(message.get("content") or "") + MESSAGE_OVERHEAD
+    message[TOKEN_KEY] = count
+    return count
+
+def strip_private_keys(messages: list[dict]) -> list[dict]:
+    return [{k: v for k, v in m.items() if not k.startswith("_")} for m in messages]
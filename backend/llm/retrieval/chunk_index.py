@@ -0,0 +1,177 @@
+# backend/llm/retrieval/chunk_index.py
+
+import os
+import re
+import math
+import uuid
+import heapq
+import pickle
+import threading
+from collections import Counter
+
+from backend.llm.memory.tokenizer import tokenizer
+
+# 청크 하나의 최대 토큰 수
+CHUNK_TOKENS = int(os.getenv("LLM_SOURCE_CHUNK_TOKENS", 128))
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TERM_RE = re.compile(r"\w+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+def terms(text: str) -> list[str]:
+    """
+    검색용 토큰. 영문/숫자는 단어 단위, 한글/일본어 등은 조사가 붙어도 맞도록 글자 bigram을 함께 사용합니다.
+    """
+    result = []
+    for word in _TERM_RE.findall(text.lower()):
+        result.append(word)
+        if not word.isascii() and len(word) > 2:
+            result.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return result
+
+def _split_long(paragraph: str, max_tokens: int) -> list[str]:
+    words = paragraph.split()
+    step = max(1, max_tokens * 3 // 4)
+    pieces = []
+    for i in range(0, len(words), step):
+        piece = " ".join(words[i:i + step])
+        # 띄어쓰기가 없는 긴 문장은 글자 수로 자릅니다.
+        if tokenizer.count(piece) > max_tokens:
+            width = max_tokens * 2
+            pieces.extend(piece[j:j + width] for j in range(0, len(piece), width))
+        else:
+            pieces.append(piece)
+    return pieces
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """
+    문단 단위로 묶어 max_tokens 이하의 청크로 나눕니다.
+    """
+    chunks, current, size = [], [], 0
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        count = tokenizer.count(paragraph)
+        pieces = [paragraph] if count <= max_tokens else _split_long(paragraph, max_tokens)
+        for piece in pieces:
+            n = count if len(pieces) == 1 else tokenizer.count(piece)
+            if current and size + n > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += n
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+class ChunkIndex:
+    """
+    문서(파일, DB 행, 원격 응답 등)를 청크로 나눠 보관하는 BM25 역색인.
+    문서마다 version(mtime/size, ETag 등)을 저장해 바뀐 문서만 다시 색인합니다.
+    검색과 갱신은 서로 다른 스레드에서 호출될 수 있으므로 lock으로 보호합니다.
+    """
+
+    def __init__(self, key: str, root: str | None = None):
+        self.key = key
+        self.root = root
+        # 색인 인스턴스 식별자 (청크 ID는 인스턴스 안에서만 유일하므로 벡터 색인이 이 값으로 짝을 확인)
+        self.uid = uuid.uuid4().hex
+        # doc_id -> {"version", "chunks": [chunk_id]}
+        self.docs: dict[str, dict] = {}
+        # chunk_id -> (doc_id, text, length)
+        self.chunks: dict[int, tuple[str, str, int]] = {}
+        # term -> {chunk_id: tf}
+        self.postings: dict[str, dict[int, int]] = {}
+        self.total_length = 0
+        self._next_id = 0
+        self.lock = threading.Lock()
+
+    def version(self, doc_id: str):
+        doc = self.docs.get(doc_id)
+        return doc["version"] if doc else None
+
+    def add_document(self, doc_id: str, chunks: list[str], version=None):
+        """
+        chunk_text()로 미리 나눈 청크를 등록합니다. 같은 doc_id가 있으면 교체합니다.
+        """
+        self.remove_document(doc_id)
+        ids = []
+        for text in chunks:
+            counts = Counter(terms(text))
+            length = sum(counts.values())
+            if not length:
+                continue
+            chunk_id = self._next_id
+            self._next_id += 1
+            self.chunks[chunk_id] = (doc_id, text, length)
+            self.total_length += length
+            for term, tf in counts.items():
+                self.postings.setdefault(term, {})[chunk_id] = tf
+            ids.append(chunk_id)
+        self.docs[doc_id] = {"version": version, "chunks": ids}
+
+    def remove_document(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if not doc:
+            return
+        for chunk_id in doc["chunks"]:
+            _, text, length = self.chunks.pop(chunk_id)
+            self.total_length -= length
+            for term in set(terms(text)):
+                posting = self.postings.get(term)
+                if posting is None:
+                    continue
+                posting.pop(chunk_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def search(self, query: str, k: int) -> list[tuple[float, int]]:
+        """
+        BM25 상위 k개 (점수, 청크 ID). 청크가 k개 이하인 작은 소스는 질의와 관계없이 전부 반환합니다.
+        """
+        if len(self.chunks) <= k:
+            return [(math.inf, chunk_id) for chunk_id in self.chunks]
+
+        n = len(self.chunks)
+        avg_length = self.total_length / n
+        scores: dict[int, float] = {}
+        for term in set(terms(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for chunk_id, tf in posting.items():
+                length = self.chunks[chunk_id][2]
+                norm = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * norm
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, chunk_id) for chunk_id, score in top]
+
+    def stats(self) -> dict:
+        return {
+            "root": self.root,
+            "documents": len(self.docs),
+            "chunks": len(self.chunks),
+            "terms": len(self.postings),
+        }
+
+    def save(self, path: str):
+        state = {k: v for k, v in self.__dict__.items() if k != "lock"}
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ChunkIndex":
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        index.__dict__.setdefault("uid", uuid.uuid4().hex)
+        index.lock = threading.Lock()
+        return index
@@ -0,0 +1,107 @@
+# backend/llm/retrieval/embedder.py
+
+import os
+import asyncio
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from backend.utils.http_clients import get_http_client
+from backend.llm.retrieval.chunk_index import terms
+
+# llama: llama.cpp /embedding (LLM_EMBEDDING_ENDPOINT, --embedding 옵션으로 실행한 서버)
+# openvino: openvino_genai.TextEmbeddingPipeline (LLM_EMBEDDING_MODEL_PATH, CPU)
+# hash: 모델 없이 단어 해싱 벡터 (테스트/벤치마크용)
+EMBEDDING_BACKEND = os.getenv("LLM_EMBEDDING_BACKEND", "llama")
+EMBEDDING_ENDPOINT = os.getenv("LLM_EMBEDDING_ENDPOINT", "http://localhost:8081")
+EMBEDDING_MODEL_PATH = os.getenv("LLM_EMBEDDING_MODEL_PATH")
+EMBEDDING_DEVICE = os.getenv("LLM_EMBEDDING_DEVICE", "CPU")
+EMBEDDING_BATCH = int(os.getenv("LLM_EMBEDDING_BATCH", 32))
+HASH_DIM = int(os.getenv("LLM_EMBEDDING_HASH_DIM", 256))
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+class LlamaEmbeddingBackend:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint.rstrip("/")
+        self.name = f"llama:{self.endpoint}"
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        client = get_http_client("embedding")
+        res = await client.post(f"{self.endpoint}/embedding", json={"content": texts})
+        res.raise_for_status()
+        data = res.json()
+        items = data if isinstance(data, list) else [data]
+        items = sorted(items, key=lambda item: item.get("index", 0))
+
+        vectors = []
+        for item in items:
+            embedding = item["embedding"]
+            # pooling이 켜진 서버는 [[...]] 형태로 한 벡터를 돌려줍니다.
+            if embedding and isinstance(embedding[0], list):
+                embedding = embedding[0]
+            vectors.append(embedding)
+        return _normalize(vectors)
+
+class OpenVINOEmbeddingBackend:
+    def __init__(self, path: str, device: str):
+        import openvino_genai
+        self.pipeline = openvino_genai.TextEmbeddingPipeline(path, device)
+        self.name = f"openvino:{os.path.basename(path.rstrip('/'))}"
+        # 파이프라인 호출은 이벤트 루프 밖에서, 한 번에 하나씩 실행합니다.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(self._executor, partial(self.pipeline.embed_documents, texts))
+        return _normalize(vectors)
+
+class HashEmbeddingBackend:
+    name = f"hash:{HASH_DIM}"
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(HASH_DIM, dtype=np.float32)
+        for term in terms(text):
+            h = zlib.crc32(term.encode())
+            vector[h % HASH_DIM] += 1.0 if h & 0x80000000 else -1.0
+        return vector
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        return _normalize([self._vector(text) for text in texts])
+
+def _create_backend():
+    if EMBEDDING_BACKEND == "openvino" and EMBEDDING_MODEL_PATH:
+        try:
+            return OpenVINOEmbeddingBackend(EMBEDDING_MODEL_PATH, EMBEDDING_DEVICE)
+        except Exception as e:
+            print(f"[EMBEDDING] OpenVINO 임베딩 모델 로딩 실패, llama.cpp 사용: {e}")
+    if EMBEDDING_BACKEND == "hash":
+        return HashEmbeddingBackend()
+    return LlamaEmbeddingBackend(EMBEDDING_ENDPOINT)
+
+_backend = None
+
+def get_embedder():
+    """
+    임베딩 백엔드는 처음 사용할 때 만듭니다. (bm25 모드에서는 모델을 불러오지 않음)
+    """
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+async def embed_texts(texts: list[str]) -> np.ndarray:
+    """
+    EMBEDDING_BATCH 단위로 나눠 임베딩하고 L2 정규화된 (n, dim) float32 행렬을 반환합니다.
+    """
+    embedder = get_embedder()
+    batches = [
+        await embedder.embed(texts[i:i + EMBEDDING_BATCH])
+        for i in range(0, len(texts), EMBEDDING_BATCH)
+    ]
+    return np.vstack(batches) if batches else np.zeros((0, 0), dtype=np.float32)
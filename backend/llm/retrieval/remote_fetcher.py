@@ -0,0 +1,264 @@
+# backend/llm/retrieval/remote_fetcher.py
+
+import os
+import re
+import json
+import html
+import time
+import asyncio
+import hashlib
+
+from backend.db.async_base import run_in_db
+from backend.utils.http_clients import get_http_client
+from backend.utils.source_loader import get_remote_sources
+from backend.llm.retrieval.chunk_index import ChunkIndex, chunk_text
+from backend.llm.retrieval.source_index import INDEX_DIR, run_in_index, install_index, get_loaded_index
+
+# 활성화된 원격 소스를 다시 가져오는 주기 (ETag/Last-Modified 조건부 요청)
+REMOTE_FETCH_INTERVAL = float(os.getenv("LLM_REMOTE_FETCH_INTERVAL", 300))
+REMOTE_CACHE_DIR = os.getenv("LLM_REMOTE_CACHE_DIR", os.path.join(INDEX_DIR, "remote"))
+REMOTE_MAX_BYTES = int(os.getenv("LLM_REMOTE_MAX_BYTES", 5 * 1024 * 1024))
+REMOTE_TIMEOUT = float(os.getenv("LLM_REMOTE_TIMEOUT", 15))
+REMOTE_CONCURRENCY = int(os.getenv("LLM_REMOTE_CONCURRENCY", 4))
+# remote_sources.auth가 켜진 소스에 보낼 토큰 (Authorization: Bearer)
+REMOTE_AUTH_TOKEN = os.getenv("LLM_REMOTE_AUTH_TOKEN")
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.S | re.I)
+
+# source_id -> {"endpoint", "etag", "last_modified", "content_type", "sha1", "fetched_at"}
+_meta: dict[int, dict] = {}
+_inflight: dict[int, asyncio.Task] = {}
+_loop: asyncio.Task | None = None
+_semaphore: asyncio.Semaphore | None = None
+_stats = {
+    "fetches": 0, "updated": 0, "not_modified": 0, "unchanged": 0, "errors": 0, "bytes": 0,
+    "loaded_from_disk": 0, "oversized": 0,
+}
+
+def _cache_paths(source_id: int) -> tuple[str, str]:
+    base = os.path.join(REMOTE_CACHE_DIR, f"remote_{source_id}")
+    return f"{base}.body", f"{base}.json"
+
+def _read_cache(source_id: int) -> tuple[dict, bytes] | None:
+    body_path, meta_path = _cache_paths(source_id)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return meta, f.read()
+    except (OSError, ValueError):
+        return None
+
+def _write_file(path: str, data: bytes):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _write_cache(source_id: int, meta: dict, body: bytes | None = None):
+    os.makedirs(REMOTE_CACHE_DIR, exist_ok=True)
+    body_path, meta_path = _cache_paths(source_id)
+    if body is not None:
+        _write_file(body_path, body)
+    _write_file(meta_path, json.dumps(meta).encode("utf-8"))
+
+class RemoteTooLarge(ValueError):
+    pass
+
+async def _read_capped(res) -> bytes:
+    """
+    응답 본문을 REMOTE_MAX_BYTES까지만 읽습니다. Content-Length가 한도를 넘으면 본문을 받지 않고,
+    길이를 알리지 않은 응답도 한도를 넘는 순간 읽기를 멈춥니다.
+    """
+    length = res.headers.get("content-length")
+    if length and length.isdigit() and int(length) > REMOTE_MAX_BYTES:
+        raise RemoteTooLarge(f"본문이 너무 큽니다 (Content-Length {length} > {REMOTE_MAX_BYTES})")
+    body = bytearray()
+    async for chunk in res.aiter_bytes():
+        body += chunk
+        if len(body) > REMOTE_MAX_BYTES:
+            raise RemoteTooLarge(f"본문이 너무 큽니다 ({REMOTE_MAX_BYTES} bytes 초과)")
+    return bytes(body)
+
+def _json_text(item) -> str:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        return "\n".join(
+            f"{key}: {value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)}"
+            for key, value in item.items()
+        )
+    return json.dumps(item, ensure_ascii=False)
+
+def remote_documents(body: bytes, content_type: str) -> dict[str, list[str]]:
+    """
+    응답 본문을 문서별 청크로 바꿉니다. JSON 배열은 항목마다 한 문서, 나머지는 본문 전체가 한 문서입니다.
+    """
+    text = body.decode("utf-8", errors="replace")
+    if "json" in content_type or text.lstrip()[:1] in ("[", "{"):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, list):
+            return {f"item {i + 1}": chunk_text(_json_text(item)) for i, item in enumerate(data)}
+        if data is not None:
+            return {"document": chunk_text(_json_text(data))}
+    if "html" in content_type:
+        text = html.unescape(_TAG_RE.sub(" ", text))
+    return {"document": chunk_text(text)}
+
+def _update_index(source: dict, body: bytes, content_type: str) -> ChunkIndex:
+    key = f"remote:{source['id']}"
+    index = get_loaded_index(key)
+    if index is None or index.root != source["endpoint"]:
+        index = ChunkIndex(key, source["endpoint"])
+
+    documents = remote_documents(body, content_type)
+    versions = {
+        doc_id: hashlib.sha1("\0".join(chunks).encode("utf-8")).hexdigest()
+        for doc_id, chunks in documents.items()
+    }
+    removed = [doc_id for doc_id in index.docs if doc_id not in documents]
+    with index.lock:
+        for doc_id in removed:
+            index.remove_document(doc_id)
+        for doc_id, chunks in documents.items():
+            if index.version(doc_id) != versions[doc_id]:
+                index.add_document(doc_id, chunks, versions[doc_id])
+    return index
+
+async def fetch_remote_source(source: dict) -> bool:
+    """
+    원격 소스를 조건부 요청으로 가져와 디스크 캐시와 청크 색인에 반영합니다. 내용이 바뀌었으면 True.
+    처음에는 디스크 캐시로 색인을 먼저 만들어, 재시작 직후에도 네트워크 없이 검색되게 합니다.
+    """
+    source_id, endpoint = source["id"], source["endpoint"]
+    key = f"remote:{source_id}"
+
+    meta = _meta.get(source_id)
+    if meta is None:
+        cached = await run_in_index(_read_cache, source_id)
+        meta = cached[0] if cached else {}
+        if cached and meta.get("endpoint") == endpoint and get_loaded_index(key) is None:
+            install_index(await run_in_index(_update_index, source, cached[1], meta.get("content_type", "")))
+            _stats["loaded_from_disk"] += 1
+        _meta[source_id] = meta
+
+    headers = {}
+    if meta.get("endpoint") == endpoint and get_loaded_index(key) is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    if source.get("auth") and REMOTE_AUTH_TOKEN:
+        headers["Authorization"] = f"Bearer {REMOTE_AUTH_TOKEN}"
+
+    _stats["fetches"] += 1
+    async with get_http_client("tools").stream("GET", endpoint, headers=headers, timeout=REMOTE_TIMEOUT) as res:
+        if res.status_code == 304:
+            _stats["not_modified"] += 1
+            meta["fetched_at"] = time.time()
+            await run_in_index(_write_cache, source_id, meta)
+            return False
+        res.raise_for_status()
+        try:
+            body = await _read_capped(res)
+        except RemoteTooLarge:
+            _stats["oversized"] += 1
+            raise
+
+    digest = hashlib.sha1(body).hexdigest()
+    unchanged = meta.get("endpoint") == endpoint and meta.get("sha1") == digest and get_loaded_index(key) is not None
+    meta = {
+        "endpoint": endpoint,
+        "etag": res.headers.get("etag"),
+        "last_modified": res.headers.get("last-modified"),
+        "content_type": res.headers.get("content-type", ""),
+        "sha1": digest,
+        "fetched_at": time.time(),
+    }
+    _meta[source_id] = meta
+
+    # 검증 헤더를 주지 않는 서버: 본문이 같으면 다시 색인하지 않습니다.
+    if unchanged:
+        _stats["unchanged"] += 1
+        await run_in_index(_write_cache, source_id, meta)
+        return False
+
+    await run_in_index(_write_cache, source_id, meta, body)
+    index = await run_in_index(_update_index, source, body, meta["content_type"])
+    install_index(index)
+    _stats["updated"] += 1
+    _stats["bytes"] += len(body)
+    print(f"[REMOTE] {endpoint} 갱신 ({len(body)} bytes, 문서 {len(index.docs)}, 청크 {len(index.chunks)})")
+    return True
+
+async def _fetch_guarded(source: dict):
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(REMOTE_CONCURRENCY)
+    async with _semaphore:
+        try:
+            await fetch_remote_source(source)
+        except Exception as e:
+            _stats["errors"] += 1
+            print(f"[REMOTE] {source['endpoint']} 가져오기 실패: {e}")
+
+def request_fetch(source: dict):
+    """
+    백그라운드 가져오기를 예약합니다. 같은 소스가 이미 진행 중이면 무시합니다.
+    """
+    source_id = source["id"]
+    if source_id in _inflight or not source.get("enabled", True):
+        return
+    task = asyncio.create_task(_fetch_guarded(source))
+    _inflight[source_id] = task
+    task.add_done_callback(lambda _: _inflight.pop(source_id, None))
+
+def ensure_remote_sources(sources: list[dict]):
+    """
+    채팅 턴에서 호출합니다. 색인이 아직 없는 소스만 백그라운드로 가져오고 기다리지 않습니다.
+    """
+    start_remote_fetcher()
+    for source in sources:
+        if get_loaded_index(f"remote:{source['id']}") is None:
+            request_fetch(source)
+
+async def _fetch_loop():
+    while True:
+        try:
+            for source in await run_in_db(get_remote_sources):
+                request_fetch(source)
+            await asyncio.gather(*list(_inflight.values()), return_exceptions=True)
+        except Exception as e:
+            print(f"[REMOTE] 원격 소스 목록 조회 실패: {e}")
+        await asyncio.sleep(REMOTE_FETCH_INTERVAL)
+
+def start_remote_fetcher():
+    global _loop
+    if _loop is None or _loop.done():
+        _loop = asyncio.get_running_loop().create_task(_fetch_loop())
+
+async def close_remote_fetcher():
+    global _loop
+    tasks = list(_inflight.values()) + ([_loop] if _loop else [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _loop = None
+
+def get_remote_fetcher_stats() -> dict:
+    return {
+        **_stats,
+        "interval_s": REMOTE_FETCH_INTERVAL,
+        "sources": {
+            source_id: {
+                "endpoint": meta.get("endpoint"),
+                "etag": meta.get("etag"),
+                "last_modified": meta.get("last_modified"),
+                "age_s": round(time.time() - meta["fetched_at"], 1) if meta.get("fetched_at") else None,
+            }
+            for source_id, meta in _meta.items()
+        },
+    }
@@ -0,0 +1,434 @@
+# backend/llm/retrieval/source_index.py
+
+import os
+import time
+import asyncio
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import psutil
+
+from backend.llm.memory.tokenizer import count_text_tokens
+from backend.llm.retrieval.chunk_index import ChunkIndex, chunk_text
+from backend.llm.retrieval.vector_index import VectorIndex
+from backend.llm.retrieval.embedder import get_embedder, embed_texts
+from backend.utils.source_loader import fetch_character_rows, render_character, get_local_sources
+from backend.db.source_pool import get_source_pool_stats
+from backend.db.async_base import run_in_db
+
+# 색인 파일 저장 위치 (소스별 pickle)
+INDEX_DIR = os.getenv("LLM_INDEX_DIR", "./.source_index")
+# 이 시간이 지나면 다음 턴에서 백그라운드로 폴더 변경 사항(mtime/size)을 반영합니다.
+SYNC_INTERVAL = float(os.getenv("LLM_INDEX_SYNC_INTERVAL", 30))
+SOURCE_SUFFIXES = {".txt", ".md", ".csv", ".json"}
+MAX_FILE_BYTES = int(os.getenv("LLM_SOURCE_MAX_FILE_BYTES", 2 * 1024 * 1024))
+# database 소스 조회 결과 유지 시간 (지나면 다음 턴에서 백그라운드로 다시 조회) / 최대 행 수
+DB_SOURCE_TTL = float(os.getenv("LLM_DB_SOURCE_TTL", 60))
+DB_SOURCE_MAX_ROWS = int(os.getenv("LLM_DB_SOURCE_MAX_ROWS", 500))
+# 색인 준비(DB 접속 등)에 실패한 소스는 이 시간 뒤에 다시 시도하고, 연속 실패마다 두 배로 늘립니다.
+INDEX_RETRY_SECONDS = float(os.getenv("LLM_INDEX_RETRY_SECONDS", 15))
+INDEX_RETRY_MAX_SECONDS = float(os.getenv("LLM_INDEX_RETRY_MAX_SECONDS", 600))
+# 턴마다 컨텍스트에 넣을 청크 수 / 토큰 예산
+SOURCE_TOP_K = int(os.getenv("LLM_SOURCE_TOP_K", 4))
+SOURCE_TOKENS = int(os.getenv("LLM_SOURCE_TOKENS", 512))
+# bm25: 어휘 검색만 / dense: 임베딩 코사인 검색 / hybrid: 두 순위를 RRF로 결합
+RETRIEVAL_MODE = os.getenv("LLM_RETRIEVAL_MODE", "bm25")
+RRF_K = 60
+# 백그라운드 임베딩 시 한 번에 처리해 저장하는 청크 수
+EMBED_GROUP = int(os.getenv("LLM_EMBEDDING_GROUP", 256))
+
+# 파일 읽기/청크 분할/검색은 이벤트 루프 밖에서 실행합니다.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="index")
+
+_indexes: dict[str, ChunkIndex] = {}
+_vectors: dict[str, VectorIndex] = {}
+_synced_at: dict[str, float] = {}
+_tasks: dict[str, asyncio.Task] = {}
+# 색인 준비 실패 기록: key -> (연속 실패 수, 다시 시도할 시각, root). 접속 정보(root)가 바뀌면 바로 다시 시도합니다.
+_open_failures: dict[str, tuple[int, float, str]] = {}
+_stats = {
+    "opened": 0, "syncs": 0, "files_indexed": 0, "files_removed": 0,
+    "db_fetches": 0, "rows_rendered": 0, "queries": 0, "failures": 0, "cold_skips": 0, "backoff_skips": 0,
+}
+_embed_stats = {"chunks_embedded": 0, "seconds": 0.0, "failures": 0}
+_query_latencies: deque[float] = deque(maxlen=500)
+_embed_latencies: deque[float] = deque(maxlen=500)
+
+def _index_path(key: str) -> str:
+    return os.path.join(INDEX_DIR, key.replace(":", "_") + ".pkl")
+
+def _scan_folder(index: ChunkIndex, folder: Path) -> tuple[dict, list]:
+    changed, seen = {}, set()
+    for file in folder.glob("*"):
+        if file.suffix not in SOURCE_SUFFIXES or not file.is_file():
+            continue
+        stat = file.stat()
+        if stat.st_size > MAX_FILE_BYTES:
+            continue
+        seen.add(file.name)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if index.version(file.name) == version:
+            continue
+        try:
+            changed[file.name] = (version, chunk_text(file.read_text(encoding="utf-8")))
+        except Exception as e:
+            print(f"[파일 로딩 실패] {file}: {e}")
+    removed = [doc_id for doc_id in index.docs if doc_id not in seen]
+    return changed, removed
+
+def sync_folder_index(index: ChunkIndex, folder: str) -> bool:
+    """
+    폴더를 다시 훑어 mtime/size가 바뀐 파일만 다시 색인하고, 사라진 파일은 제거합니다.
+    파일 읽기는 lock 밖에서 하므로 동기화 중에도 검색이 막히지 않습니다.
+    """
+    path = Path(folder)
+    if not path.is_dir():
+        print(f"[INDEX] 폴더 없음: {folder}")
+        return False
+
+    changed, removed = _scan_folder(index, path)
+    _stats["syncs"] += 1
+    if not changed and not removed:
+        return False
+
+    with index.lock:
+        for doc_id in removed:
+            index.remove_document(doc_id)
+        for doc_id, (version, chunks) in changed.items():
+            index.add_document(doc_id, chunks, version)
+
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    with index.lock:
+        index.save(_index_path(index.key))
+
+    _stats["files_indexed"] += len(changed)
+    _stats["files_removed"] += len(removed)
+    print(f"[INDEX] {index.key} 갱신 (변경 {len(changed)}, 삭제 {len(removed)}, 청크 {len(index.chunks)})")
+    return True
+
+def _open_folder_index(key: str, folder: str) -> ChunkIndex:
+    index = None
+    path = _index_path(key)
+    if os.path.exists(path):
+        try:
+            index = ChunkIndex.load(path)
+        except Exception as e:
+            print(f"[INDEX] {key} 색인 파일 로딩 실패, 새로 만듭니다: {e}")
+    if index is None or index.root != folder:
+        index = ChunkIndex(key, folder)
+
+    sync_folder_index(index, folder)
+    _stats["opened"] += 1
+    return index
+
+def sync_database_index(index: ChunkIndex, source: dict) -> bool:
+    """
+    캐릭터 행을 다시 조회해 값이 바뀐 행만 캐릭터 설명 문장으로 렌더링/색인합니다.
+    행마다 값의 해시를 version으로 저장하므로 데이터가 같으면 다시 렌더링하지 않습니다.
+    """
+    rows = fetch_character_rows(source, DB_SOURCE_MAX_ROWS)
+    _stats["db_fetches"] += 1
+
+    versions = {}
+    for row in rows:
+        doc_id, n = str(row["name"]), 2
+        while doc_id in versions:
+            doc_id, n = f"{row['name']} ({n})", n + 1
+        versions[doc_id] = (hashlib.sha1(repr(tuple(row.values())).encode()).hexdigest(), row)
+
+    changed = {
+        doc_id: (version, render_character(row))
+        for doc_id, (version, row) in versions.items()
+        if index.version(doc_id) != version
+    }
+    removed = [doc_id for doc_id in index.docs if doc_id not in versions]
+    if not changed and not removed:
+        return False
+
+    with index.lock:
+        for doc_id in removed:
+            index.remove_document(doc_id)
+        for doc_id, (version, text) in changed.items():
+            index.add_document(doc_id, [text] if text else [], version)
+
+    _stats["rows_rendered"] += len(changed)
+    print(f"[INDEX] {index.key} 갱신 (변경 {len(changed)}, 삭제 {len(removed)}, 항목 {len(index.docs)})")
+    return True
+
+def _open_database_index(key: str, source: dict) -> ChunkIndex:
+    index = ChunkIndex(key, _database_root(source))
+    sync_database_index(index, source)
+    _stats["opened"] += 1
+    return index
+
+def _database_root(source: dict) -> str:
+    return f"{source['host']}:{source['port']}/{source['path']}"
+
+async def run_in_index(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args))
+
+def _start(key: str, coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _tasks[key] = task
+    task.add_done_callback(lambda _: _tasks.pop(key, None))
+    return task
+
+async def _open(key: str, root: str, opener, *args):
+    try:
+        index = await run_in_index(opener, key, *args)
+    except Exception as e:
+        _stats["failures"] += 1
+        previous = _open_failures.get(key)
+        count = previous[0] + 1 if previous and previous[2] == root else 1
+        delay = min(INDEX_RETRY_SECONDS * 2 ** (count - 1), INDEX_RETRY_MAX_SECONDS)
+        _open_failures[key] = (count, time.monotonic() + delay, root)
+        print(f"[INDEX] {key} 색인 준비 실패 ({count}회, {delay:.0f}s 뒤 재시도): {e}")
+        return
+    _open_failures.pop(key, None)
+    _indexes[key] = index
+    _synced_at[key] = time.monotonic()
+    _schedule_embedding(index)
+
+async def _refresh(index: ChunkIndex, syncer, *args):
+    try:
+        await run_in_index(syncer, index, *args)
+    except Exception as e:
+        _stats["failures"] += 1
+        print(f"[INDEX] {index.key} 동기화 실패, 기존 색인 유지: {e}")
+    # 변경이 없어도 이전에 실패한 임베딩이 남아 있으면 이어서 진행합니다.
+    _schedule_embedding(index)
+
+def _get_index(key: str, root: str, interval: float, opener, syncer, *args) -> ChunkIndex | None:
+    """
+    준비된 색인을 바로 돌려줍니다. 턴에서 색인 생성을 기다리지 않습니다.
+    - 아직 없으면(또는 경로가 바뀌었으면) 백그라운드로 만들기 시작하고 None (이번 턴은 이 소스 없이 진행)
+    - 최근에 준비가 실패했으면 백오프가 끝날 때까지 다시 시도하지 않음 (접속 불가 DB 등)
+    - 있으면 interval마다 백그라운드에서 동기화
+    """
+    index = _indexes.get(key)
+
+    if index is None or index.root != root:
+        failure = _open_failures.get(key)
+        if failure and failure[2] == root and time.monotonic() < failure[1]:
+            _stats["backoff_skips"] += 1
+        elif key not in _tasks:
+            _start(key, _open(key, root, opener, *args))
+        return None
+    if time.monotonic() - _synced_at[key] > interval and key not in _tasks:
+        _synced_at[key] = time.monotonic()
+        _start(key, _refresh(index, syncer, *args))
+    return index
+
+def get_folder_index(source_id: int, folder: str) -> ChunkIndex | None:
+    return _get_index(
+        f"local:{source_id}", folder, SYNC_INTERVAL,
+        _open_folder_index, sync_folder_index, folder
+    )
+
+def get_database_index(source: dict) -> ChunkIndex | None:
+    return _get_index(
+        f"db:{source['id']}", _database_root(source), DB_SOURCE_TTL,
+        _open_database_index, sync_database_index, source
+    )
+
+def _get_source_index(source: dict) -> ChunkIndex | None:
+    if source["type"] == "folder":
+        return get_folder_index(source["id"], source["path"])
+    return get_database_index(source)
+
+async def _warm_source_indexes():
+    try:
+        sources = await run_in_db(get_local_sources)
+    except Exception as e:
+        print(f"[INDEX] 로컬 소스 목록 조회 실패: {e}")
+        return
+    for source in sources:
+        if source["type"] in ("folder", "database"):
+            _get_source_index(source)
+
+def start_source_indexing():
+    """
+    서버 시작 시 로컬 소스 색인을 백그라운드로 미리 만들거나 불러옵니다.
+    """
+    if "warm" not in _tasks:
+        _start("warm", _warm_source_indexes())
+
+async def close_source_indexing():
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def install_index(index: ChunkIndex):
+    """
+    다른 곳(원격 소스 수집기 등)에서 만든 색인을 검색 대상으로 등록합니다.
+    """
+    _indexes[index.key] = index
+    _schedule_embedding(index)
+
+def get_loaded_index(key: str) -> ChunkIndex | None:
+    return _indexes.get(key)
+
+def _schedule_embedding(index: ChunkIndex):
+    if RETRIEVAL_MODE == "bm25":
+        return
+    task_key = f"embed:{index.key}"
+    if task_key not in _tasks:
+        _start(task_key, _embed_pending(index))
+
+def _open_vector_index(index: ChunkIndex) -> VectorIndex:
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    prefix = os.path.join(INDEX_DIR, index.key.replace(":", "_") + ".vec")
+    return VectorIndex.open(index.key, prefix, get_embedder().name, index.uid)
+
+async def _embed_pending(index: ChunkIndex):
+    """
+    청크 색인과 벡터 색인을 맞춥니다. 새 청크는 EMBED_GROUP 단위로 임베딩해 추가하고,
+    사라진 청크는 벡터에서도 지웁니다. 끝나기 전까지는 임베딩된 청크만 검색됩니다.
+    """
+    vectors = _vectors.get(index.key)
+    # 청크 색인을 새로 만들었으면(경로 변경 등) 청크 ID가 달라지므로 벡터도 새로 만듭니다.
+    if vectors is None or vectors.source_uid != index.uid:
+        vectors = await run_in_index(_open_vector_index, index)
+        _vectors[index.key] = vectors
+
+    with index.lock:
+        current = {chunk_id: text for chunk_id, (_, text, _) in index.chunks.items()}
+    with vectors.lock:
+        stale = [chunk_id for chunk_id in vectors.chunk_rows if chunk_id not in current]
+    pending = [chunk_id for chunk_id in current if chunk_id not in vectors.chunk_rows]
+    vectors.remove(stale)
+
+    try:
+        for i in range(0, len(pending), EMBED_GROUP):
+            ids = pending[i:i + EMBED_GROUP]
+            start = time.perf_counter()
+            matrix = await embed_texts([current[chunk_id] for chunk_id in ids])
+            _embed_stats["seconds"] += time.perf_counter() - start
+            _embed_stats["chunks_embedded"] += len(ids)
+            await run_in_index(vectors.add, ids, matrix)
+    except Exception as e:
+        _embed_stats["failures"] += 1
+        print(f"[VECTOR] {index.key} 임베딩 실패 (다음 동기화 때 이어서 진행): {e}")
+    finally:
+        await run_in_index(vectors.save)
+
+    if pending or stale:
+        print(f"[VECTOR] {index.key} 벡터 갱신 (추가 {len(pending)}, 삭제 {len(stale)}, 전체 {len(vectors.chunk_rows)})")
+
+def _rank(index: ChunkIndex, query: str, k: int, query_vec: np.ndarray | None) -> list[tuple[float, int]]:
+    if query_vec is None or len(index.chunks) <= k:
+        return index.search(query, k)
+
+    vectors = _vectors.get(index.key)
+    dense = vectors.search(query_vec, k * 2) if vectors else []
+    dense = [(score, chunk_id) for score, chunk_id in dense if chunk_id in index.chunks]
+    if RETRIEVAL_MODE == "dense" and dense:
+        return dense[:k]
+
+    # hybrid (또는 아직 임베딩이 없는 dense): BM25/코사인 순위를 Reciprocal Rank Fusion으로 결합
+    fused: dict[int, float] = {}
+    for ranking in (index.search(query, k * 2), dense):
+        for rank, (_, chunk_id) in enumerate(ranking):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1 / (RRF_K + rank + 1)
+    return sorted(((score, chunk_id) for chunk_id, score in fused.items()), reverse=True)[:k]
+
+def _search(indexes: list[ChunkIndex], query: str, k: int, budget: int, query_vec: np.ndarray | None) -> list[str]:
+    """
+    색인마다 점수 척도가 다르므로(BM25의 IDF, 작은 색인의 inf 등) 색인 안의 순위로 정규화해 합칩니다.
+    각 색인의 1위가 모두 나온 뒤에 2위가 나오는 식이라, 한 소스가 k개를 모두 차지하지 않습니다.
+    """
+    hits = []
+    for index in indexes:
+        with index.lock:
+            hits.extend(
+                (1 / (rank + 1), *index.chunks[chunk_id][:2])
+                for rank, (_, chunk_id) in enumerate(_rank(index, query, k, query_vec))
+            )
+    hits.sort(key=lambda hit: hit[0], reverse=True)
+
+    texts = []
+    for _, doc_id, chunk in hits[:k]:
+        text = f"[{doc_id}]\n{chunk}"
+        tokens = count_text_tokens(text)
+        if tokens > budget:
+            continue
+        texts.append(text)
+        budget -= tokens
+    return texts
+
+async def _embed_query(query: str) -> np.ndarray | None:
+    if RETRIEVAL_MODE == "bm25":
+        return None
+    start = time.perf_counter()
+    try:
+        query_vec = (await embed_texts([query]))[0]
+    except Exception as e:
+        print(f"[VECTOR] 질의 임베딩 실패, BM25만 사용: {e}")
+        return None
+    _embed_latencies.append(time.perf_counter() - start)
+    return query_vec
+
+async def retrieve_source_chunks(
+    sources: list[dict],
+    query: str,
+    k: int = SOURCE_TOP_K,
+    budget: int = SOURCE_TOKENS
+) -> list[str]:
+    """
+    소스 행(폴더/database/remote)에서 질의와 관련된 청크를 k개, budget 토큰 이내로 찾습니다.
+    """
+    # 로컬 소스는 준비된 색인만, 원격 소스는 수집기가 만들어 둔 색인만 사용합니다. (턴에서 색인 생성을 기다리지 않음)
+    indexes = []
+    for s in sources:
+        if s["type"] in ("folder", "database"):
+            index = _get_source_index(s)
+        elif s["type"] == "remote":
+            index = _indexes.get(f"remote:{s['id']}")
+        else:
+            continue
+        if index is None:
+            _stats["cold_skips"] += 1
+        else:
+            indexes.append(index)
+    if not indexes:
+        return []
+
+    query_vec = await _embed_query(query)
+
+    start = time.perf_counter()
+    texts = await run_in_index(_search, indexes, query, k, budget, query_vec)
+    _query_latencies.append(time.perf_counter() - start)
+    _stats["queries"] += 1
+    return texts
+
+def _percentiles(latencies: deque[float]) -> dict:
+    ordered = sorted(latencies)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2) if ordered else None
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+def get_source_index_stats() -> dict:
+    seconds = _embed_stats["seconds"]
+    return {
+        **_stats,
+        "mode": RETRIEVAL_MODE,
+        "query_ms": _percentiles(_query_latencies),
+        "embed_query_ms": _percentiles(_embed_latencies),
+        "embedding": {
+            **_embed_stats,
+            "chunks_per_s": round(_embed_stats["chunks_embedded"] / seconds, 1) if seconds else None,
+        },
+        "rss_mb": round(psutil.Process().memory_info().rss / 1e6, 1),
+        "indexes": {key: index.stats() for key, index in _indexes.items()},
+        "vectors": {key: vectors.stats() for key, vectors in _vectors.items()},
+        "db_pools": get_source_pool_stats(),
+        "open_backoff": {
+            key: {"failures": count, "retry_in_s": round(max(0.0, retry_at - time.monotonic()), 1)}
+            for key, (count, retry_at, _) in _open_failures.items()
+        },
+    }
@@ -0,0 +1,145 @@
+# backend/llm/retrieval/vector_index.py
+
+import os
+import glob
+import pickle
+import threading
+
+import numpy as np
+
+class VectorIndex:
+    """
+    ChunkIndex 청크 ID별 임베딩(L2 정규화)을 메모리 매핑된 float32 행렬(.npy)에 보관합니다.
+    삭제된 행은 비워 두었다가 다음 추가 때 재사용하고, 부족하면 두 배 크기의 새 파일로 옮깁니다.
+    """
+
+    def __init__(self, key: str, prefix: str, model: str, source_uid: str):
+        self.key = key
+        self.prefix = prefix
+        self.model = model
+        self.source_uid = source_uid
+        self.dim = None
+        self.generation = 0
+        self.size = 0
+        self.matrix = None
+        # 행 -> 청크 ID (-1은 빈 행)
+        self.row_chunks = np.full(0, -1, dtype=np.int64)
+        self.chunk_rows: dict[int, int] = {}
+        self.free: list[int] = []
+        self.lock = threading.Lock()
+
+    @property
+    def matrix_path(self) -> str:
+        return f"{self.prefix}.{self.generation}.npy"
+
+    @classmethod
+    def open(cls, key: str, prefix: str, model: str, source_uid: str) -> "VectorIndex":
+        """
+        저장된 색인이 같은 임베딩 모델, 같은 청크 색인(source_uid)으로 만들어졌으면 이어서 쓰고, 아니면 새로 만듭니다.
+        """
+        index = cls(key, prefix, model, source_uid)
+        meta_path = f"{prefix}.meta.pkl"
+        if os.path.exists(meta_path):
+            try:
+                with open(meta_path, "rb") as f:
+                    state = pickle.load(f)
+                if state["model"] == model and state.get("source_uid") == source_uid:
+                    index.__dict__.update(state)
+                    index.matrix = np.load(index.matrix_path, mmap_mode="r+")
+                    return index
+                # 새 행렬은 다음 세대 파일에 만들어, 아직 매핑 중일 수 있는 이전 파일과 겹치지 않게 합니다.
+                index.generation = state.get("generation", 0)
+                print(f"[VECTOR] {key} 임베딩 모델 또는 청크 색인 변경, 새로 만듭니다.")
+            except Exception as e:
+                print(f"[VECTOR] {key} 색인 파일 로딩 실패, 새로 만듭니다: {e}")
+                index = cls(key, prefix, model, source_uid)
+        return index
+
+    def _grow(self, needed: int):
+        capacity = len(self.row_chunks)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+
+        old = self.matrix
+        self.generation += 1
+        matrix = np.lib.format.open_memmap(self.matrix_path, mode="w+", dtype=np.float32, shape=(capacity, self.dim))
+        if old is not None:
+            matrix[:len(old)] = old
+        self.matrix = matrix
+        self.row_chunks = np.concatenate([
+            self.row_chunks, np.full(capacity - len(self.row_chunks), -1, dtype=np.int64)
+        ])
+        # 이전 세대 파일은 매핑을 놓은 뒤 삭제합니다. (Windows는 매핑 중인 파일을 지울 수 없음)
+        del old
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        for path in glob.glob(f"{glob.escape(self.prefix)}.*.npy"):
+            if path != self.matrix_path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def add(self, chunk_ids: list[int], vectors: np.ndarray):
+        with self.lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            self.remove(chunk_ids, locked=True)
+
+            reused = min(len(self.free), len(chunk_ids))
+            rows = [self.free.pop() for _ in range(reused)]
+            rows.extend(range(self.size, self.size + len(chunk_ids) - reused))
+            self._grow(self.size + len(chunk_ids) - reused)
+            self.size += len(chunk_ids) - reused
+
+            self.matrix[rows] = vectors
+            self.row_chunks[rows] = chunk_ids
+            self.chunk_rows.update(zip(chunk_ids, rows))
+
+    def remove(self, chunk_ids, locked: bool = False):
+        if not locked:
+            with self.lock:
+                return self.remove(chunk_ids, locked=True)
+        for chunk_id in chunk_ids:
+            row = self.chunk_rows.pop(chunk_id, None)
+            if row is not None:
+                self.row_chunks[row] = -1
+                self.free.append(row)
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[float, int]]:
+        """
+        코사인 유사도 상위 k개 (점수, 청크 ID). 벡터는 정규화되어 있으므로 내적으로 계산합니다.
+        """
+        with self.lock:
+            if not self.chunk_rows:
+                return []
+            scores = self.matrix[:self.size] @ query
+            scores[self.row_chunks[:self.size] < 0] = -np.inf
+            k = min(k, len(self.chunk_rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[row]), int(self.row_chunks[row])) for row in top]
+
+    def save(self):
+        with self.lock:
+            if self.matrix is not None:
+                self.matrix.flush()
+            state = {
+                k: v for k, v in self.__dict__.items()
+                if k not in ("lock", "matrix", "key", "prefix")
+            }
+            tmp = f"{self.prefix}.meta.pkl.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, f"{self.prefix}.meta.pkl")
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "dim": self.dim,
+            "vectors": len(self.chunk_rows),
+            "capacity": len(self.row_chunks),
+            "file_mb": round(os.path.getsize(self.matrix_path) / 1e6, 2) if self.matrix is not None else 0,
+        }
@@ -1,10 +1,14 @@
 # backend/llm/routes/chat_route.py
 
 from fastapi import APIRouter, WebSocket
-from backend.llm.services.chat_handler import handle_chat
+from backend.llm.services.chat_handler import handle_chat, get_barge_in_stats
 
 router = APIRouter()
 
 @router.websocket("/ws/chat")
 async def websocket_chat(ws: WebSocket):
-    await handle_chat(ws)
\ No newline at end of file
+    await handle_chat(ws)
+
+@router.get("/chat/stats")
+async def get_chat_stats():
+    return get_barge_in_stats()
@@ -0,0 +1,25 @@
+# backend/llm/routes/config_cache_route.py
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Optional
+
+from backend.llm.services.config_cache import config_cache
+
+router = APIRouter()
+
+class InvalidateRequest(BaseModel):
+    scope: str
+    ids: Optional[list] = None
+
+@router.post("/config-cache/invalidate")
+async def invalidate_config_cache(req: InvalidateRequest):
+    try:
+        config_cache.invalidate(req.scope, req.ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, "version": config_cache.versions[req.scope]}
+
+@router.get("/config-cache/stats")
+async def get_config_cache_stats():
+    return config_cache.stats()
@@ -0,0 +1,11 @@
+# backend/llm/routes/emotion_route.py
+
+from fastapi import APIRouter
+
+from backend.llm.emotion.analyzer import get_emotion_stats
+
+router = APIRouter()
+
+@router.get("/emotion/stats")
+async def get_emotion_analyzer_stats():
+    return get_emotion_stats()
@@ -0,0 +1,11 @@
+# backend/llm/routes/endpoint_route.py
+
+from fastapi import APIRouter
+
+from backend.llm.services.endpoint_pool import get_endpoint_pool_stats
+
+router = APIRouter()
+
+@router.get("/endpoints/stats")
+async def get_llm_endpoint_stats():
+    return get_endpoint_pool_stats()
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Literal
 
+from backend.db.async_base import run_in_db
 from backend.llm.services.feedback_service import save_feedback_to_db
 
 router = APIRouter()
@@ -16,7 +17,7 @@ class FeedbackRequest(BaseModel):
 @router.post("/feedback")
 async def save_feedback(req: FeedbackRequest):
     try:
-        save_feedback_to_db(req.interaction_id, req.rating, req.tone_score)
+        await run_in_db(save_feedback_to_db, req.interaction_id, req.rating, req.tone_score)
         return {"message": "피드백 저장 완료"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"피드백 저장 실패: {e}")
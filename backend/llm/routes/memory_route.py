@@ -0,0 +1,15 @@
+# backend/llm/routes/memory_route.py
+
+from fastapi import APIRouter
+
+from backend.llm.memory.summarizer import get_summarizer_stats
+from backend.llm.services.session_store import session_store
+
+router = APIRouter()
+
+@router.get("/memory/stats")
+async def get_memory_stats():
+    return {
+        "summarizer": get_summarizer_stats(),
+        "sessions": session_store.stats()
+    }
@@ -0,0 +1,11 @@
+# backend/llm/routes/metrics_route.py
+
+from fastapi import APIRouter
+
+from backend.llm.services.turn_metrics import get_turn_metrics
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_llm_turn_metrics():
+    return get_turn_metrics()
@@ -0,0 +1,15 @@
+# backend/llm/routes/source_route.py
+
+from fastapi import APIRouter
+
+from backend.llm.retrieval.source_index import get_source_index_stats
+from backend.llm.retrieval.remote_fetcher import get_remote_fetcher_stats
+
+router = APIRouter()
+
+@router.get("/sources/stats")
+async def get_source_stats():
+    return {
+        **get_source_index_stats(),
+        "remote": get_remote_fetcher_stats()
+    }
@@ -0,0 +1,11 @@
+# backend/llm/routes/tool_route.py
+
+from fastapi import APIRouter
+
+from backend.llm.services.tool_executor import get_tool_stats
+
+router = APIRouter()
+
+@router.get("/tools/stats")
+async def get_tool_execution_stats():
+    return get_tool_stats()
@@ -1,24 +1,41 @@
 # backend/llm/services/chat_handler.py
 
-import pymysql
+import os
+import time
+import asyncio
+from collections import deque
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketDisconnect
-import json
-from urllib.parse import quote
-import httpx
 
 from backend.llm.services.prompt_builder import build_system_prompt
-from backend.llm.services.context_manager import build_llm_context, append_local_sources
-from backend.llm.services.tool_executor import (
-    extract_math_expr, extract_weather_expr, extract_search_query,
-    extract_spotify_query, extract_spotify_command, evaluate_math_expr
-)
+from backend.llm.services.context_manager import build_llm_context
+from backend.llm.memory.tokenizer import strip_private_keys, count_text_tokens
+from backend.llm.memory.summarizer import schedule_summary_update
+from backend.llm.services.tool_executor import get_intent_router, spotify_tool_call, run_tools
 from backend.llm.services.responder import stream_llm_response
-from backend.llm.services.translator import translate_to_ko_and_ja
-from backend.llm.emotion.analyzer import analyze_emotion
+from backend.llm.services.post_processor import run_post_stage
+from backend.llm.services.stream_translator import StreamingTranslator, STREAM_TRANSLATE_ENABLED
 from backend.llm.services.saver import save_interaction_and_build_response
 
-from backend.db.llm_db import get_llm_model_by_id, get_connection
+from backend.llm.services.config_cache import config_cache
+from backend.llm.services.endpoint_pool import get_endpoint_pool
+from backend.llm.services.session_store import session_store, ChatSession
+from backend.llm.services.turn_metrics import TurnTimer, record_turn
+
+# 마지막 interaction_id 메시지에 단계별 소요 시간(timings)을 붙일지 여부 (요청에 "timings": true로도 가능)
+SEND_TURN_TIMINGS = os.getenv("LLM_SEND_TURN_TIMINGS", "0") == "1"
+
+# 바지인(새 메시지로 이전 턴 취소) 통계
+_barge_in_stats = {"cancelled_turns": 0, "tokens_saved": 0}
+_cancel_latencies: deque[float] = deque(maxlen=500)
+
+def get_barge_in_stats() -> dict:
+    ordered = sorted(_cancel_latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+    return {
+        **_barge_in_stats,
+        "cancel_ms": {"p50": pick(0.50), "p95": pick(0.95), "max": ordered[-1] if ordered else None},
+    }
 
 async def safe_ws_close(ws: WebSocket):
     try:
@@ -26,22 +43,37 @@ async def safe_ws_close(ws: WebSocket):
     except RuntimeError:
         pass
 
-def get_tools_by_ids(tool_ids: list[int]):
-    if not tool_ids:
-        return []
-    conn = get_connection()
-    try:
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-            q = f"SELECT id, name, type, command, enabled FROM mcp_tools WHERE id IN ({','.join(['%s'] * len(tool_ids))})"
-            cursor.execute(q, tuple(tool_ids))
-            return cursor.fetchall()
-    finally:
-        conn.close()
+def _bind_session(session: ChatSession | None, data: dict) -> ChatSession:
+    """
+    - 전체 배열 모드: {"messages": [...]} → 세션 기록을 교체 (기존 클라이언트 호환)
+    - 델타 모드: {"message": "..."} 또는 {"message": {"role", "content"}} → 새 메시지만 추가
+    """
+    requested_id = data.get("session_id")
+    if requested_id and len(str(requested_id)) > 64:
+        requested_id = None
+
+    if session is None or (requested_id and requested_id != session.id):
+        session = session_store.get_or_create(requested_id)
+    session.touch()
+
+    if "messages" in data:
+        session.replace(data["messages"])
+    elif data.get("message"):
+        message = data["message"]
+        if isinstance(message, str):
+            session.append("user", message)
+        else:
+            session.append(message.get("role", "user"), message.get("content", ""))
+    return session
 
 async def handle_chat(ws: WebSocket):
     await ws.accept()
     print("[WS] 연결 수립")
 
+    # 웹소켓에 묶인 대화 세션 (session_id로 재접속 시 이어받기 가능)
+    session: ChatSession | None = None
+    turn: asyncio.Task | None = None
+
     try:
         while True:
             try:
@@ -50,145 +82,196 @@ async def handle_chat(ws: WebSocket):
                 print("[WS] 연결 종료")
                 break
 
-            try:
-                model_id = data.get("model_id")
-                if not model_id:
-                    await ws.send_text("[ERROR] 모델 ID 없음")
-                    await ws.close()
-                    return
-
-                model = get_llm_model_by_id(model_id)
-                print("[DEBUG] model type:", type(model))
-                print("[DEBUG] model:", model)
-                
-                if not model or not model["enabled"]:
-                    await ws.send_text("[ERROR] 모델이 비활성화됨")
-                    await ws.close()
-                    return
-
-                model_name = model["model_key"]
-                endpoint = model["endpoint"]
-                params = json.loads(model.get("params") or "{}")
-
-                # 1. 프롬프트
-                system_prompt = build_system_prompt(params)
-
-                # 2. 옵션/메시지 추출
-                sampling = params.get("sampling", {})
-                memory = params.get("memory", {})
-                opts = {
-                    "max_tokens": memory.get("maxTokens", 96),
-                    "temperature": sampling.get("temperature", 0.85),
-                    "top_k": sampling.get("topK", 40),
-                    "top_p": sampling.get("topP", 0.9),
-                    "repeat_penalty": sampling.get("repetitionPenalty", 1.1),
-                }
-                msgs = data.get("messages", [])
-                tool_ids = params.get("tools", [])
-                tool_defs = get_tools_by_ids(tool_ids)
-
-                # 3. 도구 감지
-                user_text = msgs[-1]["content"]
-                expr = extract_math_expr(user_text)
-                weather_query = extract_weather_expr(user_text)
-                search_query = extract_search_query(user_text)
-                spotify_query = extract_spotify_query(user_text)
-                spotify_cmd = extract_spotify_command(user_text)
-
-                tool_result = None
-                if expr:
-                    tool = next((t for t in tool_defs if t["name"] == "calculate" and t["enabled"]), None)
-                    if tool:
-                        tool_result = evaluate_math_expr(expr)
-
-                weather_result = None
-                if weather_query:
-                    tool = next((t for t in tool_defs if t["name"] == "fetch_weather" and t["enabled"]), None)
-                    if tool:
-                        try:
-                            url = tool["command"].replace("{{expr}}", quote(weather_query))
-                            async with httpx.AsyncClient() as client:
-                                res = await client.get(url)
-                                weather_result = res.text.strip()
-                        except: pass
-
-                search_result = None
-                if search_query:
-                    tool = next((t for t in tool_defs if t["name"] == "search" and t["enabled"]), None)
-                    if tool:
-                        try:
-                            encoded = quote(search_query)
-                            url = f"http://localhost:8500/mcp/api/tools/search?query={encoded}"
-                            async with httpx.AsyncClient() as client:
-                                res = await client.get(url)
-                                data = res.json()
-                                if "title" in data:
-                                    search_result = f"{data['title']}: {data['summary']} ({data['link']})"
-                        except: pass
-
-                tool_call = None
-                if spotify_query:
-                    tool_call = {"integration": "spotify", "action": "play", "query": spotify_query}
-                elif spotify_cmd:
-                    tool_call = {"integration": "spotify", **spotify_cmd}
-
-                # 4. context 빌드
-                context = await build_llm_context(model_id, system_prompt, msgs, memory)
-
-                if params.get("local_sources"):
-                    append_local_sources(context, params["local_sources"])
-
-                if tool_result:
-                    context.append({"role": "system", "content": f"The result of '{expr}' is {tool_result}."})
-                if weather_result:
-                    context.append({"role": "system", "content": f"The weather in {weather_query} is: {weather_result}."})
-                if search_result:
-                    context.append({"role": "system", "content": f"Here is the result for '{search_query}': {search_result}."})
-
-                # 5. LLM 호출
-                payload = { "model": model_name, "messages": context, "stream": True, **opts }
-                stream_text = await stream_llm_response(ws, payload, endpoint)
-
-                # 6. 번역 & 감정
-                ko, ja = await translate_to_ko_and_ja(stream_text)
-
-                try:
-                    print("[DEBUG] 감정 분석 진입함")
-                    emo = await analyze_emotion(stream_text)
-                    print("[DEBUG] 감정 분석 종료")
-                    emotion = emo.get("emotion", "neutral")
-                    tone = emo.get("tone", "neutral")
-                    blendshape = emo.get("blendshape", "Neutral")
-                except Exception as e:
-                    print("❌ 감정 분석 예외 발생:", e)
-                    emotion, tone = "neutral", "neutral"
-
-                # 7. 저장 및 응답
-                result = save_interaction_and_build_response(
-                    model_name=model_name,
-                    user_input=user_text,
-                    stream_text=stream_text,
-                    ko_translation=ko,
-                    ja_translation=ja,
-                    emotion=emotion,
-                    tone=tone,
-                    blendshape=blendshape,
-                    tool_call=tool_call
-                )
-
-                await ws.send_json(result)
-
-            except Exception as e:
-                print(f"[ERROR] 메시지 처리 중 오류: {e}")
-                try:
-                    await ws.send_text(f"[ERROR] 처리 실패: {e}")
-                except RuntimeError:
-                    pass  # 이미 닫힌 경우 무시
-                await safe_ws_close(ws)
-                return
+            # 바지인: 이전 턴이 아직 진행 중이면 취소하고 새 메시지를 처리합니다.
+            if turn and not turn.done():
+                await _cancel_turn(ws, turn)
+
+            session = _bind_session(session, data)
+            turn = asyncio.create_task(_run_turn(ws, session, data))
 
     except WebSocketDisconnect:
         print("[WS] 클라이언트 연결 종료")
     except Exception as e:
         print(f"[WS] 처리 중 예외: {e}")
         await safe_ws_close(ws)
+    finally:
+        if turn and not turn.done():
+            turn.cancel()
+
+async def _cancel_turn(ws: WebSocket, turn: asyncio.Task):
+    start = time.perf_counter()
+    turn.cancel()
+    try:
+        await turn
+    except BaseException:
+        pass
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    _barge_in_stats["cancelled_turns"] += 1
+    _cancel_latencies.append(elapsed_ms)
+    print(f"[BARGE-IN] 이전 턴 취소 ({elapsed_ms}ms)")
+
+    try:
+        await ws.send_text("[CANCELLED]")
+    except RuntimeError:
+        pass
+
+async def _run_turn(ws: WebSocket, session: ChatSession, data: dict):
+    timer = TurnTimer()
+    model_name = None
+    try:
+        model_id = data.get("model_id")
+        if not model_id:
+            await ws.send_text("[ERROR] 모델 ID 없음")
+            await ws.close()
+            return
+
+        with timer.span("config"):
+            cached = await config_cache.get_model(model_id)
+        model = cached["model"] if cached else None
+
+        if not model or not model["enabled"]:
+            await ws.send_text("[ERROR] 모델이 비활성화됨")
+            await ws.close()
+            return
+
+        model_name = model["model_key"]
+        # 모델 endpoint에 여러 llama.cpp 주소가 있으면 세션 고정 + 최소 대기 요청 순으로 분산
+        endpoint_pool = get_endpoint_pool(f"model:{model_id}", model["endpoint"])
+        params = cached["params"]
+
+        # 1. 프롬프트
+        # time/date를 세션 단위로 고정해 시스템 프롬프트가 턴마다 바뀌지 않게 합니다. (KV 캐시 재사용)
+        with timer.span("prompt"):
+            system_prompt = await build_system_prompt(params, now=session.prompt_clock())
+
+        # 2. 옵션/메시지 추출
+        sampling = params.get("sampling", {})
+        memory = params.get("memory", {})
+        opts = {
+            "max_tokens": memory.get("maxTokens", 96),
+            "temperature": sampling.get("temperature", 0.85),
+            "top_k": sampling.get("topK", 40),
+            "top_p": sampling.get("topP", 0.9),
+            "repeat_penalty": sampling.get("repetitionPenalty", 1.1),
+        }
+        msgs = session.messages
+        if not msgs or ("messages" not in data and not data.get("message")):
+            await ws.send_text("[ERROR] 메시지 없음")
+            return
+        tool_ids = params.get("tools", [])
+        with timer.span("tool_config"):
+            tool_defs = await config_cache.get_tools(tool_ids)
+
+        # 3. 도구 감지 (활성화된 도구/연동의 의도만 한 번에 스캔)
+        user_text = msgs[-1]["content"]
+        with timer.span("detect"):
+            intents = get_intent_router(tool_defs, params.get("integrations")).route(user_text)
+
+        tool_call = spotify_tool_call(intents)
+
+        # 4. 도구 실행(동시, 턴 마감 시간 적용)과 context 빌드를 겹쳐서 진행
+        #    로컬 소스/도구 결과는 토큰 예산 안에서 함께 배치
+        with timer.span("context"):
+            context = await build_llm_context(
+                model_id, system_prompt, msgs, memory,
+                source_ids=params.get("local_sources"),
+                tool_results=timer.timed("tools", run_tools(intents, tool_defs)),
+                state=session.context_state,
+                remote_source_ids=params.get("remote_sources"),
+                timer=timer,
+                session_id=session.id
+            )
+
+        # 5. LLM 호출
+        payload = {
+            "model": model_name,
+            "messages": strip_private_keys(context),
+            "stream": True,
+            "cache_prompt": True,
+            **opts
+        }
+        streamed = None
+        if STREAM_TRANSLATE_ENABLED:
+            streamed = StreamingTranslator(ws, push_segments=bool(data.get("stream_translation")))
+
+        stream_stats: dict = {}
+        parts: list[str] = []
+        def on_delta(delta: str):
+            parts.append(delta)
+            if streamed:
+                streamed.feed(delta)
+
+        try:
+            async with endpoint_pool.acquire(session.id) as endpoint:
+                with endpoint_pool.session_slot(endpoint, session.id) as slot:
+                    if slot is not None:
+                        payload["id_slot"] = slot
+                    stream_text = await stream_llm_response(ws, payload, endpoint, stats=stream_stats, on_delta=on_delta)
+        except asyncio.CancelledError:
+            # 바지인: 업스트림 스트림은 닫히고, 생성되지 않은 토큰 수를 절감량으로 기록
+            # parts 한 항목에 여러 토큰이 묶여 올 수 있어(TokenRelay), 받은 텍스트의 토큰 수로 셉니다.
+            if streamed:
+                streamed.cancel()
+            partial = "".join(parts)
+            _barge_in_stats["tokens_saved"] += max(opts["max_tokens"] - count_text_tokens(partial), 0)
+            if partial:
+                session.append("assistant", partial.strip())
+            raise
+        except Exception:
+            if streamed:
+                streamed.cancel()
+            raise
+
+        session.append("assistant", stream_text.strip())
+        timer.mark("connect", stream_stats.get("connect_ms"))
+        timer.mark("ttft", stream_stats.get("ttft_ms"))
+        if stream_stats.get("ttft_ms") is not None:
+            timer.mark("stream", stream_stats["stream_ms"] - stream_stats["ttft_ms"])
+
+        # 6. 번역 & 감정 (동시 실행, 끝나는 대로 전송)
+        post = await run_post_stage(ws, stream_text, streamed)
+        timer.mark("translation", post["timings"].get("translation_ms"))
+        timer.mark("emotion", post["timings"].get("emotion_ms"))
+        timer.mark("post", post["timings"].get("post_total_ms"))
+
+        # 7. 저장 및 응답
+        with timer.span("save"):
+            result = await save_interaction_and_build_response(
+                model_name=model_name,
+                user_input=user_text,
+                stream_text=stream_text,
+                ko_translation=post["ko"],
+                ja_translation=post["ja"],
+                emotion=post["emotion"],
+                tone=post["tone"],
+                blendshape=post["blendshape"],
+                tool_call=tool_call,
+                session_id=session.id
+            )
+        result["session_id"] = session.id
+
+        timings = record_turn(model_name, timer)
+        print(f"[TURN] model={model_name} {timings}")
+        if SEND_TURN_TIMINGS or data.get("timings"):
+            result["timings"] = timings
+
+        await ws.send_json(result)
+
+        # 8. 요약 메모리 갱신 (백그라운드)
+        if memory.get("strategy") in ("Summary", "Hybrid"):
+            schedule_summary_update(model_id, model_name, model["endpoint"], session.id)
+
+    except asyncio.CancelledError:
+        if model_name:
+            record_turn(model_name, timer, "cancelled")
+        raise
+    except Exception as e:
+        if model_name:
+            record_turn(model_name, timer, "error")
+        print(f"[ERROR] 메시지 처리 중 오류: {e}")
+        try:
+            await ws.send_text(f"[ERROR] 처리 실패: {e}")
+        except RuntimeError:
+            pass  # 이미 닫힌 경우 무시
+        await safe_ws_close(ws)
@@ -0,0 +1,145 @@
+# backend/llm/services/config_cache.py
+
+import os
+import json
+import time
+import asyncio
+
+from backend.db.llm_db import get_llm_model_by_id_async
+from backend.db.mcp_db import get_tools_by_ids_async
+from backend.utils.http_clients import get_http_client
+
+CONFIG_CACHE_TTL = float(os.getenv("LLM_CONFIG_CACHE_TTL", 300))
+# MCP 서버(:8500)에서 변경이 일어나면 여기 적힌 메인 앱(:8000)들에게 무효화를 알립니다.
+CONFIG_CACHE_PEERS = [
+    p.strip().rstrip("/")
+    for p in os.getenv("LLM_CONFIG_CACHE_PEERS", "http://localhost:8000").split(",")
+    if p.strip()
+]
+
+class ConfigCache:
+    """
+    llm_models 행(+파싱된 params), mcp_tools 정의, 컴파일된 프롬프트 템플릿을 메모리에 캐싱합니다.
+
+    scope별 버전 번호를 두고, 조회를 시작한 시점의 버전이 저장 시점까지 바뀌지 않았을 때만
+    결과를 캐시에 넣습니다. 무효화 알림이 유실되더라도 TTL이 지나면 다시 조회합니다.
+    """
+
+    def __init__(self, ttl: float = CONFIG_CACHE_TTL):
+        self.ttl = ttl
+        self.versions = {"models": 0, "tools": 0, "prompts": 0}
+        self._entries = {scope: {} for scope in self.versions}
+        self.hits = {scope: 0 for scope in self.versions}
+        self.misses = {scope: 0 for scope in self.versions}
+
+    def _get(self, scope: str, key):
+        entry = self._entries[scope].get(key)
+        if entry:
+            version, loaded_at, value = entry
+            if version == self.versions[scope] and time.monotonic() - loaded_at < self.ttl:
+                self.hits[scope] += 1
+                return True, value
+        self.misses[scope] += 1
+        return False, None
+
+    def _put(self, scope: str, key, version: int, value):
+        if version == self.versions[scope]:
+            self._entries[scope][key] = (version, time.monotonic(), value)
+
+    async def get_model(self, model_id) -> dict | None:
+        """
+        {"model": llm_models 행, "params": 파싱된 params dict}를 반환합니다.
+        반환값은 캐시와 공유되므로 호출 측에서 수정하면 안 됩니다.
+        """
+        key = str(model_id)
+        found, value = self._get("models", key)
+        if found:
+            return value
+
+        version = self.versions["models"]
+        model = await get_llm_model_by_id_async(model_id)
+        if not model:
+            return None
+
+        try:
+            params = json.loads(model.get("params") or "{}")
+        except Exception as e:
+            print(f"[ERROR] 모델 params 파싱 실패 (id={model_id}): {e}")
+            params = {}
+
+        value = {"model": model, "params": params}
+        self._put("models", key, version, value)
+        return value
+
+    async def get_tools(self, tool_ids: list[int]) -> list[dict]:
+        if not tool_ids:
+            return []
+        key = tuple(tool_ids)
+        found, value = self._get("tools", key)
+        if found:
+            return value
+
+        version = self.versions["tools"]
+        value = await get_tools_by_ids_async(tool_ids)
+        self._put("tools", key, version, value)
+        return value
+
+    async def get_or_load(self, scope: str, key, loader):
+        """
+        캐시에 없으면 await loader()로 값을 만들어 저장합니다.
+        """
+        found, value = self._get(scope, key)
+        if found:
+            return value
+
+        version = self.versions[scope]
+        value = await loader()
+        self._put(scope, key, version, value)
+        return value
+
+    def invalidate(self, scope: str, ids: list | None = None):
+        if scope not in self.versions:
+            raise ValueError(f"알 수 없는 캐시 scope입니다: {scope}")
+
+        self.versions[scope] += 1
+        if ids is None or scope != "models":
+            self._entries[scope].clear()
+        else:
+            for model_id in ids:
+                self._entries[scope].pop(str(model_id), None)
+
+    def stats(self) -> dict:
+        return {
+            scope: {
+                "version": self.versions[scope],
+                "entries": len(self._entries[scope]),
+                "hits": self.hits[scope],
+                "misses": self.misses[scope],
+            }
+            for scope in self.versions
+        }
+
+config_cache = ConfigCache()
+_pending_notifications: set[asyncio.Task] = set()
+
+async def _notify_peers(scope: str, ids: list | None):
+    payload = {"scope": scope, "ids": ids}
+    client = get_http_client("internal")
+    for peer in CONFIG_CACHE_PEERS:
+        try:
+            await client.post(f"{peer}/llm/config-cache/invalidate", json=payload, timeout=2.0)
+        except Exception as e:
+            print(f"[WARN] 설정 캐시 무효화 전달 실패 ({peer}): {e}")
+
+def publish_invalidation(scope: str, ids: list | None = None):
+    """
+    현재 프로세스의 캐시를 무효화하고, 다른 프로세스에도 무효화를 비동기로 전달합니다.
+    """
+    config_cache.invalidate(scope, ids)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_notify_peers(scope, ids))
+    _pending_notifications.add(task)
+    task.add_done_callback(_pending_notifications.discard)
@@ -1,32 +1,75 @@
 # backend/llm/services/context_manager.py
 
+import asyncio
+import inspect
+from typing import Awaitable
+
 from backend.llm.memory.context_builder import build_context
-from backend.utils.source_loader import load_text_from_local_sources
+from backend.llm.services.turn_metrics import TurnTimer
+from backend.llm.retrieval.source_index import retrieve_source_chunks
+from backend.llm.retrieval.remote_fetcher import ensure_remote_sources
+from backend.utils.source_loader import get_local_sources, get_remote_sources
+from backend.db.async_base import run_in_db
+
+async def build_llm_context(
+    model_id,
+    system_prompt,
+    user_messages,
+    memory_settings,
+    source_ids: list[int] | None = None,
+    tool_results: list[str] | Awaitable[list[str]] | None = None,
+    state: dict | None = None,
+    remote_source_ids: list[int] | None = None,
+    timer: TurnTimer | None = None,
+    session_id: str = ""
+):
+    """
+    tool_results에 실행 중인 도구 단계(awaitable)를 넘기면 로컬 소스 로딩과 동시에 기다립니다.
+    timer가 주어지면 소스 검색 시간을 "sources" 구간으로 기록합니다.
+    """
+    load_sources = (
+        load_source_texts(source_ids, remote_source_ids, user_messages[-1]["content"])
+        if source_ids or remote_source_ids else _resolved([])
+    )
+    if timer:
+        load_sources = timer.timed("sources", load_sources)
 
-async def build_llm_context(model_id, system_prompt, user_messages, memory_settings):
+    sources, tools = await asyncio.gather(
+        load_sources,
+        tool_results if inspect.isawaitable(tool_results) else _resolved(tool_results)
+    )
     return await build_context(
         model_id=model_id,
         system_prompt=system_prompt,
         user_messages=user_messages,
-        memory_settings=memory_settings
+        memory_settings=memory_settings,
+        extras={"sources": sources, "tools": tools},
+        state=state,
+        session_id=session_id
     )
 
-def append_local_sources(context: list[dict], source_ids: list[int]) -> None:
-    if not source_ids:
-        return
-
-    texts = load_text_from_local_sources(source_ids)
+async def _resolved(value):
+    return value or []
 
-    print(f"[📁 로컬 소스 ID 목록]: {source_ids}")
-    print(f"[📁 로컬 소스 참고 문서 수]: {len(texts)}개")
+async def _load_rows(loader, source_ids: list[int] | None) -> list[dict]:
+    return await run_in_db(loader, source_ids) if source_ids else []
 
-    for idx, text in enumerate(texts):
-        header = text.split('\\n')[0] if '\\n' in text else text[:50]
-        print(f"[📄 문서 {idx+1}] 헤더: {header}")
+async def load_source_texts(source_ids: list[int] | None, remote_source_ids: list[int] | None, query: str) -> list[str]:
+    """
+    로컬(폴더/database)·원격 소스 모두 청크 색인에서 질의와 관련된 부분만 가져옵니다.
+    원격 소스는 색인이 아직 없으면 백그라운드로 가져오기만 하고 이번 턴에서는 건너뜁니다.
+    """
+    local, remote = await asyncio.gather(
+        _load_rows(get_local_sources, source_ids),
+        _load_rows(get_remote_sources, remote_source_ids)
+    )
+    remote = [source for source in remote if source.get("enabled", True)]
+    ensure_remote_sources(remote)
+    texts = await retrieve_source_chunks(local + remote, query)
+    print(f"[📁 소스] 로컬 {len(local)}개, 원격 {len(remote)}개, 청크 {len(texts)}개")
 
+    contents = []
     for text in texts:
         role_intro = "This is character information:" if " is a " in text else "This is background knowledge:"
-        context.append({
-            "role": "system",
-            "content": f"{role_intro}\\n{text[:500]}"
-        })
+        contents.append(f"{role_intro}\n{text}")
+    return contents
@@ -0,0 +1,293 @@
+# backend/llm/services/endpoint_pool.py
+
+import os
+import time
+import random
+import asyncio
+from collections import deque, OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+
+from backend.utils.http_clients import get_http_client
+
+PROBE_INTERVAL = float(os.getenv("LLM_POOL_PROBE_INTERVAL", 10))
+EJECT_FAILURES = int(os.getenv("LLM_POOL_EJECT_FAILURES", 2))
+EJECT_SECONDS = float(os.getenv("LLM_POOL_EJECT_SECONDS", 30))
+# 제외가 반복되면 제외 시간을 두 배씩 늘립니다. (최대 EJECT_MAX_SECONDS)
+EJECT_MAX_SECONDS = float(os.getenv("LLM_POOL_EJECT_MAX_SECONDS", 300))
+# 제외됐던 백엔드는 연속 성공이 이만큼 쌓여야 실패 기록과 백오프가 초기화됩니다. (상태 점검 복구도 동일)
+RECOVER_SUCCESSES = int(os.getenv("LLM_POOL_RECOVER_SUCCESSES", 3))
+# 고정된 백엔드가 최소 대기열보다 이만큼까지 더 바빠도 세션 고정을 유지합니다. (KV 캐시 재사용)
+AFFINITY_SLACK = int(os.getenv("LLM_POOL_AFFINITY_SLACK", 1))
+AFFINITY_MAX = int(os.getenv("LLM_POOL_AFFINITY_MAX", 1024))
+# 백엔드별 llama.cpp 슬롯 수. 비워 두면 /props의 total_slots를 사용하고, 모르면 id_slot을 보내지 않습니다.
+POOL_SLOTS = int(os.getenv("LLM_POOL_SLOTS")) if os.getenv("LLM_POOL_SLOTS") else None
+# 슬롯이 2개 이상이면 마지막 슬롯은 요약 같은 백그라운드 작업 전용으로 남겨 채팅 세션의 KV 캐시를 밀어내지 않습니다.
+POOL_BACKGROUND_SLOT = os.getenv("LLM_POOL_BACKGROUND_SLOT", "1") == "1"
+
+class UpstreamError(RuntimeError):
+    """
+    llama.cpp 백엔드 쪽 오류(연결/읽기/HTTP 상태). 풀은 이 오류만 백엔드 실패로 셉니다.
+    웹소켓 전송 오류나 클라이언트 연결 종료는 백엔드 상태와 무관합니다.
+    """
+
+def parse_endpoints(value: str) -> list[str]:
+    """
+    llm_models.endpoint에 쉼표로 여러 llama.cpp 주소를 적을 수 있습니다.
+    """
+    return [url.strip().rstrip("/") for url in (value or "").split(",") if url.strip()]
+
+async def fetch_loaded_models(base_url: str, timeout: float = 5) -> list[str]:
+    client = get_http_client("llm_admin")
+    response = await client.get(f"{base_url.rstrip('/')}/v1/models", timeout=timeout)
+    response.raise_for_status()
+    return [m["id"] for m in response.json().get("data", [])]
+
+async def fetch_total_slots(base_url: str, timeout: float = 5) -> int | None:
+    client = get_http_client("llm_admin")
+    response = await client.get(f"{base_url.rstrip('/')}/props", timeout=timeout)
+    response.raise_for_status()
+    return response.json().get("total_slots")
+
+class Backend:
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.consecutive_successes = 0
+        self.ejections = 0
+        self.healthy = True
+        self.probe_successes = 0
+        self.ejected_until = 0.0
+        self.latencies: deque[float] = deque(maxlen=200)
+
+        self.slots = POOL_SLOTS
+        self._slot_sessions: OrderedDict[str, int] = OrderedDict()
+        self._slot_last_used: dict[int, float] = {}
+        # 생성 중인 슬롯 -> 세션. 다른 세션에 같은 슬롯을 주면 생성 도중 KV 캐시가 밀려납니다.
+        self._busy_slots: dict[int, str] = {}
+
+    @property
+    def background_slot(self) -> int | None:
+        if POOL_BACKGROUND_SLOT and self.slots and self.slots >= 2:
+            return self.slots - 1
+        return None
+
+    @property
+    def session_slots(self) -> int | None:
+        return self.slots - 1 if self.background_slot is not None else self.slots
+
+    def slot_for(self, key: str | None) -> int | None:
+        """
+        세션을 llama.cpp 슬롯(id_slot)에 고정하고 사용 중으로 표시합니다. (release_slot으로 해제)
+        새 세션이나 고정 슬롯이 다른 세션에 쓰이는 중이면, 쉬고 있는 슬롯 중 가장 오래 쓰이지 않은 것을 받습니다.
+        쉬는 슬롯이 없으면 None을 돌려 llama.cpp가 고르게 합니다.
+        """
+        slots = self.session_slots
+        if not key or not slots:
+            return None
+
+        slot = self._slot_sessions.get(key)
+        if slot is None or slot >= slots or self._busy_slots.get(slot, key) != key:
+            idle = [s for s in range(slots) if s not in self._busy_slots]
+            if not idle:
+                return None
+            slot = min(idle, key=lambda s: self._slot_last_used.get(s, 0.0))
+            self._slot_sessions[key] = slot
+            while len(self._slot_sessions) > slots * 4:
+                self._slot_sessions.popitem(last=False)
+        self._slot_sessions.move_to_end(key)
+        self._slot_last_used[slot] = time.monotonic()
+        self._busy_slots[slot] = key
+        return slot
+
+    def release_slot(self, slot: int | None):
+        if slot is not None:
+            self._busy_slots.pop(slot, None)
+            self._slot_last_used[slot] = time.monotonic()
+
+    @property
+    def available(self) -> bool:
+        return self.healthy and time.monotonic() >= self.ejected_until
+
+    def record_success(self, elapsed: float):
+        self.latencies.append(elapsed)
+        self.consecutive_successes += 1
+        # 제외된 적이 있으면 한 번의 성공으로 바로 믿지 않습니다.
+        if not self.ejections or self.consecutive_successes >= RECOVER_SUCCESSES:
+            self.consecutive_failures = 0
+            self.ejections = 0
+
+    def record_failure(self):
+        self.errors += 1
+        self.consecutive_failures += 1
+        self.consecutive_successes = 0
+        if self.consecutive_failures >= EJECT_FAILURES:
+            self.ejections += 1
+            seconds = min(EJECT_SECONDS * 2 ** (self.ejections - 1), EJECT_MAX_SECONDS)
+            self.ejected_until = time.monotonic() + seconds
+            print(f"[LLM-POOL] {self.url} 제외 ({seconds}s, 연속 실패 {self.consecutive_failures}회)")
+
+    def record_probe(self, ok: bool):
+        """
+        /v1/models 점검 결과. 점검 성공은 제외 시간을 앞당기지 않고,
+        점검 실패로 unhealthy가 된 백엔드는 RECOVER_SUCCESSES번 연속 성공해야 복구됩니다.
+        """
+        if not ok:
+            if self.healthy:
+                print(f"[LLM-POOL] {self.url} 상태 점검 실패")
+            self.healthy = False
+            self.probe_successes = 0
+            return
+        self.probe_successes += 1
+        if not self.healthy and self.probe_successes >= RECOVER_SUCCESSES:
+            print(f"[LLM-POOL] {self.url} 복구")
+            self.healthy = True
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1) if ordered else None
+        return {
+            "url": self.url,
+            "available": self.available,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "slots": self.slots,
+            "busy_slots": len(self._busy_slots),
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+            "ejected_for_s": round(max(0.0, self.ejected_until - time.monotonic()), 1),
+            "latency_ms": {"p50": pick(0.50), "p95": pick(0.95)},
+        }
+
+class EndpointPool:
+    """
+    llama.cpp 서버 여러 대에 대한 최소 대기 요청(least-outstanding) 라우팅.
+    affinity_key(세션 ID 등)가 주어지면 같은 백엔드로 보내 KV 캐시를 재사용합니다.
+    연속 실패 시 일정 시간 제외하고, /v1/models 주기 점검으로 상태를 갱신합니다.
+    """
+
+    def __init__(self, name: str, urls: list[str]):
+        if not urls:
+            raise ValueError(f"{name}: endpoint가 설정되지 않았습니다")
+        self.name = name
+        self.urls = urls
+        self.backends = [Backend(url) for url in urls]
+        self._affinity: OrderedDict[str, Backend] = OrderedDict()
+
+    def _pick(self, affinity_key: str | None) -> Backend:
+        candidates = [b for b in self.backends if b.available] or self.backends
+        least = min(b.outstanding for b in candidates)
+
+        if affinity_key:
+            pinned = self._affinity.get(affinity_key)
+            if pinned in candidates and pinned.outstanding <= least + AFFINITY_SLACK:
+                self._affinity.move_to_end(affinity_key)
+                return pinned
+
+        backend = random.choice([b for b in candidates if b.outstanding == least])
+        if affinity_key:
+            self._affinity[affinity_key] = backend
+            self._affinity.move_to_end(affinity_key)
+            while len(self._affinity) > AFFINITY_MAX:
+                self._affinity.popitem(last=False)
+        return backend
+
+    @contextmanager
+    def session_slot(self, url: str, affinity_key: str | None):
+        """
+        생성하는 동안 세션의 id_slot을 잡아 둡니다. 슬롯을 정할 수 없으면 None을 줍니다.
+        """
+        backend = next((b for b in self.backends if b.url == url), None)
+        slot = backend.slot_for(affinity_key) if backend else None
+        try:
+            yield slot
+        finally:
+            if backend:
+                backend.release_slot(slot)
+
+    def background_slot(self, url: str) -> int | None:
+        backend = next((b for b in self.backends if b.url == url), None)
+        return backend.background_slot if backend else None
+
+    @asynccontextmanager
+    async def acquire(self, affinity_key: str | None = None):
+        """
+        본문에서 UpstreamError나 httpx 오류가 나면 백엔드 실패로, 정상 종료하면 성공으로 기록합니다.
+        그 밖의 예외(웹소켓 전송 실패, 취소 등)는 어느 쪽으로도 세지 않습니다.
+        """
+        _ensure_prober()
+        backend = self._pick(affinity_key)
+        backend.outstanding += 1
+        backend.requests += 1
+        start = time.perf_counter()
+        try:
+            yield backend.url
+        except (UpstreamError, httpx.HTTPError):
+            backend.record_failure()
+            raise
+        else:
+            backend.record_success(time.perf_counter() - start)
+        finally:
+            backend.outstanding -= 1
+
+    async def probe(self):
+        async def check(backend: Backend):
+            try:
+                await fetch_loaded_models(backend.url)
+            except Exception:
+                backend.record_probe(False)
+                return
+            backend.record_probe(True)
+
+            if POOL_SLOTS is None:
+                try:
+                    backend.slots = await fetch_total_slots(backend.url)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(check(b) for b in self.backends))
+
+    def stats(self) -> dict:
+        return {
+            "backends": [b.stats() for b in self.backends],
+            "affinity_sessions": len(self._affinity),
+        }
+
+_pools: dict[str, EndpointPool] = {}
+_prober: asyncio.Task | None = None
+
+def get_endpoint_pool(name: str, endpoints: str) -> EndpointPool:
+    """
+    이름별로 풀을 유지합니다. 모델의 endpoint 설정이 바뀌면 새로 만듭니다.
+    """
+    urls = parse_endpoints(endpoints)
+    pool = _pools.get(name)
+    if pool is None or pool.urls != urls:
+        pool = EndpointPool(name, urls)
+        _pools[name] = pool
+    return pool
+
+def get_endpoint_pool_stats() -> dict:
+    return {name: pool.stats() for name, pool in _pools.items()}
+
+def _ensure_prober():
+    global _prober
+    if _prober is None or _prober.done():
+        _prober = asyncio.get_running_loop().create_task(_probe_loop())
+
+async def _probe_loop():
+    while True:
+        await asyncio.gather(*(pool.probe() for pool in list(_pools.values())), return_exceptions=True)
+        await asyncio.sleep(PROBE_INTERVAL)
+
+async def close_endpoint_pools():
+    global _prober
+    if _prober:
+        _prober.cancel()
+        await asyncio.gather(_prober, return_exceptions=True)
+        _prober = None
@@ -0,0 +1,85 @@
+# backend/llm/services/post_processor.py
+
+import os
+import time
+import asyncio
+from fastapi import WebSocket
+
+from backend.llm.services.translator import translate_to_ko_and_ja
+from backend.llm.emotion.analyzer import analyze_emotion
+from backend.llm.services.stream_translator import StreamingTranslator
+
+TRANSLATE_TIMEOUT = float(os.getenv("LLM_TRANSLATE_TIMEOUT", 15))
+EMOTION_TIMEOUT = float(os.getenv("LLM_EMOTION_TIMEOUT", 30))
+
+DEFAULT_EMOTION = {"emotion": "neutral", "tone": "neutral", "blendshape": "Neutral"}
+
+async def _run_branch(name: str, coro, timeout: float, timings: dict):
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        print(f"[POST] {name} 시간 초과 ({timeout}s)")
+        timings[f"{name}_status"] = "timeout"
+        return None
+    except Exception as e:
+        print(f"[POST] {name} 실패: {e}")
+        timings[f"{name}_status"] = "error"
+        return None
+    finally:
+        timings[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+async def _translate_full_or_streamed(stream_text: str, streamed: StreamingTranslator | None):
+    if streamed:
+        assembled = await streamed.finish()
+        if assembled:
+            return assembled
+        print("[POST] 문장 단위 번역 실패 → 전체 번역으로 대체")
+    return await translate_to_ko_and_ja(stream_text)
+
+async def run_post_stage(ws: WebSocket, stream_text: str, streamed: StreamingTranslator | None = None) -> dict:
+    """
+    번역과 감정 분석을 동시에 실행합니다.
+    스트리밍 중 문장 단위로 번역해 둔 경우(streamed) 그 결과를 조립해 사용합니다.
+
+    먼저 끝난 결과부터 웹소켓으로 보내고(감정 → {"type": "emotion"}, 번역 → {"type": "translation"}),
+    실패하거나 시간을 넘긴 분기는 기본값으로 채워 전체 턴이 멈추지 않게 합니다.
+    """
+    timings = {}
+    result = {"ko": "", "ja": "", **DEFAULT_EMOTION}
+
+    async def emotion_branch():
+        emo = await _run_branch("emotion", analyze_emotion(stream_text), EMOTION_TIMEOUT, timings)
+        if emo:
+            result["emotion"] = emo.get("emotion", "neutral")
+            result["tone"] = emo.get("tone", "neutral")
+            result["blendshape"] = emo.get("blendshape", "Neutral")
+        await ws.send_json({
+            "type": "emotion",
+            "emotion": result["emotion"],
+            "tone": result["tone"],
+            "blendshape": result["blendshape"]
+        })
+
+    async def translation_branch():
+        translated = await _run_branch(
+            "translation",
+            _translate_full_or_streamed(stream_text, streamed),
+            TRANSLATE_TIMEOUT,
+            timings
+        )
+        if translated:
+            result["ko"], result["ja"] = translated
+        await ws.send_json({
+            "type": "translation",
+            "translated": result["ko"],
+            "ja_translated": result["ja"]
+        })
+
+    start = time.perf_counter()
+    await asyncio.gather(emotion_branch(), translation_branch())
+    timings["post_total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    print(f"[POST] 분기별 소요 시간: {timings}")
+    result["timings"] = timings
+    return result
@@ -1,16 +1,30 @@
 # backend/llm/services/prompt_builder.py
 
+import os
 import re
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from backend.utils.prompt_utils import apply_variables
-from backend.db.mcp_db import get_prompt_templates_by_ids
+from backend.db.mcp_db import get_prompt_template_rows_by_ids_async
+from backend.llm.services.config_cache import config_cache
+
+DEFAULT_PROMPT_PATH = Path("backend/llm/prompt/arielle_prompt.txt")
+
+VARIABLE_PATTERN = re.compile(r"\{([\w_]+)\}")
+
+# 요청마다 값이 바뀌는 변수. 나머지 변수는 컴파일 시점에 정적 문자열로 접어 둡니다.
+DYNAMIC_VARIABLES = ("time", "date")
+
+# mcp_prompts.variables에 선언된 변수에 쓰이는 값 (기존 get_prompt_templates_by_ids와 동일)
+TEMPLATE_DECLARED_VALUES = {"user_name": "다엘"}
+
+MANUAL_PROMPT_CACHE_SIZE = 64
 
 def load_default_prompt() -> str:
-    return Path("backend/llm/prompt/arielle_prompt.txt").read_text(encoding="utf-8")
+    return DEFAULT_PROMPT_PATH.read_text(encoding="utf-8")
 
 def extract_variables(template: str) -> list[str]:
-    return re.findall(r"\{([\w_]+)\}", template)
+    return VARIABLE_PATTERN.findall(template)
 
 def resolve_variables(vars: list[str]) -> dict:
     now = datetime.now()
@@ -22,19 +36,102 @@ def resolve_variables(vars: list[str]) -> dict:
         ) for var in vars
     }
 
-def build_system_prompt(params: dict) -> str:
+def _dynamic_values(now: datetime) -> dict:
+    return {
+        "time": now.strftime("%H:%M"),
+        "date": now.strftime("%Y-%m-%d"),
+    }
+
+class CompiledPrompt:
+    """
+    템플릿을 정적 문자열 조각과 동적 변수 슬롯으로 미리 나눠 둔 렌더러.
+    render()는 time/date만 채워 넣고 조각을 이어 붙입니다.
+    """
+
+    def __init__(self, parts: list[str | tuple[str]]):
+        merged = []
+        for part in parts:
+            if isinstance(part, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += part
+            elif part != "":
+                merged.append(part)
+        self.parts = merged
+        self.is_static = all(isinstance(p, str) for p in merged)
+
+    def render(self, now: datetime | None = None) -> str:
+        if self.is_static:
+            return self.parts[0] if self.parts else ""
+        values = _dynamic_values(now or datetime.now())
+        return "".join(p if isinstance(p, str) else values[p[0]] for p in self.parts)
+
+def _compile_parts(template: str, declared: set[str] = frozenset()) -> list[str | tuple[str]]:
+    parts = []
+    pos = 0
+    for match in VARIABLE_PATTERN.finditer(template):
+        parts.append(template[pos:match.start()])
+        var = match.group(1)
+        if var in DYNAMIC_VARIABLES:
+            parts.append((var,))
+        elif var in declared and var in TEMPLATE_DECLARED_VALUES:
+            parts.append(TEMPLATE_DECLARED_VALUES[var])
+        else:
+            parts.append(resolve_variables([var])[var])
+        pos = match.end()
+    parts.append(template[pos:])
+    return parts
+
+def compile_prompt(template: str) -> CompiledPrompt:
+    return CompiledPrompt(_compile_parts(template))
+
+def compile_template_rows(rows: list[dict]) -> CompiledPrompt:
+    parts = []
+    for idx, row in enumerate(rows):
+        if idx:
+            parts.append("\n\n")
+        parts += _compile_parts(row["template"], set(row["variables"]))
+    return CompiledPrompt(parts)
+
+_default_prompt: tuple[float, CompiledPrompt] | None = None
+_manual_prompts: OrderedDict[str, CompiledPrompt] = OrderedDict()
+
+def _get_default_prompt() -> CompiledPrompt:
+    global _default_prompt
+    mtime = os.stat(DEFAULT_PROMPT_PATH).st_mtime
+    if _default_prompt is None or _default_prompt[0] != mtime:
+        _default_prompt = (mtime, compile_prompt(load_default_prompt()))
+    return _default_prompt[1]
+
+def _get_manual_prompt(text: str) -> CompiledPrompt:
+    compiled = _manual_prompts.get(text)
+    if compiled is None:
+        compiled = compile_prompt(text)
+        _manual_prompts[text] = compiled
+        if len(_manual_prompts) > MANUAL_PROMPT_CACHE_SIZE:
+            _manual_prompts.popitem(last=False)
+    else:
+        _manual_prompts.move_to_end(text)
+    return compiled
+
+async def _get_template_prompt(prompt_ids: list[int]) -> CompiledPrompt:
+    async def load():
+        rows = await get_prompt_template_rows_by_ids_async(prompt_ids)
+        return compile_template_rows(rows)
+
+    # 키에는 프롬프트 ID 목록만 두고, 템플릿 버전은 config_cache의 "prompts" scope 버전으로 검사합니다.
+    return await config_cache.get_or_load("prompts", tuple(prompt_ids), load)
+
+async def build_system_prompt(params: dict, now: datetime | None = None) -> str:
+    """
+    now를 고정해 넘기면 time/date 슬롯이 같은 값으로 렌더링되어 프롬프트가 바이트 단위로 유지됩니다.
+    """
     prompt_ids = params.get("prompts", [])
     manual_prompt = params.get("prompt", "").strip()
 
     if manual_prompt:
-        system_prompt = manual_prompt
+        compiled = _get_manual_prompt(manual_prompt)
     elif prompt_ids:
-        template_prompts = get_prompt_templates_by_ids(prompt_ids)
-        system_prompt = "\n\n".join(template_prompts)
+        compiled = await _get_template_prompt(prompt_ids)
     else:
-        system_prompt = load_default_prompt()
-
-    vars = extract_variables(system_prompt)
-    system_prompt = apply_variables(system_prompt, vars, resolve_variables(vars))
+        compiled = _get_default_prompt()
 
-    return system_prompt
+    return compiled.render(now)
@@ -1,34 +1,227 @@
 # backend/llm/services/responder.py
 
+import os
 import json
+import time
+import asyncio
+from contextlib import aclosing
+from typing import Callable
 import httpx
 from fastapi import WebSocket
+from backend.utils.http_clients import get_http_client
+from backend.llm.services.endpoint_pool import UpstreamError
 
-async def stream_llm_response(ws: WebSocket, payload: dict, endpoint: str) -> str:
-    stream_text = ""
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
+# token: 토큰마다 프레임 전송 (기존 방식) / coalesce: 시간·바이트 예산 단위로 묶어서 전송
+RELAY_MODE = os.getenv("LLM_RELAY_MODE", "coalesce")
+RELAY_FLUSH_MS = float(os.getenv("LLM_RELAY_FLUSH_MS", 20))
+RELAY_FLUSH_BYTES = int(os.getenv("LLM_RELAY_FLUSH_BYTES", 256))
+
+# 진행 중인 채팅 스트림 수 (요약 같은 백그라운드 LLM 작업은 0일 때만 실행)
+_active_streams = 0
+
+async def wait_for_idle(poll: float = 0.5, max_wait: float = 30.0):
+    """
+    채팅 스트림이 모두 끝날 때까지 기다립니다. max_wait가 지나면 그냥 진행합니다.
+    """
+    waited = 0.0
+    while _active_streams and waited < max_wait:
+        await asyncio.sleep(poll)
+        waited += poll
+
+class TokenRelay:
+    """
+    SSE 델타를 모아 웹소켓 프레임으로 중계합니다.
+
+    - 첫 토큰은 TTFT를 위해 즉시 보냅니다.
+    - 이후에는 flush_ms가 지난 뒤 단어 경계(공백/문장부호로 시작하는 델타)에서,
+      또는 flush_bytes를 넘거나 flush_ms의 두 배가 지나면 보냅니다.
+    - 다음 델타가 늦게 오면 보류 중인 델타도 flush_ms 안에 보냅니다. (flush_deadline 참고)
+    - 전체 텍스트는 리스트에 모아 마지막에 한 번만 join 합니다.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        mode: str = RELAY_MODE,
+        flush_ms: float = RELAY_FLUSH_MS,
+        flush_bytes: int = RELAY_FLUSH_BYTES
+    ):
+        self.ws = ws
+        self.coalesce = mode == "coalesce"
+        self.flush_after = flush_ms / 1000
+        self.flush_bytes = flush_bytes
+
+        self.parts: list[str] = []
+        self.pending: list[str] = []
+        self.pending_bytes = 0
+        self.pending_since = None
+        self.last_flush = time.perf_counter()
+
+        self.started_at = self.last_flush
+        # 업스트림 응답 헤더를 받은 시각 (llama.cpp 대기열/연결 시간)
+        self.connected_at = None
+        self.first_token_at = None
+        self.deltas = 0
+        self.frames = 0
+
+    async def push(self, delta: str):
+        if not delta:
+            return
+
+        now = time.perf_counter()
+        self.deltas += 1
+        self.parts.append(delta)
+
+        if self.first_token_at is None:
+            self.first_token_at = now
+            self.pending.append(delta)
+            await self.flush()
+            return
+
+        if not self.coalesce:
+            self.pending.append(delta)
+            await self.flush()
+            return
+
+        elapsed = now - self.last_flush
+        at_boundary = not delta[0].isalnum()
+        if self.pending and elapsed >= self.flush_after and at_boundary:
+            await self.flush()
+
+        if not self.pending:
+            self.pending_since = now
+        self.pending.append(delta)
+        self.pending_bytes += len(delta.encode("utf-8"))
+
+        if self.pending_bytes >= self.flush_bytes or now - self.last_flush >= self.flush_after * 2:
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending:
+            return
+        frame = "".join(self.pending)
+        self.pending.clear()
+        self.pending_bytes = 0
+        self.pending_since = None
+        self.last_flush = time.perf_counter()
+        self.frames += 1
+        await self.ws.send_text(frame)
+
+    def flush_deadline(self) -> float | None:
+        """
+        보류 중인 델타를 늦어도 보내야 하는 시각까지 남은 초. 보류 중인 델타가 없으면 None.
+        """
+        if self.pending_since is None:
+            return None
+        return max(0.0, self.pending_since + self.flush_after - time.perf_counter())
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def stats(self) -> dict:
+        end = time.perf_counter()
+        return {
+            "connect_ms": round((self.connected_at - self.started_at) * 1000, 1) if self.connected_at else None,
+            "ttft_ms": round((self.first_token_at - self.started_at) * 1000, 1) if self.first_token_at else None,
+            "stream_ms": round((end - self.started_at) * 1000, 1),
+            "deltas": self.deltas,
+            "frames": self.frames,
+        }
+
+async def _relay_lines(res, relay: TokenRelay):
+    """
+    SSE 줄을 읽되, 다음 줄을 기다리는 사이 보류 중인 델타의 전송 기한이 지나면 먼저 보냅니다.
+    읽기 작업은 취소하지 않고 이어서 기다리므로 스트림 상태가 깨지지 않습니다.
+    """
+    lines = res.aiter_lines()
+    reading = None
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            async with client.stream("POST", f"{endpoint}/v1/chat/completions", json=payload) as res:
-                async for line in res.aiter_lines():
+        while True:
+            if reading is None:
+                reading = asyncio.ensure_future(anext(lines))
+            done, _ = await asyncio.wait({reading}, timeout=relay.flush_deadline())
+            if not done:
+                await relay.flush()
+                continue
+            task, reading = reading, None
+            try:
+                line = task.result()
+            except StopAsyncIteration:
+                return
+            yield line
+    finally:
+        if reading is not None:
+            reading.cancel()
+
+async def stream_llm_response(
+    ws: WebSocket,
+    payload: dict,
+    endpoint: str,
+    stats: dict | None = None,
+    on_delta: Callable[[str], None] | None = None
+) -> str:
+    """
+    on_delta가 주어지면 토큰 델타마다 동기적으로 호출합니다. (스트리밍 번역 등)
+    """
+    global _active_streams
+    relay = TokenRelay(ws)
+    _active_streams += 1
+
+    try:
+        client = get_http_client("llm")
+        async with client.stream("POST", f"{endpoint}/v1/chat/completions", json=payload) as res:
+            res.raise_for_status()
+            relay.connected_at = time.perf_counter()
+            async with aclosing(_relay_lines(res, relay)) as lines:
+                async for line in lines:
                     if line.startswith("data: "):
-                        content = line.removeprefix("data: ").strip()
+                        content = line[6:].strip()
                         if content == "[DONE]":
+                            await relay.flush()
                             await ws.send_text("[DONE]")
                             break
                         try:
-                            chunk = json.loads(content)
+                            chunk = _loads(content)
                             delta = chunk["choices"][0]["delta"].get("content", "")
-                            stream_text += delta
-                            await ws.send_text(delta)
+                            await relay.push(delta)
+                            if delta and on_delta:
+                                on_delta(delta)
                         except Exception as e:
                             print(f"[ERROR] JSON decode 실패: {e}")
+                            await relay.flush()
                             await ws.send_text("[ERROR] 스트리밍 처리 중 예외 발생")
                             continue
+            await relay.flush()
+    except httpx.HTTPError as e:
+        # 업스트림 오류는 UpstreamError로 올려 엔드포인트 풀이 백엔드 실패로 세게 합니다.
+        print(f"[STREAM ERROR] 업스트림 오류: {e}")
+        try:
+            await ws.send_text(f"[ERROR] 스트리밍 중 예외 발생: {e}")
+            await ws.close()
+        except Exception:
+            pass
+        raise UpstreamError(str(e)) from e
     except Exception as e:
         print(f"[STREAM ERROR] 스트리밍 중 예외: {e}")
-        await ws.send_text(f"[ERROR] 스트리밍 중 예외 발생: {e}")
-        await ws.close()
+        try:
+            await ws.send_text(f"[ERROR] 스트리밍 중 예외 발생: {e}")
+            await ws.close()
+        except Exception:
+            pass
         raise
+    finally:
+        _active_streams -= 1
+
+    relay_stats = relay.stats()
+    print(f"[STREAM] connect={relay_stats['connect_ms']}ms, ttft={relay_stats['ttft_ms']}ms, deltas={relay_stats['deltas']}, frames={relay_stats['frames']}")
+    if stats is not None:
+        stats.update(relay_stats)
 
-    return stream_text
+    return relay.text
@@ -1,8 +1,8 @@
 # backend/llm/services/saver.py
 
-from backend.db.llm_db import save_llm_interaction
+from backend.db.llm_db import save_llm_interaction_async
 
-def save_interaction_and_build_response(
+async def save_interaction_and_build_response(
     model_name: str,
     user_input: str,
     stream_text: str,
@@ -11,9 +11,10 @@ def save_interaction_and_build_response(
     emotion: str,
     tone: str,
     blendshape: str,
-    tool_call: dict | None
+    tool_call: dict | None,
+    session_id: str = ""
 ) -> dict:
-    interaction_id = save_llm_interaction(
+    interaction_id = await save_llm_interaction_async(
         model_name=model_name,
         request=user_input,
         response=stream_text.strip(),
@@ -21,7 +22,8 @@ def save_interaction_and_build_response(
         ja_translate_response=ja_translation,
         emotion=emotion,
         tone=tone,
-        blendshape=blendshape
+        blendshape=blendshape,
+        session_id=session_id
     )
 
     return {
@@ -0,0 +1,48 @@
+# backend/llm/services/segmenter.py
+
+import re
+
+# 문장 끝 문장부호(+닫는 따옴표/괄호) 뒤에 공백이 오거나, 줄바꿈이 나오면 문장 경계로 봅니다.
+# 공백을 요구하므로 "3.14", "v1.2" 같은 토큰 중간의 마침표에서는 끊지 않습니다.
+SENTENCE_BOUNDARY = re.compile(r'([.!?…。！？]+["\'”’)\]]*)(\s+)|(\n+)')
+
+ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e."}
+
+class SentenceSegmenter:
+    """
+    스트리밍으로 들어오는 텍스트 조각을 받아 완성된 문장 단위로 잘라 돌려줍니다.
+    feed()는 (문장, 뒤따르는 공백) 튜플 목록을 반환하고, flush()는 남은 텍스트를 반환합니다.
+    """
+
+    def __init__(self, min_chars: int = 2):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, delta: str) -> list[tuple[str, str]]:
+        self.buffer += delta
+        sentences = []
+        start = 0
+
+        for match in SENTENCE_BOUNDARY.finditer(self.buffer):
+            if match.group(3):
+                end, sep = match.start(3), match.group(3)
+            else:
+                end, sep = match.end(1), match.group(2)
+
+            sentence = self.buffer[start:end].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            last_word = sentence.rsplit(None, 1)[-1].lower()
+            if last_word in ABBREVIATIONS:
+                continue
+
+            sentences.append((sentence, sep))
+            start = match.end()
+
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> str:
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return rest
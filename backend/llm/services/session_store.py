@@ -0,0 +1,108 @@
+# backend/llm/services/session_store.py
+
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+SESSION_TTL = float(os.getenv("LLM_SESSION_TTL", 1800))
+SESSION_MAX = int(os.getenv("LLM_SESSION_MAX", 256))
+SESSION_MAX_MESSAGES = int(os.getenv("LLM_SESSION_MAX_MESSAGES", 1000))
+# 시스템 프롬프트의 time/date 값을 고정해 두는 시간 (KV 캐시 접두사 유지)
+PROMPT_PIN_SECONDS = float(os.getenv("LLM_PROMPT_PIN_SECONDS", 900))
+
+class ChatSession:
+    """
+    웹소켓에 묶인 대화 기록. 메시지 dict를 그대로 보관하므로
+    context_builder가 붙여 둔 토큰 수(_tokens)가 턴 사이에 유지됩니다.
+    """
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.messages: list[dict] = []
+        self.created_at = time.time()
+        self.last_active = self.created_at
+        # context_builder가 기록 시작 지점 등을 저장하는 상태
+        self.context_state: dict = {}
+        self._prompt_clock: datetime | None = None
+
+    def append(self, role: str, content: str) -> dict:
+        message = {"role": role, "content": content}
+        self.messages.append(message)
+        self._trim()
+        return message
+
+    def replace(self, messages: list[dict]):
+        """
+        전체 배열 모드: 기존 기록과 같은 앞부분은 기존 dict를 재사용하고 나머지만 교체합니다.
+        """
+        same = 0
+        for old, new in zip(self.messages, messages):
+            if old["role"] != new.get("role") or old["content"] != new.get("content"):
+                break
+            same += 1
+
+        self.messages = self.messages[:same] + [
+            {"role": m.get("role", "user"), "content": m.get("content", "")}
+            for m in messages[same:]
+        ]
+        self._trim()
+
+    def prompt_clock(self) -> datetime:
+        """
+        시스템 프롬프트 렌더링에 쓸 시각. PROMPT_PIN_SECONDS 동안 같은 값을 돌려줍니다.
+        """
+        now = datetime.now()
+        if self._prompt_clock is None or (now - self._prompt_clock).total_seconds() > PROMPT_PIN_SECONDS:
+            self._prompt_clock = now
+        return self._prompt_clock
+
+    def touch(self):
+        self.last_active = time.time()
+
+    def _trim(self):
+        if len(self.messages) > SESSION_MAX_MESSAGES:
+            del self.messages[:len(self.messages) - SESSION_MAX_MESSAGES]
+
+class SessionStore:
+    def __init__(self, ttl: float = SESSION_TTL, max_sessions: int = SESSION_MAX):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, ChatSession] = OrderedDict()
+        self.resumed = 0
+        self.created = 0
+
+    def get_or_create(self, session_id: str | None = None) -> ChatSession:
+        self._evict_expired()
+
+        if session_id:
+            session = self._sessions.get(session_id)
+            if session:
+                self._sessions.move_to_end(session_id)
+                session.touch()
+                self.resumed += 1
+                return session
+
+        session = ChatSession(session_id or uuid.uuid4().hex)
+        self._sessions[session.id] = session
+        self.created += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def _evict_expired(self):
+        now = time.time()
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_active > self.ttl]
+        for sid in expired:
+            del self._sessions[sid]
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "created": self.created,
+            "resumed": self.resumed,
+            "messages": sum(len(s.messages) for s in self._sessions.values()),
+        }
+
+session_store = SessionStore()
@@ -0,0 +1,83 @@
+# backend/llm/services/stream_translator.py
+
+import os
+import asyncio
+from fastapi import WebSocket
+
+from backend.llm.services.segmenter import SentenceSegmenter
+from backend.llm.services.translator import translate_to_ko_and_ja
+
+STREAM_TRANSLATE_ENABLED = os.getenv("LLM_STREAM_TRANSLATE", "1") == "1"
+
+class StreamingTranslator:
+    """
+    LLM 스트림에서 문장이 완성될 때마다 바로 번역을 요청하고,
+    push_segments가 켜져 있으면 번역된 문장을 {"type": "translation_segment"} 메시지로 전송합니다.
+    (스트림 도중 JSON 프레임이 섞이므로, 이를 처리하는 클라이언트만 켜야 합니다.)
+    finish()는 문장별 번역을 이어 붙여 최종 (ko, ja)를 만듭니다.
+    """
+
+    def __init__(self, ws: WebSocket, push_segments: bool = False):
+        self.ws = ws
+        self.push_segments = push_segments
+        self.segmenter = SentenceSegmenter()
+        self.tasks: list[asyncio.Task] = []
+        self.separators: list[str] = []
+
+    def feed(self, delta: str):
+        for sentence, sep in self.segmenter.feed(delta):
+            self._dispatch(sentence, sep)
+
+    def _dispatch(self, sentence: str, sep: str):
+        index = len(self.tasks)
+        self.separators.append(sep)
+        self.tasks.append(asyncio.create_task(self._translate(index, sentence)))
+
+    async def _translate(self, index: int, sentence: str) -> tuple[str, str] | None:
+        try:
+            ko, ja = await translate_to_ko_and_ja(sentence)
+        except Exception as e:
+            print(f"[STREAM-TRANSLATE] 문장 {index} 번역 실패: {e}")
+            return None
+
+        if not self.push_segments:
+            return ko, ja
+
+        try:
+            await self.ws.send_json({
+                "type": "translation_segment",
+                "index": index,
+                "text": sentence,
+                "translated": ko,
+                "ja_translated": ja
+            })
+        except Exception:
+            pass
+        return ko, ja
+
+    async def finish(self) -> tuple[str, str] | None:
+        """
+        남은 텍스트까지 번역한 뒤 전체 번역을 조립합니다.
+        하나라도 실패한 문장이 있으면 None을 반환해 호출 측이 전체 번역으로 대체하도록 합니다.
+        """
+        rest = self.segmenter.flush()
+        if rest:
+            self._dispatch(rest, "")
+
+        if not self.tasks:
+            return None
+
+        results = await asyncio.gather(*self.tasks)
+        if any(r is None for r in results):
+            return None
+
+        ko_parts, ja_parts = [], []
+        for (ko, ja), sep in zip(results, self.separators):
+            ko_parts.append(ko + sep)
+            # 일본어는 문장 사이에 공백을 두지 않고, 줄바꿈만 유지합니다.
+            ja_parts.append(ja + ("\n" * sep.count("\n")))
+        return "".join(ko_parts).strip(), "".join(ja_parts).strip()
+
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
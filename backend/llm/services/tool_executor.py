@@ -1,9 +1,23 @@
 # backend/llm/services/tool_executor.py
 
+import os
 import re
 import ast
+import time
+import asyncio
+from collections import OrderedDict, deque
 from urllib.parse import quote
-import httpx
+
+from backend.utils.http_clients import get_http_client
+
+# 한 턴에서 모든 도구 호출이 끝나야 하는 시간 (초과한 도구는 결과 없이 진행)
+TOOL_DEADLINE = float(os.getenv("LLM_TOOL_DEADLINE", 2.0))
+# 도구별 결과 캐시 유지 시간 (초)
+TOOL_TTLS = {
+    "weather": float(os.getenv("LLM_TOOL_TTL_WEATHER", 600)),
+    "search": float(os.getenv("LLM_TOOL_TTL_SEARCH", 6 * 3600)),
+}
+TOOL_CACHE_SIZE = int(os.getenv("LLM_TOOL_CACHE_SIZE", 1024))
 
 def is_safe_math_expr(expr: str) -> bool:
     try:
@@ -27,40 +41,263 @@ def evaluate_math_expr(expr: str) -> str:
     except Exception as e:
         return f"Error: {e}"
 
+# 의도별 패턴. "arg" 그룹이 인자로 추출됩니다. (대소문자 무시)
+# requires: ("tool", mcp_tools.name) 또는 ("integration", params.integrations 항목)
+MUSIC_NOUN = r"(?:the\s+|my\s+|this\s+)?(?:music|song|track|playback|spotify)\b"
+# 자유 텍스트 인자는 구절 경계(쉼표 등)나 접속사 앞에서 끊어, 뒤에 이어지는 다른 요청을 삼키지 않게 합니다.
+ARG_END = r"(?=\s*(?:[,;!?]|\.(?:\s|$)|\b(?:and|or|but|then|also)\b)|\s*$)"
+
+INTENTS = [
+    ("spotify_play", ("integration", "spotify"), r"\bplay\s+(?P<arg>.+?)\s+(?:on|with)\s+spotify\b"),
+    ("spotify_pause", ("integration", "spotify"), r"\b(?:pause|stop)\s+" + MUSIC_NOUN),
+    ("spotify_resume", ("integration", "spotify"), r"\b(?:resume|continue|unpause)\s+" + MUSIC_NOUN),
+    ("spotify_next", ("integration", "spotify"), r"\b(?:skip|next)\s+(?:to\s+the\s+next\s+)?" + MUSIC_NOUN),
+    ("spotify_previous", ("integration", "spotify"), r"\b(?:previous|go\s+back\s+to\s+the\s+previous|back\s+to\s+the\s+previous)\s+" + MUSIC_NOUN),
+    ("spotify_volume_up", ("integration", "spotify"), r"\b(?:volume\s+up|turn\s+up\s+the\s+(?:volume|music)|increase\s+(?:the\s+)?volume)\b"),
+    ("spotify_volume_down", ("integration", "spotify"), r"\b(?:volume\s+down|turn\s+down\s+the\s+(?:volume|music)|decrease\s+(?:the\s+)?volume)\b"),
+    ("weather", ("tool", "fetch_weather"), r"\b(?:weather|forecast)\s+(?:in\s+|for\s+)?(?P<arg>[A-Za-z][A-Za-z\s]*?)" + ARG_END),
+    ("search", ("tool", "search"), r"\b(?:search(?:\s+for)?|find|look\s+up)\s+(?P<arg>.+?)" + ARG_END),
+    ("math", ("tool", "calculate"), r"(?P<arg>[(\d][\d.\s()]*(?:(?:\*\*|[-+*/^])[\d.\s()]*)+)"),
+]
+
+SPOTIFY_ACTIONS = {
+    "spotify_pause": "pause",
+    "spotify_resume": "play",
+    "spotify_next": "next",
+    "spotify_previous": "previous",
+    "spotify_volume_up": "volume_up",
+    "spotify_volume_down": "volume_down",
+}
+
+_INTENT_PATTERNS = {name: re.compile(pattern, re.IGNORECASE) for name, _, pattern in INTENTS}
+
+def _clean_math(expr: str) -> str | None:
+    cleaned = expr.strip().replace("^", "**")
+    if ' - ' in cleaned or not any(ch.isdigit() for ch in cleaned):
+        return None
+    if any(op in cleaned for op in ['+', '-', '*', '/', '**']):
+        return cleaned
+    return None
+
+class IntentRouter:
+    """
+    활성화된 도구/연동에 해당하는 의도 패턴을 도구 구성별로 한 번만 컴파일해 둡니다.
+
+    - 모든 패턴을 합친 정규식으로 먼저 한 번 훑어, 도구 의도가 없는 대부분의 메시지는 바로 끝냅니다.
+    - 일치가 있으면 의도마다 따로 검사합니다. 합친 정규식의 finditer는 겹치는 일치를 돌려주지 않아
+      "find the weather in Tokyo"처럼 한 구절에 여러 의도가 있을 때 하나만 잡히기 때문입니다.
+    """
+
+    def __init__(self, intents: list[tuple[str, tuple, str]]):
+        self.patterns = [(name, re.compile(pattern, re.IGNORECASE)) for name, _, pattern in intents]
+        alternatives = [
+            "(?:" + pattern.replace("(?P<arg>", "(?:") + ")"
+            for _, _, pattern in intents
+        ]
+        self.prefilter = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def route(self, text: str) -> dict[str, str | None]:
+        """
+        {의도 이름: 인자} 를 반환합니다. 같은 의도는 처음 일치한 것만 사용합니다.
+        """
+        found = {}
+        if not self.prefilter or not self.prefilter.search(text):
+            return found
+
+        for name, pattern in self.patterns:
+            for match in pattern.finditer(text):
+                arg = match.groupdict().get("arg")
+                if name == "math":
+                    arg = _clean_math(arg)
+                    if arg is None:
+                        continue
+                elif arg is not None:
+                    arg = arg.strip()
+                found[name] = arg
+                break
+        return found
+
+_routers: OrderedDict[tuple, IntentRouter] = OrderedDict()
+ROUTER_CACHE_SIZE = 32
+
+def get_intent_router(tool_defs: list[dict], integrations: list[str] | None = None) -> IntentRouter:
+    """
+    활성화된 도구 이름과 연동 목록이 같으면 컴파일된 라우터를 재사용합니다.
+    """
+    tools = frozenset(t["name"] for t in tool_defs if t.get("enabled"))
+    enabled = frozenset(integrations or [])
+    key = (tools, enabled)
+
+    router = _routers.get(key)
+    if router is None:
+        router = IntentRouter([
+            intent for intent in INTENTS
+            if (intent[1][0] == "tool" and intent[1][1] in tools)
+            or (intent[1][0] == "integration" and intent[1][1] in enabled)
+        ])
+        _routers[key] = router
+        if len(_routers) > ROUTER_CACHE_SIZE:
+            _routers.popitem(last=False)
+    else:
+        _routers.move_to_end(key)
+    return router
+
+def spotify_tool_call(intents: dict) -> dict | None:
+    if "spotify_play" in intents:
+        return {"integration": "spotify", "action": "play", "query": intents["spotify_play"]}
+    for name, action in SPOTIFY_ACTIONS.items():
+        if name in intents:
+            return {"integration": "spotify", "action": action}
+    return None
+
 def extract_math_expr(text: str) -> str | None:
-    matches = re.findall(r'[\(]?[0-9\.\s\+\-\*/\^()]+[\)]?', text)
-    for expr in matches:
-        cleaned = expr.strip().replace("^", "**")
-        if ' - ' in cleaned:
-            continue
-        if any(op in cleaned for op in ['+', '-', '*', '/', '**']):
+    for match in _INTENT_PATTERNS["math"].finditer(text):
+        cleaned = _clean_math(match.group("arg"))
+        if cleaned:
             return cleaned
     return None
 
 def extract_weather_expr(text: str) -> str | None:
-    match = re.search(r'\\b(?:weather|forecast)\\s+(?:in\\s+)?([A-Za-z\\s]+)', text, re.IGNORECASE)
+    match = _INTENT_PATTERNS["weather"].search(text)
     if match:
-        return match.group(1).strip()
+        return match.group("arg").strip()
     return None
 
 def extract_search_query(text: str) -> str | None:
-    match = re.search(r'\\b(?:search|find|look\\s+up)\\s+(.+)', text, re.IGNORECASE)
+    match = _INTENT_PATTERNS["search"].search(text)
     if match:
-        return match.group(1).strip()
+        return match.group("arg").strip()
     return None
 
 def extract_spotify_query(text: str) -> str | None:
-    match = re.search(r'\\bplay\\s+(.+?)\\s+(?:on|with)\\s+spotify\\b', text, re.IGNORECASE)
+    match = _INTENT_PATTERNS["spotify_play"].search(text)
     if match:
-        return match.group(1).strip()
+        return match.group("arg").strip()
     return None
 
 def extract_spotify_command(text: str) -> dict | None:
-    text = text.lower()
-    if re.search(r'\\b(pause|stop)\\b.*(music|song)?', text): return {"action": "pause"}
-    if re.search(r'\\b(resume|continue)\\b.*(music|song)?', text): return {"action": "play"}
-    if re.search(r'\\b(skip|next)\\b.*(track|song|music)?', text): return {"action": "next"}
-    if re.search(r'\\b(previous|back)\\b.*(track|song)?', text): return {"action": "previous"}
-    if re.search(r'\\b(volume\\s+up|turn\\s+up\\s+the\\s+volume|increase\\s+volume)\\b', text): return {"action": "volume_up"}
-    if re.search(r'\\b(volume\\s+down|turn\\s+down\\s+the\\s+volume|decrease\\s+volume)\\b', text): return {"action": "volume_down"}
+    for name, action in SPOTIFY_ACTIONS.items():
+        if _INTENT_PATTERNS[name].search(text):
+            return {"action": action}
     return None
+
+async def _fetch_weather(tool: dict, query: str) -> str | None:
+    url = tool["command"].replace("{{expr}}", quote(query))
+    res = await get_http_client("tools").get(url)
+    res.raise_for_status()
+    return res.text.strip() or None
+
+async def _fetch_search(tool: dict, query: str) -> str | None:
+    url = f"http://localhost:8500/mcp/api/tools/search?query={quote(query)}"
+    res = await get_http_client("internal").get(url)
+    res.raise_for_status()
+    found = res.json()
+    if "title" not in found:
+        return None
+    return f"{found['title']}: {found['summary']} ({found['link']})"
+
+# 의도 -> (mcp_tools.name, 조회 함수, 컨텍스트 문장)
+TOOL_FETCHERS = {
+    "weather": ("fetch_weather", _fetch_weather, "The weather in {query} is: {result}."),
+    "search": ("search", _fetch_search, "Here is the result for '{query}': {result}."),
+}
+
+class _ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=200)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.latencies)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1) if ordered else None
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency_ms": {"p50": pick(0.50), "p95": pick(0.95)},
+        }
+
+# (의도, 정규화된 인자) -> (만료 시각, 결과)
+_tool_cache: OrderedDict[tuple, tuple[float, str | None]] = OrderedDict()
+_tool_stats: dict[str, _ToolStats] = {}
+
+def get_tool_stats() -> dict:
+    return {
+        "cached": len(_tool_cache),
+        "deadline_s": TOOL_DEADLINE,
+        "tools": {name: stats.snapshot() for name, stats in _tool_stats.items()},
+    }
+
+async def _call_tool(intent: str, tool: dict, query: str) -> str | None:
+    stats = _tool_stats.setdefault(intent, _ToolStats())
+    stats.calls += 1
+
+    key = (intent, " ".join(query.lower().split()))
+    cached = _tool_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        _tool_cache.move_to_end(key)
+        stats.cache_hits += 1
+        return cached[1]
+
+    start = time.perf_counter()
+    try:
+        result = await TOOL_FETCHERS[intent][1](tool, query)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        stats.errors += 1
+        print(f"[TOOL] {intent} 호출 실패 ('{query}'): {e}")
+        return None
+    stats.latencies.append(time.perf_counter() - start)
+
+    _tool_cache[key] = (time.monotonic() + TOOL_TTLS.get(intent, 0), result)
+    _tool_cache.move_to_end(key)
+    while len(_tool_cache) > TOOL_CACHE_SIZE:
+        _tool_cache.popitem(last=False)
+    return result
+
+async def run_tools(intents: dict, tool_defs: list[dict], deadline: float = TOOL_DEADLINE) -> list[str]:
+    """
+    감지된 도구를 동시에 실행하고 컨텍스트에 넣을 문장 목록을 반환합니다.
+    deadline 안에 끝나지 않은 도구는 취소하고 결과 없이 진행합니다.
+    """
+    results = []
+    expr = intents.get("math")
+    if expr:
+        results.append(f"The result of '{expr}' is {evaluate_math_expr(expr)}.")
+
+    enabled = {t["name"]: t for t in tool_defs if t.get("enabled")}
+    tasks = {}
+    for intent, (tool_name, _, _) in TOOL_FETCHERS.items():
+        query = intents.get(intent)
+        if query and tool_name in enabled:
+            tasks[intent] = asyncio.create_task(_call_tool(intent, enabled[tool_name], query))
+    if not tasks:
+        return results
+
+    try:
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    except asyncio.CancelledError:
+        # 바지인 등으로 턴이 취소되면 진행 중인 도구 호출도 함께 취소
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    for intent, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            _tool_stats[intent].timeouts += 1
+            print(f"[TOOL] {intent} 시간 초과 ({deadline}s), 결과 없이 진행")
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for intent, task in tasks.items():
+        if task in pending or task.exception() or not task.result():
+            continue
+        template = TOOL_FETCHERS[intent][2]
+        results.append(template.format(query=intents[intent], result=task.result()))
+    return results
@@ -0,0 +1,108 @@
+# backend/llm/services/turn_metrics.py
+
+import os
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 모델/단계별로 보관하는 최근 샘플 수
+METRICS_WINDOW = int(os.getenv("LLM_METRICS_WINDOW", 1000))
+
+class TurnTimer:
+    """
+    한 턴의 단계별 소요 시간(ms)을 모읍니다.
+    span()으로 구간을 재거나, 다른 곳에서 잰 값(ttft 등)을 mark()로 넣습니다.
+    취소·예외로 끝까지 가지 못한 구간은 interrupted에 이름을 남깁니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.spans: dict[str, float] = {}
+        self.interrupted: set[str] = set()
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.interrupted.add(name)
+            raise
+        finally:
+            self.mark(name, (time.perf_counter() - start) * 1000)
+
+    async def timed(self, name: str, awaitable):
+        """
+        다른 작업과 겹쳐 실행되는 코루틴(도구 실행, 소스 검색 등)의 소요 시간을 잽니다.
+        """
+        with self.span(name):
+            return await awaitable
+
+    def mark(self, name: str, ms: float | None):
+        if ms is not None:
+            self.spans[name] = round(ms, 1)
+
+    def summary(self) -> dict:
+        return {**self.spans, "total": round((time.perf_counter() - self.started_at) * 1000, 1)}
+
+class _ModelMetrics:
+    def __init__(self):
+        self.turns = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.stages: dict[str, deque[float]] = {}
+        # 취소된 턴과 중간에 끊긴 구간은 따로 모아, 완료된 턴의 분포를 흐리지 않으면서도 버리지 않습니다.
+        self.cancelled_stages: dict[str, deque[float]] = {}
+
+    @staticmethod
+    def _append(stages: dict[str, deque[float]], name: str, ms: float):
+        stages.setdefault(name, deque(maxlen=METRICS_WINDOW)).append(ms)
+
+    def add(self, spans: dict, interrupted: set[str] = frozenset()):
+        for name, ms in spans.items():
+            self._append(self.cancelled_stages if name in interrupted else self.stages, name, ms)
+
+    def add_cancelled(self, spans: dict):
+        for name, ms in spans.items():
+            self._append(self.cancelled_stages, name, ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "turns": self.turns,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "stages_ms": {name: _percentiles(samples) for name, samples in self.stages.items()},
+            "cancelled_stages_ms": {name: _percentiles(samples) for name, samples in self.cancelled_stages.items()},
+        }
+
+_models: dict[str, _ModelMetrics] = {}
+
+def record_turn(model: str, timer: TurnTimer, status: str = "ok") -> dict:
+    """
+    턴 하나의 결과를 모델별 롤링 분포에 반영합니다.
+    완료된 턴의 온전한 구간은 stages_ms에, 취소된 턴과 끊긴 구간(취소된 도구 실행 등)은 cancelled_stages_ms에 들어갑니다.
+    """
+    metrics = _models.setdefault(model, _ModelMetrics())
+    summary = timer.summary()
+    if status == "ok":
+        metrics.turns += 1
+        metrics.add(summary, timer.interrupted)
+    elif status == "cancelled":
+        metrics.cancelled += 1
+        metrics.add_cancelled(summary)
+    else:
+        metrics.errors += 1
+    return summary
+
+def get_turn_metrics() -> dict:
+    return {
+        "window": METRICS_WINDOW,
+        "models": {model: metrics.snapshot() for model, metrics in _models.items()},
+    }
+
+def _percentiles(samples: deque[float]) -> dict:
+    # nearest-rank: 샘플 100개의 p50은 50번째 값입니다.
+    ordered = sorted(samples)
+    pick = lambda q: ordered[max(0, math.ceil(q * len(ordered)) - 1)] if ordered else None
+    return {"count": len(ordered), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
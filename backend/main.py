@@ -25,6 +25,13 @@ from backend.translate.routes.asr_llm_route import router as asr_llm_translate_r
 # LLM 백엔드 라이브러리
 from backend.llm.routes.chat_route import router as chat_router
 from backend.llm.routes.feedback_route import router as feedback_router
+from backend.llm.routes.config_cache_route import router as config_cache_router
+from backend.llm.routes.emotion_route import router as emotion_router
+from backend.llm.routes.memory_route import router as memory_router
+from backend.llm.routes.endpoint_route import router as endpoint_router
+from backend.llm.routes.tool_route import router as tool_router
+from backend.llm.routes.source_route import router as source_router
+from backend.llm.routes.metrics_route import router as metrics_router
 
 # TTS 백엔드 라이브러리
 from backend.tts.routes import router as tts_router
@@ -33,8 +40,37 @@ from backend.tts.routes import router as tts_router
 from backend.vrm.routes import router as vrm_router
 
 from backend.db.asr_db import save_log_to_db
-
-fastapi_app = FastAPI(title='Arielle AI Backend Server')
+from backend.db.base import close_pool
+from backend.db.source_pool import close_source_pools
+from backend.db.async_base import run_in_db, shutdown_db_executor
+from backend.db.memory_db import migrate_memory_schema
+from backend.db.log_sink import close_log_sinks
+from backend.utils.http_clients import close_http_clients
+from backend.llm.services.endpoint_pool import close_endpoint_pools
+from backend.llm.memory.summarizer import close_summarizer
+from backend.llm.retrieval.remote_fetcher import start_remote_fetcher, close_remote_fetcher
+from backend.llm.retrieval.source_index import start_source_indexing, close_source_indexing
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 대화 요약용 스키마(요약 테이블, llm_interactions.session_id)는 채팅 턴이 아니라 여기서 준비합니다.
+    await run_in_db(migrate_memory_schema)
+    # 원격 소스는 채팅 턴과 별개로 주기적으로 가져와 색인합니다.
+    start_remote_fetcher()
+    # 로컬 소스 색인도 첫 턴을 기다리지 않고 미리 만들어 둡니다.
+    start_source_indexing()
+    yield
+    await close_remote_fetcher()
+    await close_source_indexing()
+    await close_summarizer()
+    await close_endpoint_pools()
+    await close_http_clients()
+    close_log_sinks()
+    shutdown_db_executor()
+    close_pool()
+    close_source_pools()
+
+fastapi_app = FastAPI(title='Arielle AI Backend Server', lifespan=lifespan)
 
 fastapi_app.add_middleware(
     CORSMiddleware,
@@ -61,6 +97,13 @@ fastapi_app.include_router(asr_llm_translate_router, prefix='/api', tags=['Trans
 # LLM
 fastapi_app.include_router(chat_router, prefix='/llm', tags=['LLM Chat'])
 fastapi_app.include_router(feedback_router, prefix='/llm', tags=['LLM Feedback'])
+fastapi_app.include_router(config_cache_router, prefix='/llm', tags=['LLM Config Cache'])
+fastapi_app.include_router(emotion_router, prefix='/llm', tags=['LLM Emotion'])
+fastapi_app.include_router(memory_router, prefix='/llm', tags=['LLM Memory'])
+fastapi_app.include_router(endpoint_router, prefix='/llm', tags=['LLM Endpoints'])
+fastapi_app.include_router(tool_router, prefix='/llm', tags=['LLM Tools'])
+fastapi_app.include_router(source_router, prefix='/llm', tags=['LLM Sources'])
+fastapi_app.include_router(metrics_router, prefix='/llm', tags=['LLM Metrics'])
 
 # TTS
 fastapi_app.include_router(tts_router, prefix='/tts', tags='TTS')
@@ -3,9 +3,10 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.mcp_db import insert_mcp_log
+from backend.utils.source_loader import fetch_character_rows
 from urllib.parse import urlparse
-import pymysql
 
 router = APIRouter(prefix="/api")
 
@@ -43,8 +44,7 @@ def parse_mysql_uri(uri: str):
         "db": parsed.path.lstrip('/'),
     }
 
-@router.post("/local-sources", response_model=LocalSourceOut)
-async def create_local_source(source: LocalSourceIn):
+def _create_local_source(source: LocalSourceIn):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -58,8 +58,11 @@ async def create_local_source(source: LocalSourceIn):
     finally:
         conn.close()
 
-@router.post("/remote-sources", response_model=RemoteSourceOut)
-async def create_remote_source(source: RemoteSourceIn):
+@router.post("/local-sources", response_model=LocalSourceOut)
+async def create_local_source(source: LocalSourceIn):
+    return await run_in_db(_create_local_source, source)
+
+def _create_remote_source(source: RemoteSourceIn):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -73,8 +76,11 @@ async def create_remote_source(source: RemoteSourceIn):
     finally:
         conn.close()
 
-@router.get("/local-sources", response_model=List[LocalSourceOut])
-async def get_local_sources():
+@router.post("/remote-sources", response_model=RemoteSourceOut)
+async def create_remote_source(source: RemoteSourceIn):
+    return await run_in_db(_create_remote_source, source)
+
+def _get_local_sources():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -84,8 +90,11 @@ async def get_local_sources():
     finally:
         conn.close()
 
-@router.get("/remote-sources", response_model=List[RemoteSourceOut])
-async def get_remote_sources():
+@router.get("/local-sources", response_model=List[LocalSourceOut])
+async def get_local_sources():
+    return await run_in_db(_get_local_sources)
+
+def _get_remote_sources():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -95,8 +104,11 @@ async def get_remote_sources():
     finally:
         conn.close()
 
-@router.patch("/local-sources/{source_id}", response_model=LocalSourceOut)
-async def update_local_source(source_id: int, source: LocalSourceIn):
+@router.get("/remote-sources", response_model=List[RemoteSourceOut])
+async def get_remote_sources():
+    return await run_in_db(_get_remote_sources)
+
+def _update_local_source(source_id: int, source: LocalSourceIn):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -111,8 +123,11 @@ async def update_local_source(source_id: int, source: LocalSourceIn):
     finally:
         conn.close()
 
-@router.patch("/remote-sources/{source_id}", response_model=RemoteSourceOut)
-async def update_remote_source(source_id: int, source: RemoteSourceIn):
+@router.patch("/local-sources/{source_id}", response_model=LocalSourceOut)
+async def update_local_source(source_id: int, source: LocalSourceIn):
+    return await run_in_db(_update_local_source, source_id, source)
+
+def _update_remote_source(source_id: int, source: RemoteSourceIn):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -127,8 +142,11 @@ async def update_remote_source(source_id: int, source: RemoteSourceIn):
     finally:
         conn.close()
 
-@router.delete("/local-sources/{source_id}")
-async def delete_local_source(source_id: int):
+@router.patch("/remote-sources/{source_id}", response_model=RemoteSourceOut)
+async def update_remote_source(source_id: int, source: RemoteSourceIn):
+    return await run_in_db(_update_remote_source, source_id, source)
+
+def _delete_local_source(source_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -139,8 +157,11 @@ async def delete_local_source(source_id: int):
     finally:
         conn.close()
 
-@router.delete("/remote-sources/{source_id}")
-async def delete_remote_source(source_id: int):
+@router.delete("/local-sources/{source_id}")
+async def delete_local_source(source_id: int):
+    return await run_in_db(_delete_local_source, source_id)
+
+def _delete_remote_source(source_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -151,8 +172,11 @@ async def delete_remote_source(source_id: int):
     finally:
         conn.close()
 
-@router.get("/local-sources/{source_id}/preview")
-async def preview_local_source(source_id: int):
+@router.delete("/remote-sources/{source_id}")
+async def delete_remote_source(source_id: int):
+    return await run_in_db(_delete_remote_source, source_id)
+
+def _get_database_source(source_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -162,26 +186,17 @@ async def preview_local_source(source_id: int):
                 raise HTTPException(status_code=404, detail="Database source not found.")
 
             columns = [col[0] for col in cursor.description]
-            source_dict = dict(zip(columns, source))
-
-            db_config = {
-                "host": source_dict["host"],
-                "port": int(source_dict["port"]),
-                "user": source_dict["username"],
-                "password": source_dict["password"],
-                "database": source_dict["path"].split("/")[-1],
-                "charset": "utf8mb4",
-                "cursorclass": pymysql.cursors.DictCursor
-            }
-
-        preview_conn = pymysql.connect(**db_config)
-        with preview_conn.cursor() as preview_cursor:
-            preview_cursor.execute("SELECT name, race, role, personality, backstory FROM characters LIMIT 5")
-            rows = preview_cursor.fetchall()
+            return dict(zip(columns, source))
+    finally:
+        conn.close()
 
-        return {"preview": rows}
+@router.get("/local-sources/{source_id}/preview")
+async def preview_local_source(source_id: int):
+    source_dict = await run_in_db(_get_database_source, source_id)
 
+    try:
+        # 소스별 커넥션 풀 사용 (매 요청마다 새로 접속하지 않음)
+        rows = await run_in_db(fetch_character_rows, source_dict, 5)
+        return {"preview": rows}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        conn.close()
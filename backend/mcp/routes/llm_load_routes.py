@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Path
 from pydantic import BaseModel
-import httpx
 import time
+from backend.utils.http_clients import get_http_client
+from backend.llm.services.endpoint_pool import fetch_loaded_models
 
 router = APIRouter(prefix="/llm/model")
 
@@ -27,9 +28,9 @@ async def test_model_response(alias: str = Path(...)):
 
         start = time.perf_counter()
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
+        client = get_http_client("llm_admin")
+        response = await client.post(url, json=payload, headers=headers)
+        response.raise_for_status()
 
         end = time.perf_counter()
         result = (response.json().get("choices", [{}])[0].get("message", {}).get("content") or "").strip()
@@ -45,12 +46,7 @@ async def test_model_response(alias: str = Path(...)):
 @router.get("/{alias}/check")
 async def check_model_loaded(alias: str = Path(...)):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://172.27.112.1:8080/v1/models")
-            response.raise_for_status()
-
-        models = response.json().get("data", [])
-        model_ids = [m["id"] for m in models]
+        model_ids = await fetch_loaded_models("http://172.27.112.1:8080")
 
         return {"loaded": alias in model_ids}
 
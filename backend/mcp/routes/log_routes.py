@@ -1,11 +1,11 @@
 # backend/mcp/routes/log_routes.py
 from fastapi import APIRouter
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 
 router = APIRouter(prefix="/api")
 
-@router.get("/logs")
-async def get_mcp_logs():
+def _get_mcp_logs():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -27,3 +27,7 @@ async def get_mcp_logs():
             ]
     finally:
         conn.close()
+
+@router.get("/logs")
+async def get_mcp_logs():
+    return await run_in_db(_get_mcp_logs)
@@ -5,6 +5,7 @@ from datetime import datetime
 import json
 
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.mcp_db import insert_mcp_log
 
 router = APIRouter(prefix="/api")
@@ -16,8 +17,7 @@ class MemoryContextSettings(BaseModel):
     save_memory: bool
     context_prompts: list
 
-@router.get("/memory/settings")
-async def get_memory_settings():
+def _get_memory_settings():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -42,8 +42,11 @@ async def get_memory_settings():
     finally:
         conn.close()
 
-@router.post("/memory/settings")
-async def save_memory_settings(settings: MemoryContextSettings):
+@router.get("/memory/settings")
+async def get_memory_settings():
+    return await run_in_db(_get_memory_settings)
+
+def _save_memory_settings(settings: MemoryContextSettings):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -65,8 +68,11 @@ async def save_memory_settings(settings: MemoryContextSettings):
     finally:
         conn.close()
 
-@router.patch("/memory/settings")
-async def update_memory_settings(settings: MemoryContextSettings):
+@router.post("/memory/settings")
+async def save_memory_settings(settings: MemoryContextSettings):
+    return await run_in_db(_save_memory_settings, settings)
+
+def _update_memory_settings(settings: MemoryContextSettings):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -86,4 +92,8 @@ async def update_memory_settings(settings: MemoryContextSettings):
 
             return {"message": "Settings updated successfully"}
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+@router.patch("/memory/settings")
+async def update_memory_settings(settings: MemoryContextSettings):
+    return await run_in_db(_update_memory_settings, settings)
\ No newline at end of file
@@ -3,14 +3,14 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 
 router = APIRouter(prefix="/llm/model")
 
 class PromptLink(BaseModel):
     prompt_ids: List[int]
 
-@router.get("/{model_id}/prompts")
-async def get_model_prompts(model_id: int):
+def _get_model_prompts(model_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -20,8 +20,11 @@ async def get_model_prompts(model_id: int):
     finally:
         conn.close()
 
-@router.patch("/{model_id}/prompts")
-async def update_model_prompts(model_id: int, payload: PromptLink):
+@router.get("/{model_id}/prompts")
+async def get_model_prompts(model_id: int):
+    return await run_in_db(_get_model_prompts, model_id)
+
+def _update_model_prompts(model_id: int, payload: PromptLink):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -35,3 +38,7 @@ async def update_model_prompts(model_id: int, payload: PromptLink):
         return {"message": "Model prompts updated"}
     finally:
         conn.close()
+
+@router.patch("/{model_id}/prompts")
+async def update_model_prompts(model_id: int, payload: PromptLink):
+    return await run_in_db(_update_model_prompts, model_id, payload)
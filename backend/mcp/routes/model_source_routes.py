@@ -4,7 +4,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.llm_db import update_llm_model_params
+from backend.llm.services.config_cache import publish_invalidation
 
 class SourceItem(BaseModel):
     source_id: int
@@ -15,8 +17,7 @@ class SourceIdsIn(BaseModel):
 
 router = APIRouter(prefix="/llm/model")
 
-@router.get("/{model_id}/sources")
-async def get_model_sources(model_id: int):
+def _get_model_sources(model_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -28,12 +29,11 @@ async def get_model_sources(model_id: int):
     finally:
         conn.close()
 
-@router.patch("/{model_id}/sources")
-async def update_model_sources(
-    model_id: int,
-    payload: SourceIdsIn,
-    source_type: str
-):
+@router.get("/{model_id}/sources")
+async def get_model_sources(model_id: int):
+    return await run_in_db(_get_model_sources, model_id)
+
+def _update_model_sources(model_id: int, payload: SourceIdsIn, source_type: str):
     conn = get_connection()
     try:
         source_ids = [s.source_id for s in payload.sources]
@@ -65,15 +65,26 @@ async def update_model_sources(
                 "UPDATE llm_models SET params = %s WHERE id = %s",
                 (json.dumps(params), model_id)
             )
+            conn.commit()
 
         return {"message": "Model sources updated successfully"}
     finally:
         conn.close()
 
+@router.patch("/{model_id}/sources")
+async def update_model_sources(
+    model_id: int,
+    payload: SourceIdsIn,
+    source_type: str
+):
+    result = await run_in_db(_update_model_sources, model_id, payload, source_type)
+    # 다른 프로세스 알림은 이벤트 루프에서 예약해야 하므로 DB 스레드 밖에서 호출합니다.
+    publish_invalidation("models", [model_id])
+    return result
 
 
-@router.delete("/{model_id}/sources/{source_id}")
-async def delete_model_source(model_id: int, source_id: int):
+
+def _delete_model_source(model_id: int, source_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -83,4 +94,8 @@ async def delete_model_source(model_id: int, source_id: int):
         conn.commit()
         return {"message": "Model source deleted successfully"}
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+@router.delete("/{model_id}/sources/{source_id}")
+async def delete_model_source(model_id: int, source_id: int):
+    return await run_in_db(_delete_model_source, model_id, source_id)
\ No newline at end of file
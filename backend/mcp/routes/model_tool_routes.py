@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 
 router = APIRouter(prefix="/llm/model")
 
@@ -14,8 +15,7 @@ class LinkedToolOut(BaseModel):
     tool_id: int
     created_at: str
 
-@router.get("/{model_id}/tools", response_model=List[LinkedToolOut])
-async def get_model_tools(model_id: int):
+def _get_model_tools(model_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -32,8 +32,11 @@ async def get_model_tools(model_id: int):
     finally:
         conn.close()
 
-@router.patch("/{model_id}/tools")
-async def update_model_tools(model_id: int, payload: ToolLink):
+@router.get("/{model_id}/tools", response_model=List[LinkedToolOut])
+async def get_model_tools(model_id: int):
+    return await run_in_db(_get_model_tools, model_id)
+
+def _update_model_tools(model_id: int, payload: ToolLink):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -47,3 +50,7 @@ async def update_model_tools(model_id: int, payload: ToolLink):
         return {"message": "Model tools updated"}
     finally:
         conn.close()
+
+@router.patch("/{model_id}/tools")
+async def update_model_tools(model_id: int, payload: ToolLink):
+    return await run_in_db(_update_model_tools, model_id, payload)
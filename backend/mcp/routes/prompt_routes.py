@@ -3,7 +3,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.mcp_db import insert_mcp_log
+from backend.llm.services.config_cache import publish_invalidation
 import json
 
 router = APIRouter(prefix="/api")
@@ -23,8 +25,7 @@ class PromptOut(PromptIn):
     id: int
     full: str
 
-@router.get("/prompts", response_model=List[PromptOut])
-async def get_prompts():
+def _get_prompts():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -43,8 +44,11 @@ async def get_prompts():
     finally:
         conn.close()
 
-@router.post("/prompts", response_model=PromptOut)
-async def create_prompt(prompt: PromptIn):
+@router.get("/prompts", response_model=List[PromptOut])
+async def get_prompts():
+    return await run_in_db(_get_prompts)
+
+def _create_prompt(prompt: PromptIn):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -66,8 +70,13 @@ async def create_prompt(prompt: PromptIn):
     finally:
         conn.close()
 
-@router.patch("/prompts/{prompt_id}", response_model=PromptOut)
-async def update_prompt_in_db(prompt_id: int, prompt: PromptIn):
+@router.post("/prompts", response_model=PromptOut)
+async def create_prompt(prompt: PromptIn):
+    created = await run_in_db(_create_prompt, prompt)
+    publish_invalidation("prompts")
+    return created
+
+def _update_prompt_in_db(prompt_id: int, prompt: PromptIn):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -142,8 +151,13 @@ async def update_prompt_in_db(prompt_id: int, prompt: PromptIn):
     finally:
         conn.close()
 
-@router.delete("/prompts/{prompt_id}", status_code=204)
-async def delete_prompt(prompt_id: int):
+@router.patch("/prompts/{prompt_id}", response_model=PromptOut)
+async def update_prompt_in_db(prompt_id: int, prompt: PromptIn):
+    updated = await run_in_db(_update_prompt_in_db, prompt_id, prompt)
+    publish_invalidation("prompts")
+    return updated
+
+def _delete_prompt(prompt_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -156,4 +170,9 @@ async def delete_prompt(prompt_id: int):
                 raise HTTPException(status_code=404, detail="Prompt not found")
     finally:
         conn.close()
-    return
\ No newline at end of file
+    return
+
+@router.delete("/prompts/{prompt_id}", status_code=204)
+async def delete_prompt(prompt_id: int):
+    await run_in_db(_delete_prompt, prompt_id)
+    publish_invalidation("prompts")
\ No newline at end of file
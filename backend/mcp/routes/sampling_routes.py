@@ -3,6 +3,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.mcp_db import insert_mcp_log
 
 router = APIRouter(prefix="/api")
@@ -13,8 +14,7 @@ class SamplingSettings(BaseModel):
     top_p: float
     repetition_penalty: float
 
-@router.get("/sampling/settings")
-async def get_sampling_settings():
+def _get_sampling_settings():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -32,8 +32,11 @@ async def get_sampling_settings():
     finally:
         conn.close()
 
-@router.post("/sampling/settings")
-async def save_sampling_settings(settings: SamplingSettings):
+@router.get("/sampling/settings")
+async def get_sampling_settings():
+    return await run_in_db(_get_sampling_settings)
+
+def _save_sampling_settings(settings: SamplingSettings):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -53,8 +56,11 @@ async def save_sampling_settings(settings: SamplingSettings):
     finally:
         conn.close()
 
-@router.patch("/sampling/settings")
-async def update_sampling_settings(settings: SamplingSettings):
+@router.post("/sampling/settings")
+async def save_sampling_settings(settings: SamplingSettings):
+    return await run_in_db(_save_sampling_settings, settings)
+
+def _update_sampling_settings(settings: SamplingSettings):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -72,4 +78,8 @@ async def update_sampling_settings(settings: SamplingSettings):
             )
             return {"message": "Sampling settings updated"}
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+@router.patch("/sampling/settings")
+async def update_sampling_settings(settings: SamplingSettings):
+    return await run_in_db(_update_sampling_settings, settings)
\ No newline at end of file
@@ -2,6 +2,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.mcp_db import insert_mcp_log
 import json
 
@@ -14,8 +15,7 @@ class SecuritySettings(BaseModel):
     use_jwt: bool
     disable_auth: bool
 
-@router.get("/security/settings")
-async def get_security_settings():
+def _get_security_settings():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -34,8 +34,11 @@ async def get_security_settings():
     finally:
         conn.close()
 
-@router.post("/security/settings")
-async def save_security_settings(settings: SecuritySettings):
+@router.get("/security/settings")
+async def get_security_settings():
+    return await run_in_db(_get_security_settings)
+
+def _save_security_settings(settings: SecuritySettings):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -61,8 +64,11 @@ async def save_security_settings(settings: SecuritySettings):
     finally:
         conn.close()
 
-@router.patch("/security/settings")
-async def update_security_settings(settings: SecuritySettings):
+@router.post("/security/settings")
+async def save_security_settings(settings: SecuritySettings):
+    return await run_in_db(_save_security_settings, settings)
+
+def _update_security_settings(settings: SecuritySettings):
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -91,3 +97,7 @@ async def update_security_settings(settings: SecuritySettings):
             return {"message": "Security settings updated"}
     finally:
         conn.close()
+
+@router.patch("/security/settings")
+async def update_security_settings(settings: SecuritySettings):
+    return await run_in_db(_update_security_settings, settings)
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field, HttpUrl
 from typing import List
-import time, httpx
+import time
 
 from backend.db.mcp_db import (
     list_mcp_servers,
@@ -12,6 +12,9 @@ from backend.db.mcp_db import (
     delete_mcp_server,
     insert_mcp_log
 )
+from backend.db.base import get_pool_stats
+from backend.db.log_sink import get_log_sink_stats
+from backend.utils.http_clients import get_http_client, get_http_client_stats
 
 router = APIRouter()
 
@@ -76,8 +79,7 @@ async def api_server_status(alias: str):
     
     start = time.monotonic()
     try:
-        async with httpx.AsyncClient(timeout=5) as cli:
-            await cli.get(f"{srv['endpoint'].rstrip('/')}/healthz")
+        await get_http_client("internal").get(f"{srv['endpoint'].rstrip('/')}/healthz", timeout=5)
         status = "active"
     except Exception:
         status = "inactive"
@@ -97,3 +99,15 @@ async def health_check():
         return {"status": "ok", "message": "Server is healthy"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+
+@router.get("/db/pool")
+async def db_pool_stats():
+    return get_pool_stats()
+
+@router.get("/db/log-sink")
+async def db_log_sink_stats():
+    return get_log_sink_stats()
+
+@router.get("/http/clients")
+async def http_client_stats():
+    return get_http_client_stats()
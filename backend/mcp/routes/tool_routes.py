@@ -1,11 +1,13 @@
 # backend/mcp/routes/tool_routes.py
 import os
 from fastapi import APIRouter, HTTPException, Query
-import httpx
 from pydantic import BaseModel
 from typing import List
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 from backend.db.mcp_db import insert_mcp_log
+from backend.llm.services.config_cache import publish_invalidation
+from backend.utils.http_clients import get_http_client
 
 import subprocess
 import shlex
@@ -27,8 +29,7 @@ class ToolOut(ToolIn):
 
 # ──────── CRUD Endpoints ────────
 
-@router.get("/tools", response_model=List[ToolOut])
-async def get_tools():
+def _get_tools():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -45,8 +46,11 @@ async def get_tools():
     finally:
         conn.close()
 
-@router.post("/tools", response_model=ToolOut)
-async def create_tool(tool: ToolIn):
+@router.get("/tools", response_model=List[ToolOut])
+async def get_tools():
+    return await run_in_db(_get_tools)
+
+def _create_tool(tool: ToolIn):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
@@ -61,8 +65,13 @@ async def create_tool(tool: ToolIn):
     finally:
         conn.close()
 
-@router.patch("/tools/{tool_id}", response_model=ToolOut)
-async def update_tool(tool_id: int, tool: ToolIn):
+@router.post("/tools", response_model=ToolOut)
+async def create_tool(tool: ToolIn):
+    created = await run_in_db(_create_tool, tool)
+    publish_invalidation("tools")
+    return created
+
+def _update_tool(tool_id: int, tool: ToolIn):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
@@ -80,8 +89,13 @@ async def update_tool(tool_id: int, tool: ToolIn):
     finally:
         conn.close()
 
-@router.delete("/tools/{tool_id}", status_code=204)
-async def delete_tool(tool_id: int):
+@router.patch("/tools/{tool_id}", response_model=ToolOut)
+async def update_tool(tool_id: int, tool: ToolIn):
+    updated = await run_in_db(_update_tool, tool_id, tool)
+    publish_invalidation("tools")
+    return updated
+
+def _delete_tool(tool_id: int):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
@@ -94,6 +108,11 @@ async def delete_tool(tool_id: int):
     finally:
         conn.close()
 
+@router.delete("/tools/{tool_id}", status_code=204)
+async def delete_tool(tool_id: int):
+    await run_in_db(_delete_tool, tool_id)
+    publish_invalidation("tools")
+
 # ──────── Tools ────────
 @router.get("/tools/python")
 async def execute_python_script(command: str = Query(..., description="Python command to execute")):
@@ -142,9 +161,8 @@ async def search_google(query: str = Query(..., description="검색어")):
         "q": query
     }
 
-    async with httpx.AsyncClient() as client:
-        res = await client.get(url, params=params)
-        data = res.json()
+    res = await get_http_client("tools").get(url, params=params)
+    data = res.json()
 
     if "items" not in data or len(data["items"]) == 0:
         return {"error": "검색 결과 없음 또는 API 오류", "raw": data}
@@ -1,6 +1,12 @@
 # backend/mcp/server.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+from backend.db.base import close_pool
+from backend.db.source_pool import close_source_pools
+from backend.db.async_base import shutdown_db_executor
+from backend.db.log_sink import close_log_sinks
+from backend.utils.http_clients import close_http_clients
 from backend.mcp.routes.servers import router as servers_router
 from backend.mcp.routes.llm_routes import router as llm_router
 
@@ -22,7 +28,16 @@ from backend.mcp.routes.llm_load_routes import router as llm_load_router
 
 from backend.mcp.routes.integrations.spotify_routes import router as spotify_router
 
-app = FastAPI(title="Arielle MCP Control Server")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_http_clients()
+    close_log_sinks()
+    shutdown_db_executor()
+    close_pool()
+    close_source_pools()
+
+app = FastAPI(title="Arielle MCP Control Server", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
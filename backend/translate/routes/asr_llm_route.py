@@ -2,11 +2,11 @@
 
 from fastapi import APIRouter
 from backend.db.base import get_connection
+from backend.db.async_base import run_in_db
 
 router = APIRouter()
 
-@router.get("/asr/latest")
-async def get_latest_asr():
+def _get_latest_asr():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -16,8 +16,11 @@ async def get_latest_asr():
     finally:
         conn.close()
 
-@router.get("/llm/latest")
-async def get_latest_llm():
+@router.get("/asr/latest")
+async def get_latest_asr():
+    return await run_in_db(_get_latest_asr)
+
+def _get_latest_llm():
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
@@ -25,4 +28,8 @@ async def get_latest_llm():
             row = cursor.fetchone()
             return {"text": row[0] if row else ""}
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+@router.get("/llm/latest")
+async def get_latest_llm():
+    return await run_in_db(_get_latest_llm)
\ No newline at end of file
@@ -0,0 +1,241 @@
+# backend/translate/services/translation_service.py
+
+import os
+import time
+import uuid
+import asyncio
+import unicodedata
+from collections import OrderedDict
+from backend.utils.http_clients import get_http_client
+
+TRANSLATION_BATCH_WINDOW_MS = float(os.getenv("TRANSLATION_BATCH_WINDOW_MS", 5))
+TRANSLATION_BATCH_MAX_ITEMS = int(os.getenv("TRANSLATION_BATCH_MAX_ITEMS", 100))
+TRANSLATION_BATCH_MAX_CHARS = int(os.getenv("TRANSLATION_BATCH_MAX_CHARS", 10000))
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", 2048))
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", 3600))
+
+class TranslatorConfigError(RuntimeError):
+    pass
+
+class AzureTranslatorBackend:
+    """
+    Azure Translator v3 호출. 여러 텍스트와 여러 대상 언어를 한 번의 요청으로 번역합니다.
+    """
+
+    def __init__(self):
+        self.endpoint = os.getenv("AZURE_TRANSLATOR_ENDPOINT")
+        self.key = os.getenv("AZURE_TRANSLATOR_KEY")
+        self.region = os.getenv("AZURE_TRANSLATOR_REGION")
+
+    async def translate_batch(self, texts: list[str], from_lang: str, to_langs: list[str]) -> list[dict[str, str]]:
+        if not self.endpoint or not self.key or not self.region:
+            raise TranslatorConfigError("Azure Translator API 설정이 누락되었습니다.")
+
+        headers = {
+            'Ocp-Apim-Subscription-Key': self.key,
+            'Ocp-Apim-Subscription-Region': self.region,
+            'Content-type': 'application/json',
+            'X-ClientTraceId': str(uuid.uuid4()),
+        }
+        params = {
+            'api-version': '3.0',
+            'from': from_lang,
+            'to': to_langs,
+        }
+        body = [{'text': text} for text in texts]
+
+        client = get_http_client("translator")
+        res = await client.post(f'{self.endpoint}/translate', params=params, headers=headers, json=body)
+        res.raise_for_status()
+        result = res.json()
+
+        if not isinstance(result, list) or len(result) != len(texts):
+            raise ValueError(f"Unexpected Azure response: {result}")
+
+        return [
+            {t['to']: t['text'] for t in item['translations']}
+            for item in result
+        ]
+
+class FakeTranslatorBackend:
+    """
+    Azure 없이 동작을 확인하기 위한 대역. "[ko] 원문" 형태로 돌려주고 호출 기록을 남깁니다.
+    TRANSLATOR_BACKEND=fake 로 선택할 수 있습니다.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[tuple[list[str], str, list[str]]] = []
+
+    async def translate_batch(self, texts: list[str], from_lang: str, to_langs: list[str]) -> list[dict[str, str]]:
+        self.calls.append((list(texts), from_lang, list(to_langs)))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [{lang: f"[{lang}] {text}" for lang in to_langs} for text in texts]
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text.strip())
+
+class TranslationService:
+    """
+    번역 요청을 모아 보내는 공용 서비스.
+
+    - (정규화된 텍스트, 원본 언어, 대상 언어) 키의 LRU + TTL 캐시
+    - 짧은 시간창(TRANSLATION_BATCH_WINDOW_MS) 동안 들어온 요청을
+      (원본 언어, 대상 언어 목록)별로 묶어 한 번의 API 호출로 처리
+    """
+
+    def __init__(
+        self,
+        backend,
+        window_ms: float = TRANSLATION_BATCH_WINDOW_MS,
+        max_items: int = TRANSLATION_BATCH_MAX_ITEMS,
+        max_chars: int = TRANSLATION_BATCH_MAX_CHARS,
+        cache_size: int = TRANSLATION_CACHE_SIZE,
+        cache_ttl: float = TRANSLATION_CACHE_TTL
+    ):
+        self.backend = backend
+        self.window = window_ms / 1000
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        self._cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._pending: dict[tuple, dict[str, asyncio.Future]] = {}
+        self._pending_chars: dict[tuple, int] = {}
+        self._timers: dict[tuple, asyncio.TimerHandle] = {}
+        self._flush_tasks: set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    def _cache_get(self, key: tuple) -> str | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: tuple, value: str):
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def translate_many(self, texts: list[str], from_lang: str, to_langs: list[str]) -> list[dict[str, str]]:
+        results = [{} for _ in texts]
+        waiting = []
+
+        for idx, text in enumerate(texts):
+            norm = normalize_text(text)
+            if not norm:
+                results[idx] = {lang: "" for lang in to_langs}
+                continue
+
+            missing = []
+            for lang in to_langs:
+                cached = self._cache_get((norm, from_lang, lang))
+                if cached is None:
+                    missing.append(lang)
+                else:
+                    results[idx][lang] = cached
+
+            if missing:
+                self.misses += 1
+                waiting.append((idx, missing, self._enqueue(norm, from_lang, tuple(missing))))
+            else:
+                self.hits += 1
+
+        for idx, missing, future in waiting:
+            # 같은 텍스트를 기다리는 다른 호출과 future를 공유하므로, 이 호출이 취소되어도 future는 취소하지 않습니다.
+            translated = await asyncio.shield(future)
+            for lang in missing:
+                results[idx][lang] = translated[lang]
+
+        return results
+
+    async def translate(self, text: str, from_lang: str, to_lang: str) -> str:
+        return (await self.translate_many([text], from_lang, [to_lang]))[0][to_lang]
+
+    def _enqueue(self, text: str, from_lang: str, to_langs: tuple[str, ...]) -> asyncio.Future:
+        group = (from_lang, to_langs)
+        pending = self._pending.setdefault(group, {})
+
+        # 같은 창 안의 동일 텍스트는 한 번만 요청
+        future = pending.get(text)
+        if future is not None:
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        pending[text] = future
+        self._pending_chars[group] = self._pending_chars.get(group, 0) + len(text)
+
+        if len(pending) >= self.max_items or self._pending_chars[group] >= self.max_chars:
+            self._schedule_flush(group)
+        elif group not in self._timers:
+            self._timers[group] = asyncio.get_running_loop().call_later(
+                self.window, self._schedule_flush, group
+            )
+        return future
+
+    def _schedule_flush(self, group: tuple):
+        timer = self._timers.pop(group, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(group, None)
+        self._pending_chars.pop(group, None)
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush(group, batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, group: tuple, batch: dict[str, asyncio.Future]):
+        from_lang, to_langs = group
+        batch = {text: future for text, future in batch.items() if not future.done()}
+        if not batch:
+            return
+        texts = list(batch.keys())
+        self.batches += 1
+        self.batched_texts += len(texts)
+
+        try:
+            translated = await self.backend.translate_batch(texts, from_lang, list(to_langs))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for text, item in zip(texts, translated):
+            for lang in to_langs:
+                self._cache_put((text, from_lang, lang), item.get(lang, ""))
+            future = batch[text]
+            if not future.done():
+                future.set_result(item)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cache_entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "batches": self.batches,
+            "batched_texts": self.batched_texts,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else None,
+        }
+
+def _create_backend():
+    if os.getenv("TRANSLATOR_BACKEND", "azure") == "fake":
+        return FakeTranslatorBackend()
+    return AzureTranslatorBackend()
+
+translation_service = TranslationService(_create_backend())
@@ -0,0 +1,129 @@
+# backend/utils/http_clients.py
+
+import importlib.util
+import httpx
+
+# h2 패키지가 설치된 경우에만 HTTP/2를 켭니다. (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 업스트림별 연결 한도 / keep-alive / 타임아웃 설정
+UPSTREAMS = {
+    # llama.cpp 채팅 스트리밍: 토큰 생성 시간이 길 수 있으므로 read 타임아웃 없음
+    "llm": {
+        "timeout": httpx.Timeout(connect=5.0, read=None, write=10.0, pool=10.0),
+        "max_connections": 16,
+        "max_keepalive": 8,
+        "http2": False,
+    },
+    # llama.cpp 감정 분석 서버
+    "emotion": {
+        "timeout": httpx.Timeout(60.0, connect=5.0),
+        "max_connections": 8,
+        "max_keepalive": 4,
+        "http2": False,
+    },
+    # llama.cpp 상태/테스트 호출 (MCP llm_load_routes)
+    "llm_admin": {
+        "timeout": httpx.Timeout(10.0, connect=3.0),
+        "max_connections": 4,
+        "max_keepalive": 2,
+        "http2": False,
+    },
+    # llama.cpp 임베딩 서버 (소스 색인)
+    "embedding": {
+        "timeout": httpx.Timeout(60.0, connect=5.0),
+        "max_connections": 4,
+        "max_keepalive": 2,
+        "http2": False,
+    },
+    # Azure Translator
+    "translator": {
+        "timeout": httpx.Timeout(10.0, connect=3.0),
+        "max_connections": 16,
+        "max_keepalive": 8,
+        "http2": True,
+    },
+    # 외부 도구 API (날씨, 검색 등)
+    "tools": {
+        "timeout": httpx.Timeout(10.0, connect=3.0),
+        "max_connections": 16,
+        "max_keepalive": 8,
+        "http2": True,
+    },
+    # 내부 서비스 간 호출 (MCP 서버, 헬스 체크, 캐시 무효화 전달)
+    "internal": {
+        "timeout": httpx.Timeout(5.0, connect=2.0),
+        "max_connections": 16,
+        "max_keepalive": 8,
+        "http2": False,
+    },
+}
+
+class _UpstreamStats:
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.errors = 0
+
+    async def on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    async def trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event_name.endswith(".failed"):
+            self.errors += 1
+
+    def snapshot(self) -> dict:
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+            "errors": self.errors,
+        }
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_stats: dict[str, _UpstreamStats] = {}
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """
+    업스트림별로 공유되는 AsyncClient를 반환합니다. 호출 측에서 close 하지 않습니다.
+    """
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        conf = UPSTREAMS[upstream]
+        stats = _stats.setdefault(upstream, _UpstreamStats())
+        client = httpx.AsyncClient(
+            timeout=conf["timeout"],
+            limits=httpx.Limits(
+                max_connections=conf["max_connections"],
+                max_keepalive_connections=conf["max_keepalive"],
+                keepalive_expiry=30.0,
+            ),
+            http2=conf["http2"] and HTTP2_AVAILABLE,
+            event_hooks={"request": [stats.on_request]},
+        )
+        _clients[upstream] = client
+    return client
+
+async def close_http_clients():
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+def get_http_client_stats() -> dict:
+    return {
+        name: {
+            **stats.snapshot(),
+            "http2": UPSTREAMS[name]["http2"] and HTTP2_AVAILABLE,
+            "max_connections": UPSTREAMS[name]["max_connections"],
+        }
+        for name, stats in _stats.items()
+    }
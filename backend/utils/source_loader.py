@@ -1,46 +1,75 @@
 # backend/utils/source_loader.py
-import requests
-from pathlib import Path
+from pymysql.cursors import DictCursor
 from backend.db.base import get_connection
+from backend.db.source_pool import get_source_pool
 
-def load_text_from_local_sources(source_ids: list[int]) -> list[str]:
-    texts = []
+CHARACTER_FIELDS = ("name", "race", "role", "personality", "backstory")
+
+def get_local_sources(source_ids: list[int] | None = None) -> list[dict]:
+    """
+    source_ids가 없으면 로컬 소스 전체를 반환합니다. (시작 시 색인 준비 대상)
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor(DictCursor) as cursor:
+            if source_ids:
+                sql = """
+                    SELECT id, path, type, host, port, username, password
+                    FROM local_sources WHERE id IN (%s)
+                """ % ','.join(['%s'] * len(source_ids))
+                cursor.execute(sql, source_ids)
+            else:
+                cursor.execute("""
+                    SELECT id, path, type, host, port, username, password
+                    FROM local_sources
+                """)
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+def get_remote_sources(source_ids: list[int] | None = None) -> list[dict]:
+    """
+    source_ids가 없으면 활성화된 원격 소스 전체를 반환합니다. (백그라운드 수집 대상)
+    source_ids가 있어도 비활성화된 소스는 빼서, 이미 올라간 색인이 채팅 컨텍스트에 들어가지 않게 합니다.
+    """
     conn = get_connection()
     try:
-        with conn.cursor() as cursor:
-            sql = """
-                SELECT path FROM local_sources WHERE id IN (%s)
-            """ % ','.join(['%s'] * len(source_ids))
-            cursor.execute(sql, source_ids)
-            rows = cursor.fetchall()
+        with conn.cursor(DictCursor) as cursor:
+            if source_ids:
+                sql = """
+                    SELECT id, endpoint, auth, enabled, 'remote' AS type
+                    FROM remote_sources WHERE enabled = 1 AND id IN (%s)
+                """ % ','.join(['%s'] * len(source_ids))
+                cursor.execute(sql, source_ids)
+            else:
+                cursor.execute("""
+                    SELECT id, endpoint, auth, enabled, 'remote' AS type
+                    FROM remote_sources WHERE enabled = 1
+                """)
+            return cursor.fetchall()
+    finally:
+        conn.close()
 
-            for (source_id, path_str, source_type) in rows:
-                if source_type == 'folder':
-                    path = Path(path_str)
-                    if path.exists() and path.is_dir():
-                        for file in path.glob("*"):
-                            if file.suffix in [".txt", ".md", ".csv", ".json"]:
-                                try:
-                                    content = file.read_text(encoding="utf-8")
-                                    snippet = content.strip()[:1000]
-                                    texts.append(f"[{file.name}]\n{snippet}")
-                                except Exception as e:
-                                    print(f"[파일 로딩 실패] {file}: {e}")
-                elif source_type == 'database':
-                    try:
-                        res = requests.get(f"http://localhost:8000/api/local-sources/{source_id}/preview")
-                        res.raise_for_status()
-                        data = res.json()
-                        for item in data.get("preview", []):
-                            if all(k in item for k in ("name", "race", "role", "personality", "backstory")):
-                                text = (
-                                    f"{item['name']} is a {item['race']} who serves as {item['role']}. "
-                                    f"They are {item['personality']}. "
-                                    f"Background: {item['backstory']}"
-                                )
-                                texts.append(text)
-                    except Exception as e:
-                        print(f"[DB 소스 로딩 실패] source_id={source_id}: {e}")
+def fetch_character_rows(source: dict, limit: int) -> list[dict]:
+    """
+    database 타입 소스의 characters 테이블을 소스별 커넥션 풀로 조회합니다.
+    """
+    conn = get_source_pool(source).acquire()
+    try:
+        with conn.cursor(DictCursor) as cursor:
+            cursor.execute(
+                "SELECT name, race, role, personality, backstory FROM characters LIMIT %s",
+                (limit,)
+            )
+            return cursor.fetchall()
     finally:
         conn.close()
-    return texts
\ No newline at end of file
+
+def render_character(item: dict) -> str | None:
+    if not all(item.get(k) is not None for k in CHARACTER_FIELDS):
+        return None
+    return (
+        f"{item['name']} is a {item['race']} who serves as {item['role']}. "
+        f"They are {item['personality']}. "
+        f"Background: {item['backstory']}"
+    )
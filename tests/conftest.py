@@ -0,0 +1,10 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# backend.db.config는 import 시점에 DB_PORT를 읽습니다. 테스트는 실제 DB에 접속하지 않습니다.
+os.environ.setdefault("DB_PORT", "3306")
+# backend.utils.encryption도 import 시점에 키를 읽습니다. 테스트 전용 Fernet 키입니다.
+os.environ.setdefault("ENCRYPTION_KEY", "dGVzdC1vbmx5LWZlcm5ldC1rZXktMzItYnl0ZXMhISE=")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
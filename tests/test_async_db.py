@@ -0,0 +1,106 @@
+# tests/test_async_db.py
+
+import time
+import asyncio
+
+from backend.db import llm_db
+from backend.db.async_base import run_in_db
+from backend.mcp.routes import llm_routes
+
+SLOW_QUERY_S = 0.3
+TICK_S = 0.01
+
+async def _max_tick_gap(work) -> tuple[float, object]:
+    """
+    work를 실행하는 동안 TICK_S 간격 타이머가 가장 오래 늦어진 시간(초)을 잽니다.
+    """
+    gaps = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(TICK_S)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await work
+    finally:
+        done.set()
+        await tick
+    return max(gaps), result
+
+def _slow_query(value):
+    time.sleep(SLOW_QUERY_S)
+    return value
+
+def test_run_in_db_keeps_loop_responsive():
+    gap, result = asyncio.run(_max_tick_gap(run_in_db(_slow_query, 42)))
+    assert result == 42
+    assert gap < SLOW_QUERY_S / 3
+
+def test_blocking_call_stalls_loop():
+    # 비교용: 같은 쿼리를 루프에서 직접 실행하면 타이머가 쿼리 시간만큼 밀립니다.
+    async def blocking():
+        return _slow_query(42)
+
+    gap, _ = asyncio.run(_max_tick_gap(blocking()))
+    assert gap >= SLOW_QUERY_S * 0.9
+
+def test_params_routes_run_off_loop(monkeypatch):
+    monkeypatch.setattr(llm_db, "get_llm_model_params", lambda model_id: _slow_query({"memory": {"strategy": "Window"}}))
+    monkeypatch.setattr(llm_db, "merge_llm_model_params", lambda model_id, patch: _slow_query(patch))
+    monkeypatch.setattr(llm_routes, "publish_invalidation", lambda *args: None)
+
+    gap, params = asyncio.run(_max_tick_gap(llm_routes.get_model_params(1)))
+    assert params == {"memory": {"strategy": "Window"}}
+    assert gap < SLOW_QUERY_S / 3
+
+    gap, res = asyncio.run(_max_tick_gap(llm_routes.update_model_integrations(1, {"integrations": ["weather"]})))
+    assert res["model_id"] == 1
+    assert gap < SLOW_QUERY_S / 3
+
+class _SlowConnection:
+    """
+    첫 execute에서 SLOW_QUERY_S만큼 막히는 pymysql 커넥션 흉내.
+    """
+
+    description = [("id",), ("name",)]
+
+    def cursor(self, *args):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        time.sleep(SLOW_QUERY_S)
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_mcp_routes_run_off_loop(monkeypatch):
+    from backend.mcp.routes import data_routes, memory_routes, log_routes
+
+    for module in (data_routes, memory_routes, log_routes):
+        monkeypatch.setattr(module, "get_connection", _SlowConnection)
+
+    for handler in (memory_routes.get_memory_settings, data_routes.get_remote_sources, log_routes.get_mcp_logs):
+        gap, _ = asyncio.run(_max_tick_gap(handler()))
+        assert gap < SLOW_QUERY_S / 3, handler.__name__
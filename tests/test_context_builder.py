@@ -0,0 +1,41 @@
+# tests/test_context_builder.py
+
+import asyncio
+
+from backend.llm.memory import context_builder
+
+def _turns(n: int) -> list[dict]:
+    messages = []
+    for i in range(n):
+        messages.append({"role": "user", "content": f"question number {i} " + "word " * 20})
+        messages.append({"role": "assistant", "content": f"answer number {i} " + "word " * 20})
+    return messages
+
+def test_summary_is_pinned_until_history_anchor_moves(monkeypatch):
+    summaries = iter(["Summary: v1", "Summary: v2", "Summary: v3", "Summary: v4"] + ["Summary: v5"] * 20)
+
+    async def get_summary(model_id, session_id=""):
+        return next(summaries)
+
+    monkeypatch.setattr(context_builder, "get_summary", get_summary)
+    memory = {"strategy": "Hybrid", "contextTokens": 700, "maxTokens": 50}
+    state: dict = {}
+    messages = _turns(3) + [{"role": "user", "content": "latest"}]
+
+    async def build():
+        return await context_builder.build_context(1, "system", messages, memory, state=state, session_id="s")
+
+    first = asyncio.run(build())
+    assert first[1]["content"] == "Summary: v1"
+
+    # 기록 시작 지점이 그대로면, 요약이 바뀌어도 이전 턴의 접두사를 그대로 유지합니다.
+    messages[-1:] = [{"role": "user", "content": "latest"}, {"role": "assistant", "content": "ok"}, {"role": "user", "content": "next"}]
+    second = asyncio.run(build())
+    assert second[:len(first) - 1] == first[:-1]
+
+    # 예산을 넘겨 기록 시작 지점이 바뀌는 턴에는 새 요약으로 교체합니다.
+    anchor = state["history_anchor"]
+    messages[-1:] = _turns(20) + [{"role": "user", "content": "again"}]
+    third = asyncio.run(build())
+    assert state["history_anchor"] is not anchor
+    assert third[1]["content"] == "Summary: v3"
@@ -0,0 +1,48 @@
+# tests/test_emotion_classifier.py
+
+import os
+
+import pytest
+
+from backend.llm.emotion.classifier import classify_emotion
+from backend.llm.emotion.evaluation import FIELDS, load_eval_set, evaluate_local
+from backend.llm.emotion.analyzer import EMOTION_LOCAL_THRESHOLD
+from backend.llm.emotion.extractor import ALLOWED_EMOTIONS, ALLOWED_TONES, ALLOWED_BLENDSHAPES
+
+# llm_interactions 스냅샷 형식(id, text, emotion, tone, blendshape)의 평가 세트.
+# DB에서 새로 뽑은 스냅샷으로 확인하려면:
+#   python -m backend.llm.emotion.evaluation --limit 500 --out snapshot.jsonl
+#   EMOTION_EVAL_SET=snapshot.jsonl python -m pytest tests/test_emotion_classifier.py
+EVAL_SET = os.getenv("EMOTION_EVAL_SET", os.path.join(os.path.dirname(__file__), "data", "emotion_eval.jsonl"))
+
+# 라벨은 LLM 경로(프롬프트 예시 기준)를 따르므로, 어휘 단서가 약한 응답은 로컬 분류기가 맞히지 못합니다.
+# 전체 정확도는 "LLM 경로와의 일치율" 하한이고, 실제로 LLM을 건너뛰는 확신 구간은 더 높은 하한을 둡니다.
+MIN_ACCURACY = {"emotion": 0.55, "tone": 0.4, "blendshape": 0.55}
+MIN_CONFIDENT_ACCURACY = {"emotion": 0.9, "tone": 0.9, "blendshape": 0.8}
+MIN_COVERAGE = 0.05
+
+def test_eval_set_has_llm_labels():
+    allowed = {"emotion": ALLOWED_EMOTIONS, "tone": ALLOWED_TONES, "blendshape": ALLOWED_BLENDSHAPES}
+    for sample in load_eval_set(EVAL_SET):
+        for field in FIELDS:
+            assert sample[field] in allowed[field], (sample["id"], field, sample[field])
+
+def test_eval_set_accuracy():
+    report = evaluate_local(load_eval_set(EVAL_SET), EMOTION_LOCAL_THRESHOLD)
+    for field in FIELDS:
+        assert report["accuracy"][field] >= MIN_ACCURACY[field], (field, report["accuracy"])
+        assert report["confident_accuracy"][field] >= MIN_CONFIDENT_ACCURACY[field], (field, report["confident_accuracy"])
+    assert report["coverage"] >= MIN_COVERAGE
+
+@pytest.mark.parametrize("text, emotion", [
+    # 접두 매칭이었다면 hope, wonder, sad로 잘못 잡히던 문장
+    ("This is hopeless.", "melancholic"),
+    ("That is wonderful!", "joyful"),
+    ("I am not sad at all, I am happy!", "joyful"),
+])
+def test_whole_word_and_negation(text, emotion):
+    assert classify_emotion(text)["emotion"] == emotion
+
+def test_negated_cue_is_ignored():
+    assert classify_emotion("Don't worry.")["emotion"] == "neutral"
+    assert classify_emotion("I'm worried.")["emotion"] == "nervous"
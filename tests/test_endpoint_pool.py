@@ -0,0 +1,101 @@
+# tests/test_endpoint_pool.py
+
+import time
+import asyncio
+
+import pytest
+
+from backend.llm.services import endpoint_pool
+from backend.llm.services.endpoint_pool import EndpointPool, UpstreamError
+
+@pytest.fixture(autouse=True)
+def _no_prober(monkeypatch):
+    monkeypatch.setattr(endpoint_pool, "_ensure_prober", lambda: None)
+    monkeypatch.setattr(endpoint_pool, "EJECT_FAILURES", 2)
+    monkeypatch.setattr(endpoint_pool, "RECOVER_SUCCESSES", 3)
+
+async def _fail(pool: EndpointPool, exc: Exception):
+    try:
+        async with pool.acquire():
+            raise exc
+    except type(exc):
+        pass
+
+def test_client_side_errors_do_not_eject_backend():
+    pool = EndpointPool("test", ["http://a"])
+    backend = pool.backends[0]
+
+    async def main():
+        for _ in range(5):
+            await _fail(pool, RuntimeError("websocket closed"))
+        await _fail(pool, asyncio.CancelledError())
+
+    asyncio.run(main())
+    assert backend.errors == 0
+    assert backend.available
+
+def test_upstream_errors_eject_with_backoff():
+    pool = EndpointPool("test", ["http://a"])
+    backend = pool.backends[0]
+
+    async def main():
+        await _fail(pool, UpstreamError("connect failed"))
+        await _fail(pool, UpstreamError("connect failed"))
+
+    asyncio.run(main())
+    assert backend.errors == 2
+    assert not backend.available
+    first_window = backend.ejected_until - time.monotonic()
+
+    # 제외 시간이 지난 뒤 다시 실패하면 두 배로 제외됩니다.
+    backend.ejected_until = 0.0
+    asyncio.run(_fail(pool, UpstreamError("read timeout")))
+    assert backend.ejected_until - time.monotonic() > first_window * 1.5
+
+def test_probe_success_keeps_ejection_and_needs_consecutive_successes():
+    backend = endpoint_pool.Backend("http://a")
+    backend.record_failure()
+    backend.record_failure()
+    ejected_until = backend.ejected_until
+
+    backend.record_probe(True)
+    assert backend.ejected_until == ejected_until
+    assert not backend.available
+
+    backend.record_probe(False)
+    assert not backend.healthy
+    backend.record_probe(True)
+    backend.record_probe(True)
+    assert not backend.healthy
+    backend.record_probe(True)
+    assert backend.healthy
+
+    # 한 번의 요청 성공으로는 실패 기록이 지워지지 않습니다.
+    backend.record_success(0.1)
+    assert backend.consecutive_failures == 2
+    backend.record_success(0.1)
+    backend.record_success(0.1)
+    assert backend.consecutive_failures == 0
+
+def test_busy_slot_is_not_shared(monkeypatch):
+    monkeypatch.setattr(endpoint_pool, "POOL_BACKGROUND_SLOT", False)
+    pool = EndpointPool("test", ["http://a"])
+    pool.backends[0].slots = 2
+
+    with pool.session_slot("http://a", "s1") as first:
+        # s2가 s1의 슬롯을 LRU로 물려받았더라도 s1이 생성 중이면 다른 슬롯을 받습니다.
+        pool.backends[0]._slot_sessions["s2"] = first
+        with pool.session_slot("http://a", "s2") as second:
+            assert second != first
+            with pool.session_slot("http://a", "s3") as third:
+                assert third is None
+
+    with pool.session_slot("http://a", "s1") as again:
+        assert again == first
+
+def test_empty_endpoint_list_is_rejected(monkeypatch):
+    monkeypatch.setattr(endpoint_pool, "_pools", {})
+    for value in ("", " , ,", None):
+        with pytest.raises(ValueError, match="endpoint가 설정되지 않았습니다"):
+            endpoint_pool.get_endpoint_pool("model:9", value)
+    assert "model:9" not in endpoint_pool._pools
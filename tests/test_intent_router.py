@@ -0,0 +1,62 @@
+# tests/test_intent_router.py
+
+import os
+import re
+import json
+
+import pytest
+
+from backend.llm.services.tool_executor import IntentRouter, INTENTS, get_intent_router
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "intent_corpus.jsonl")
+
+with open(CORPUS, encoding="utf-8") as f:
+    SAMPLES = [json.loads(line) for line in f if line.strip()]
+
+ROUTER = IntentRouter(INTENTS)
+
+def legacy_detect(text: str) -> dict:
+    """
+    라우터 도입 전 chat_handler가 도구마다 따로 돌리던 추출기 (이중 이스케이프만 바로잡은 형태).
+    spotify 명령은 "stop"/"next"/"back"이 어디에만 있어도 잡던 패턴이라 비교에서 제외합니다.
+    """
+    found = {}
+    for expr in re.findall(r"[\(]?[0-9\.\s\+\-\*/\^()]+[\)]?", text):
+        cleaned = expr.strip().replace("^", "**")
+        if " - " in cleaned:
+            continue
+        if any(op in cleaned for op in ["+", "-", "*", "/", "**"]):
+            found["math"] = cleaned
+            break
+    match = re.search(r"\b(?:weather|forecast)\s+(?:in\s+)?([A-Za-z\s]+)", text, re.IGNORECASE)
+    if match:
+        found["weather"] = match.group(1).strip()
+    match = re.search(r"\b(?:search|find|look\s+up)\s+(.+)", text, re.IGNORECASE)
+    if match:
+        found["search"] = match.group(1).strip()
+    match = re.search(r"\bplay\s+(.+?)\s+(?:on|with)\s+spotify\b", text, re.IGNORECASE)
+    if match:
+        found["spotify_play"] = match.group(1).strip()
+    return found
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[s["text"][:40] for s in SAMPLES])
+def test_corpus_labels(sample):
+    assert ROUTER.route(sample["text"]) == sample["intents"]
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[s["text"][:40] for s in SAMPLES])
+def test_parity_with_legacy_detector(sample):
+    routed = ROUTER.route(sample["text"])
+    legacy = legacy_detect(sample["text"])
+
+    for name, legacy_arg in legacy.items():
+        assert name in routed
+        # 라우터는 같은 위치에서 시작하되 구절/접속사 경계에서 인자를 끊습니다. ("for"는 트리거에 포함)
+        assert re.sub(r"^for\s+", "", legacy_arg).startswith(routed[name])
+    for name in routed:
+        if not name.startswith("spotify_") or name == "spotify_play":
+            assert name in legacy
+
+def test_disabled_tools_are_skipped():
+    router = get_intent_router([{"name": "calculate", "enabled": True}, {"name": "search", "enabled": False}])
+    assert router.route("find the weather in Tokyo and compute 2*3") == {"math": "2*3"}
+    assert get_intent_router([]).route("find 2*3") == {}
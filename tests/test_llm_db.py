@@ -0,0 +1,54 @@
+# tests/test_llm_db.py
+
+from backend.db import llm_db, memory_db
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.lastrowid = 41
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+        if "ALTER TABLE" in sql:
+            raise RuntimeError("ALTER command denied")
+
+    def fetchone(self):
+        return (0,)
+
+class _Connection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self, *args):
+        return _Cursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_insert_survives_failed_session_column_migration(monkeypatch):
+    conn = _Connection()
+    monkeypatch.setattr(memory_db, "get_connection", lambda: conn)
+    monkeypatch.setattr(llm_db, "get_connection", lambda: conn)
+    monkeypatch.setattr(memory_db, "_interaction_column", None)
+    monkeypatch.setattr(memory_db, "_table_ready", True)
+
+    # 시작 시 마이그레이션이 실패해도 예외가 밖으로 나오지 않습니다.
+    memory_db.migrate_memory_schema()
+
+    interaction_id = llm_db.save_llm_interaction("m", "hi", "hello", "", "", "joy", "warm", "smile", "s1")
+    assert interaction_id == 41
+    insert_sql, params = conn.executed[-1]
+    assert "session_id" not in insert_sql
+    assert params[0] == "m" and "s1" not in params
+    # 채팅 저장 경로에서는 ALTER를 다시 시도하지 않습니다 (시작 시 한 번뿐).
+    llm_db.save_llm_interaction("m", "again", "ok", "", "", "joy", "warm", "smile", "s1")
+    assert sum("ALTER" in sql for sql, _ in conn.executed) == 1
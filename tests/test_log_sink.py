@@ -0,0 +1,95 @@
+# tests/test_log_sink.py
+
+import pytest
+
+from backend.db import log_sink
+from backend.db.log_sink import LogSink
+
+class _Connection:
+    def __init__(self, inserted: list, fail: bool = False):
+        self.inserted = inserted
+        self.fail = fail
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def executemany(self, sql, rows):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.inserted.extend(rows)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def inserted(monkeypatch):
+    rows = []
+    monkeypatch.setattr(log_sink, "get_connection", lambda: _Connection(rows))
+    monkeypatch.setattr(log_sink, "_sinks", [])
+    return rows
+
+def _sink(overflow: str) -> LogSink:
+    # 긴 주기로 두어, 테스트 중에는 백그라운드 flush가 끼어들지 않게 합니다.
+    return LogSink("test_logs", ("type", "message"), max_buffer=3, batch_size=100, flush_interval=60, overflow=overflow)
+
+def test_drop_oldest_keeps_newest_rows(inserted):
+    sink = _sink("drop_oldest")
+    for i in range(5):
+        sink.enqueue(("INFO", f"m{i}"))
+    assert sink.stats()["dropped"] == 2
+
+    sink.close()
+    assert [message for _, message in inserted] == ["m2", "m3", "m4"]
+
+def test_drop_newest_keeps_first_rows(inserted):
+    sink = _sink("drop_newest")
+    for i in range(5):
+        sink.enqueue(("INFO", f"m{i}"))
+
+    sink.close()
+    assert [message for _, message in inserted] == ["m0", "m1", "m2"]
+    stats = sink.stats()
+    assert (stats["flushed"], stats["dropped"], stats["pending"]) == (3, 2, 0)
+
+def test_close_flushes_pending_and_rejects_later_rows(inserted):
+    sink = _sink("drop_oldest")
+    sink.enqueue(("INFO", "before close"))
+    sink.close()
+    assert inserted == [("INFO", "before close")]
+
+    sink.enqueue(("INFO", "after close"))
+    assert inserted == [("INFO", "before close")]
+    assert sink.stats()["dropped"] == 1
+
+def test_failed_flush_requeues_rows(monkeypatch, inserted):
+    sink = _sink("drop_oldest")
+    sink.enqueue(("INFO", "m0"))
+    monkeypatch.setattr(log_sink, "get_connection", lambda: _Connection(inserted, fail=True))
+    sink.flush()
+    assert sink.stats()["pending"] == 1 and sink.stats()["failed_flushes"] == 1
+
+    monkeypatch.setattr(log_sink, "get_connection", lambda: _Connection(inserted))
+    sink.close()
+    assert inserted == [("INFO", "m0")]
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        LogSink("test_logs", ("type",), overflow="block")
+
+def test_save_log_to_db_is_quiet_by_default(monkeypatch, capsys):
+    from backend.db import asr_db
+
+    rows = []
+    monkeypatch.setattr(asr_db.asr_log_sink, "enqueue", rows.append)
+    asr_db.save_log_to_db("INFO", "transcribed", "ASR")
+    assert rows == [("INFO", "ASR", "transcribed")]
+    assert capsys.readouterr().out == ""
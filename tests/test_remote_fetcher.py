@@ -0,0 +1,75 @@
+# tests/test_remote_fetcher.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.llm.retrieval import remote_fetcher
+
+def _serve(monkeypatch, tmp_path, handler):
+    monkeypatch.setattr(remote_fetcher, "REMOTE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(remote_fetcher, "REMOTE_MAX_BYTES", 1024)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(remote_fetcher, "get_http_client", lambda name: client)
+
+def test_content_length_over_limit_skips_body(monkeypatch, tmp_path):
+    sent = []
+
+    async def body():
+        for _ in range(100):
+            sent.append(1)
+            yield b"x" * 512
+
+    _serve(monkeypatch, tmp_path, lambda request: httpx.Response(200, headers={"content-length": "51200"}, content=body()))
+    source = {"id": 501, "endpoint": "https://example.test/lore.txt"}
+
+    with pytest.raises(remote_fetcher.RemoteTooLarge):
+        asyncio.run(remote_fetcher.fetch_remote_source(source))
+    assert sent == []
+
+def test_unsized_body_stops_at_limit(monkeypatch, tmp_path):
+    sent = []
+
+    async def body():
+        for _ in range(100):
+            sent.append(1)
+            yield b"x" * 512
+
+    _serve(monkeypatch, tmp_path, lambda request: httpx.Response(200, content=body()))
+    source = {"id": 502, "endpoint": "https://example.test/stream.txt"}
+
+    with pytest.raises(remote_fetcher.RemoteTooLarge):
+        asyncio.run(remote_fetcher.fetch_remote_source(source))
+    # 1024 bytes 한도를 넘긴 세 번째 청크에서 읽기를 멈춥니다.
+    assert len(sent) == 3
+
+def test_small_body_is_indexed(monkeypatch, tmp_path):
+    _serve(monkeypatch, tmp_path, lambda request: httpx.Response(
+        200, headers={"content-type": "text/plain", "etag": '"v1"'}, content=b"The lighthouse keeper sings at night.",
+    ))
+    source = {"id": 503, "endpoint": "https://example.test/keeper.txt"}
+
+    assert asyncio.run(remote_fetcher.fetch_remote_source(source)) is True
+    assert remote_fetcher._meta[503]["etag"] == '"v1"'
+    assert remote_fetcher.get_loaded_index("remote:503") is not None
+
+def test_disabled_remote_source_is_not_searched(monkeypatch):
+    from backend.llm.services import context_manager
+
+    searched = []
+
+    async def retrieve_source_chunks(sources, query):
+        searched.extend(source["id"] for source in sources)
+        return []
+
+    rows = [
+        {"id": 601, "endpoint": "https://example.test/a", "enabled": 1, "type": "remote"},
+        {"id": 602, "endpoint": "https://example.test/b", "enabled": 0, "type": "remote"},
+    ]
+    monkeypatch.setattr(context_manager, "get_remote_sources", lambda ids: rows)
+    monkeypatch.setattr(context_manager, "ensure_remote_sources", lambda sources: None)
+    monkeypatch.setattr(context_manager, "retrieve_source_chunks", retrieve_source_chunks)
+
+    asyncio.run(context_manager.load_source_texts(None, [601, 602], "lore"))
+    assert searched == [601]
@@ -0,0 +1,66 @@
+# tests/test_source_index.py
+
+import asyncio
+
+from backend.llm.retrieval import source_index
+from backend.llm.retrieval.chunk_index import ChunkIndex
+
+def _index(key: str, docs: dict[str, str]) -> ChunkIndex:
+    index = ChunkIndex(key, key)
+    for doc_id, text in docs.items():
+        index.add_document(doc_id, [text], 1)
+    return index
+
+def test_small_source_does_not_take_all_slots():
+    # 청크가 k개 이하인 색인은 inf 점수를 돌려주므로, 원점수로 합치면 이 소스가 k개를 모두 차지합니다.
+    tiny = _index("tiny", {f"t{i}": f"dragon lore fragment {i}" for i in range(3)})
+    large = _index("large", {f"l{i}": f"dragon rider chapter {i} " + "filler " * i for i in range(50)})
+
+    texts = source_index._search([tiny, large], "dragon", 4, 10_000, None)
+    assert len(texts) == 4
+    assert sum(text.startswith("[l") for text in texts) == 2
+
+def test_cold_folder_source_does_not_block_turn(tmp_path, monkeypatch):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "castle.md").write_text("The castle gate opens at dawn.", encoding="utf-8")
+    monkeypatch.setattr(source_index, "INDEX_DIR", str(tmp_path / "index"))
+    source = {"id": 991, "type": "folder", "path": str(folder)}
+
+    async def main():
+        first = await source_index.retrieve_source_chunks([source], "castle gate")
+        await asyncio.gather(*list(source_index._tasks.values()))
+        second = await source_index.retrieve_source_chunks([source], "castle gate")
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == []
+    assert second and "castle gate" in second[0]
+
+def test_unreachable_database_source_backs_off(monkeypatch):
+    calls = []
+
+    def fetch_character_rows(source, limit):
+        calls.append(source["id"])
+        raise ConnectionError("connect timeout")
+
+    monkeypatch.setattr(source_index, "fetch_character_rows", fetch_character_rows)
+    source = {"id": 992, "type": "database", "host": "10.0.0.1", "port": 3306, "path": "db/characters"}
+
+    async def turn(source):
+        texts = await source_index.retrieve_source_chunks([source], "who is the knight")
+        await asyncio.gather(*list(source_index._tasks.values()))
+        return texts
+
+    async def main():
+        return [await turn(source) for _ in range(5)]
+
+    assert asyncio.run(main()) == [[]] * 5
+    # 첫 실패 뒤에는 백오프가 끝날 때까지 다시 접속하지 않습니다.
+    assert calls == [992]
+    assert source_index._open_failures["db:992"][0] == 1
+    assert source_index.get_source_index_stats()["backoff_skips"] >= 4
+
+    # 접속 정보가 바뀌면 백오프와 무관하게 바로 다시 시도합니다.
+    asyncio.run(turn({**source, "host": "10.0.0.2"}))
+    assert calls == [992, 992]
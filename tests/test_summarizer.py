@@ -0,0 +1,105 @@
+# tests/test_summarizer.py
+
+import asyncio
+import time
+from collections import OrderedDict
+
+from backend.llm.memory import summarizer
+from backend.llm.services import endpoint_pool
+
+def _setup(monkeypatch, rows_by_session, load_delay=0.0):
+    saved, folds = {}, []
+
+    def get_memory_summary(model_id, session_id):
+        time.sleep(load_delay)
+        return None
+
+    def get_interactions_since(model_name, session_id, after_id, limit):
+        return [row for row in rows_by_session.get(session_id, []) if row["id"] > after_id][:limit]
+
+    def save_memory_summary(model_id, session_id, summary, last_id):
+        saved[(model_id, session_id)] = (summary, last_id)
+
+    async def fold(endpoint, model_name, summary, rows, slot=None):
+        folds.append((endpoint, [row["id"] for row in rows], slot))
+        return " / ".join(row["request"] for row in rows)
+
+    monkeypatch.setattr(summarizer, "SUMMARY_DELAY", 0)
+    monkeypatch.setattr(summarizer, "SUMMARY_MIN_TURNS", 2)
+    monkeypatch.setattr(summarizer, "get_memory_summary", get_memory_summary)
+    monkeypatch.setattr(summarizer, "get_interactions_since", get_interactions_since)
+    monkeypatch.setattr(summarizer, "save_memory_summary", save_memory_summary)
+    monkeypatch.setattr(summarizer, "_fold", fold)
+    monkeypatch.setattr(endpoint_pool, "_ensure_prober", lambda: None)
+    monkeypatch.setattr(summarizer, "_summaries", OrderedDict())
+    return saved, folds
+
+def _rows(prefix, ids):
+    return [{"id": i, "request": f"{prefix}{i}", "response": "ok"} for i in ids]
+
+async def _drain():
+    while summarizer._tasks:
+        await asyncio.gather(*list(summarizer._tasks.values()))
+
+def test_summaries_are_kept_per_session(monkeypatch):
+    saved, _ = _setup(monkeypatch, {"a": _rows("a", [1, 3]), "b": _rows("b", [2, 4])})
+
+    async def main():
+        summarizer.schedule_summary_update(1, "m", "http://x", "a")
+        summarizer.schedule_summary_update(1, "m", "http://x", "b")
+        await _drain()
+        return await summarizer.get_summary(1, "a"), await summarizer.get_summary(1, "b")
+
+    a, b = asyncio.run(main())
+    assert saved == {(1, "a"): ("a1 / a3", 3), (1, "b"): ("b2 / b4", 4)}
+    assert a.endswith("a1 / a3") and b.endswith("b2 / b4")
+
+def test_update_scheduled_during_cold_load_is_not_dropped(monkeypatch):
+    saved, folds = _setup(monkeypatch, {"s": _rows("s", [1, 2])}, load_delay=0.1)
+
+    async def main():
+        assert await summarizer.get_summary(1, "s") == ""
+        summarizer.schedule_summary_update(1, "m", "http://x", "s")
+        await _drain()
+
+    asyncio.run(main())
+    assert saved[(1, "s")] == ("s1 / s2", 2)
+    assert len(folds) == 1
+
+def test_fold_uses_background_slot(monkeypatch):
+    _, folds = _setup(monkeypatch, {"s": _rows("s", [1, 2])})
+    monkeypatch.setattr(endpoint_pool, "POOL_SLOTS", 4)
+    monkeypatch.setattr(endpoint_pool, "_pools", {})
+
+    async def main():
+        summarizer.schedule_summary_update(7, "m", "http://x", "s")
+        await _drain()
+
+    asyncio.run(main())
+    pool = endpoint_pool.get_endpoint_pool("model:7", "http://x")
+    assert folds == [("http://x", [1, 2], 3)]
+    # 채팅 세션은 백그라운드 슬롯(3)을 받지 않습니다.
+    slots = set()
+    for i in range(8):
+        with pool.session_slot("http://x", f"session-{i}") as slot:
+            slots.add(slot)
+    assert slots == {0, 1, 2}
+
+def test_summary_cache_is_bounded(monkeypatch):
+    _setup(monkeypatch, {})
+    monkeypatch.setattr(summarizer, "SUMMARY_CACHE_MAX", 3)
+    monkeypatch.setattr(summarizer, "SUMMARY_CACHE_TTL", 60)
+
+    async def main():
+        for i in range(10):
+            await summarizer.get_summary(1, f"s{i}")
+            await _drain()
+
+    asyncio.run(main())
+    # 세션마다 한 항목씩 쌓이지 않고 최근 세션만 남습니다.
+    assert list(summarizer._summaries) == [(1, "s7"), (1, "s8"), (1, "s9")]
+
+    monkeypatch.setattr(summarizer, "SUMMARY_CACHE_TTL", 0)
+    time.sleep(0.01)
+    assert summarizer._cached((1, "s9")) is None
+    assert (1, "s9") not in summarizer._summaries
@@ -0,0 +1,49 @@
+# tests/test_token_relay.py
+
+import time
+import asyncio
+
+from backend.llm.services.responder import TokenRelay, _relay_lines
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames: list[tuple[float, str]] = []
+
+    async def send_text(self, text: str):
+        self.frames.append((time.perf_counter(), text))
+
+class SlowStream:
+    """
+    delay 간격으로 SSE 델타 줄을 내보내는 응답 대용.
+    """
+    def __init__(self, deltas: list[str], delay: float):
+        self.deltas = deltas
+        self.delay = delay
+        self.sent_at: list[float] = []
+
+    async def aiter_lines(self):
+        for delta in self.deltas:
+            await asyncio.sleep(self.delay)
+            self.sent_at.append(time.perf_counter())
+            yield delta
+
+async def _relay(deltas, delay, flush_ms=20):
+    ws = FakeWebSocket()
+    relay = TokenRelay(ws, mode="coalesce", flush_ms=flush_ms)
+    stream = SlowStream(deltas, delay)
+    async for line in _relay_lines(stream, relay):
+        await relay.push(line)
+    return ws, relay, stream
+
+def test_slow_stream_flushes_each_delta_within_window():
+    ws, relay, stream = asyncio.run(_relay(["Hello", " there", " my", " friend"], delay=0.1))
+    # 다음 델타(100ms 뒤)를 기다리지 않고 flush_ms(20ms) 무렵에 보냅니다.
+    assert [text for _, text in ws.frames] == ["Hello", " there", " my", " friend"]
+    for (sent, _), arrived in zip(ws.frames, stream.sent_at):
+        assert sent - arrived < 0.06
+    assert relay.text == "Hello there my friend"
+
+def test_fast_stream_still_coalesces():
+    ws, relay, _ = asyncio.run(_relay(["a"] + [" b"] * 50, delay=0, flush_ms=1000))
+    assert relay.text == "a" + " b" * 50
+    assert len(ws.frames) < 5
@@ -0,0 +1,34 @@
+# tests/test_translation_service.py
+
+import asyncio
+
+from backend.translate.services.translation_service import TranslationService, FakeTranslatorBackend
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    async def main():
+        backend = FakeTranslatorBackend(delay=0.05)
+        service = TranslationService(backend, window_ms=1)
+
+        first = asyncio.create_task(service.translate("안녕", "ko", "ja"))
+        second = asyncio.create_task(service.translate("안녕", "ko", "ja"))
+        await asyncio.sleep(0.02)
+        first.cancel()
+
+        assert await second == "[ja] 안녕"
+        assert first.cancelled()
+        assert len(backend.calls) == 1
+        # 취소된 호출의 결과도 캐시에 남아 다음 요청은 백엔드를 부르지 않습니다.
+        assert await service.translate("안녕", "ko", "ja") == "[ja] 안녕"
+        assert len(backend.calls) == 1
+
+    asyncio.run(main())
+
+def test_batches_distinct_texts_in_one_call():
+    async def main():
+        backend = FakeTranslatorBackend()
+        service = TranslationService(backend, window_ms=5)
+        results = await asyncio.gather(*(service.translate(text, "ko", "en") for text in ["가", "나", "가"]))
+        assert results == ["[en] 가", "[en] 나", "[en] 가"]
+        assert backend.calls == [(["가", "나"], "ko", ["en"])]
+
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+# tests/test_turn_metrics.py
+
+import asyncio
+from collections import deque
+
+import pytest
+
+from backend.llm.services import turn_metrics
+from backend.llm.services.turn_metrics import TurnTimer, record_turn, _percentiles
+
+@pytest.fixture(autouse=True)
+def _fresh_models(monkeypatch):
+    monkeypatch.setattr(turn_metrics, "_models", {})
+
+def test_percentiles_nearest_rank():
+    stats = _percentiles(deque(float(i) for i in range(100, 0, -1)))
+    assert stats == {"count": 100, "p50": 50.0, "p95": 95.0, "p99": 99.0}
+    assert _percentiles(deque([7.0])) == {"count": 1, "p50": 7.0, "p95": 7.0, "p99": 7.0}
+    assert _percentiles(deque()) == {"count": 0, "p50": None, "p95": None, "p99": None}
+
+def test_ok_turn_feeds_stage_distribution():
+    timer = TurnTimer()
+    timer.mark("ttft", 120.0)
+    record_turn("m", timer)
+
+    snapshot = turn_metrics.get_turn_metrics()["models"]["m"]
+    assert snapshot["turns"] == 1
+    assert snapshot["stages_ms"]["ttft"]["p50"] == 120.0
+    assert snapshot["cancelled_stages_ms"] == {}
+
+def test_cancelled_turn_keeps_partial_spans_separately():
+    timer = TurnTimer()
+    timer.mark("ttft", 80.0)
+
+    async def barge_in():
+        task = asyncio.create_task(timer.timed("tools", asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(barge_in())
+    assert timer.interrupted == {"tools"}
+    record_turn("m", timer, "cancelled")
+
+    snapshot = turn_metrics.get_turn_metrics()["models"]["m"]
+    assert snapshot["cancelled"] == 1
+    assert snapshot["stages_ms"] == {}
+    assert set(snapshot["cancelled_stages_ms"]) == {"ttft", "tools", "total"}
+    assert snapshot["cancelled_stages_ms"]["tools"]["p50"] >= 10
+
+def test_interrupted_span_in_ok_turn_stays_out_of_stages():
+    timer = TurnTimer()
+    with pytest.raises(TimeoutError):
+        with timer.span("tools"):
+            raise TimeoutError
+    timer.mark("ttft", 50.0)
+    record_turn("m", timer)
+
+    snapshot = turn_metrics.get_turn_metrics()["models"]["m"]
+    assert "tools" not in snapshot["stages_ms"]
+    assert snapshot["cancelled_stages_ms"]["tools"]["count"] == 1
+    assert snapshot["stages_ms"]["ttft"]["count"] == 1